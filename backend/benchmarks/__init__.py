@@ -0,0 +1,4 @@
+"""
+SmartATS Benchmarks
+Reproducible performance measurements of the services and API endpoints
+"""
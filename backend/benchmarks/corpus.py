@@ -0,0 +1,265 @@
+"""
+Benchmark Corpus
+Deterministic synthetic resumes, job descriptions and PDF/DOCX fixtures
+"""
+
+import hashlib
+import io
+import random
+from typing import Dict, List, Optional
+
+from docx import Document
+
+
+# The vocabulary is fixed here rather than read from NLPProcessor, so a
+# change to the skill taxonomy does not silently change the benchmark corpus
+SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'c++', 'go', 'rust', 'sql',
+    'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'fastapi', 'spring',
+    'postgresql', 'mongodb', 'redis', 'elasticsearch', 'aws', 'azure', 'gcp',
+    'docker', 'kubernetes', 'terraform', 'jenkins', 'linux', 'machine learning',
+    'deep learning', 'pytorch', 'tensorflow', 'pandas', 'numpy', 'data analysis',
+    'git', 'agile', 'scrum', 'rest api', 'graphql', 'microservices', 'unit testing'
+]
+
+FILLER_WORDS = [
+    'designed', 'built', 'led', 'improved', 'delivered', 'maintained', 'migrated',
+    'automated', 'reduced', 'increased', 'team', 'platform', 'service', 'pipeline',
+    'customers', 'latency', 'throughput', 'reliability', 'features', 'release',
+    'production', 'architecture', 'stakeholders', 'requirements', 'quality',
+    'performance', 'scalable', 'internal', 'tooling', 'dashboard', 'reporting',
+    'mentored', 'engineers', 'cross-functional', 'roadmap', 'metrics', 'cost',
+    'deployment', 'monitoring', 'workflow', 'integration', 'security', 'data',
+    'users', 'backend', 'frontend', 'system', 'infrastructure', 'analysis'
+]
+
+RESUME_SECTIONS = ['Summary', 'Skills', 'Experience', 'Projects', 'Education', 'Certifications']
+
+JD_SECTIONS = ['About the role', 'Responsibilities', 'Requirements', 'Nice to have']
+
+# Layout of the generated fixtures
+WORDS_PER_LINE = 12
+LINES_PER_PAGE = 45
+
+
+class CorpusGenerator:
+    """
+    Generates the same documents for the same seed and parameters
+
+    Skill density is the fraction of words that are skills from SKILLS, so
+    corpora of different lengths keep comparable matching workloads.
+    """
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+
+    def _random(self, *key) -> random.Random:
+        # Each document gets its own stream, so adding documents to a corpus
+        # never changes the ones generated before it
+        return random.Random(f"{self.seed}:{':'.join(str(part) for part in key)}")
+
+    def _words(self, rng: random.Random, count: int, skill_density: float) -> List[str]:
+        return [
+            rng.choice(SKILLS) if rng.random() < skill_density else rng.choice(FILLER_WORDS)
+            for _ in range(count)
+        ]
+
+    def _sentences(self, words: List[str], rng: random.Random) -> List[str]:
+        sentences = []
+        position = 0
+        while position < len(words):
+            length = rng.randint(8, 16)
+            sentence = ' '.join(words[position:position + length])
+            sentences.append(sentence[:1].upper() + sentence[1:] + '.')
+            position += length
+        return sentences
+
+    def resume(self, index: int = 0, words: int = 600, skill_density: float = 0.08) -> str:
+        """
+        Generate a resume with section headings and roughly ``words`` words
+        """
+        rng = self._random('resume', index, words, skill_density)
+        body_words = self._words(rng, words, skill_density)
+        per_section = max(1, len(body_words) // len(RESUME_SECTIONS))
+
+        lines = [f"Candidate {index}", f"candidate{index}@example.com | +1 555 010 {index % 10000:04d}"]
+        for position, heading in enumerate(RESUME_SECTIONS):
+            section_words = body_words[position * per_section:(position + 1) * per_section]
+            if position == len(RESUME_SECTIONS) - 1:
+                section_words = body_words[position * per_section:]
+
+            lines.append('')
+            lines.append(heading)
+            if heading == 'Skills':
+                lines.append(', '.join(sorted(set(section_words) & set(SKILLS))) or 'python')
+            for sentence in self._sentences(section_words, rng):
+                lines.append(f"- {sentence}")
+        return '\n'.join(lines)
+
+    def job_description(self, index: int = 0, words: int = 250, skill_density: float = 0.12) -> str:
+        """
+        Generate a job description with roughly ``words`` words
+        """
+        rng = self._random('jd', index, words, skill_density)
+        body_words = self._words(rng, words, skill_density)
+        per_section = max(1, len(body_words) // len(JD_SECTIONS))
+
+        lines = [f"Senior Software Engineer {index}"]
+        for position, heading in enumerate(JD_SECTIONS):
+            section_words = body_words[position * per_section:(position + 1) * per_section]
+            lines.append('')
+            lines.append(heading)
+            lines.extend(self._sentences(section_words, rng))
+        return '\n'.join(lines)
+
+    def resume_for_pages(self, index: int, pages: int, skill_density: float = 0.08) -> str:
+        """
+        Generate a resume long enough to fill ``pages`` pages of the fixtures
+        """
+        return self.resume(index, words=pages * LINES_PER_PAGE * WORDS_PER_LINE, skill_density=skill_density)
+
+    def pdf(self, index: int = 0, pages: int = 1, skill_density: float = 0.08) -> bytes:
+        """
+        Generate a text-layer PDF resume with exactly ``pages`` pages
+        """
+        text = self.resume_for_pages(index, pages, skill_density)
+        return build_pdf(paginate(text, pages))
+
+    def docx(self, index: int = 0, pages: int = 1, skill_density: float = 0.08) -> bytes:
+        """
+        Generate a DOCX resume of about ``pages`` pages
+        """
+        return build_docx(self.resume_for_pages(index, pages, skill_density))
+
+
+def corpus_fingerprint(documents: List[str]) -> str:
+    """
+    Hash of the generated documents, stored in reports to check comparability
+    """
+    digest = hashlib.sha256()
+    for document in documents:
+        digest.update(document.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+def paginate(text: str, pages: int) -> List[List[str]]:
+    """
+    Wrap text into lines and spread them over exactly ``pages`` pages
+    """
+    lines = []
+    for paragraph in text.split('\n'):
+        words = paragraph.split()
+        if not words:
+            lines.append('')
+        for start in range(0, len(words), WORDS_PER_LINE):
+            lines.append(' '.join(words[start:start + WORDS_PER_LINE]))
+
+    per_page = max(1, -(-len(lines) // pages))
+    chunks = [lines[start:start + per_page] for start in range(0, len(lines), per_page)]
+    while len(chunks) < pages:
+        chunks.append(['(continued)'])
+    return chunks[:pages]
+
+
+def _pdf_string(line: str) -> bytes:
+    escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return b'(' + escaped.encode('latin-1', errors='replace') + b')'
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """
+    Write a minimal PDF with one Helvetica text stream per page
+
+    Written by hand so fixtures need no PDF library and are byte-for-byte
+    reproducible.
+    """
+    objects: List[Optional[bytes]] = [None, None]  # catalog, page tree
+    font_id = len(objects) + 1
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for lines in pages:
+        operators = [b"BT", b"/F1 10 Tf", b"12 TL", b"50 760 Td"]
+        operators.extend(_pdf_string(line) + b" '" for line in lines)
+        operators.append(b"ET")
+        stream = b"\n".join(operators)
+
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (content_id, font_id)
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset
+    )
+    return bytes(output)
+
+
+def build_docx(text: str) -> bytes:
+    """
+    Write text as a DOCX with headings, bullet paragraphs and a skills table
+    """
+    document = Document()
+    skills_line = None
+    for line in text.split('\n'):
+        if not line:
+            continue
+        if line in RESUME_SECTIONS:
+            document.add_heading(line, level=2)
+        elif skills_line is None and ',' in line and not line.startswith('-'):
+            skills_line = line
+        else:
+            document.add_paragraph(line)
+
+    if skills_line:
+        skills = [skill.strip() for skill in skills_line.split(',')]
+        columns = 4
+        table = document.add_table(rows=-(-len(skills) // columns), cols=columns)
+        for position, skill in enumerate(skills):
+            table.cell(position // columns, position % columns).text = skill
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def generate_corpus(
+    seed: int = 42,
+    resumes: int = 100,
+    resume_words: int = 600,
+    jd_words: int = 250,
+    skill_density: float = 0.08
+) -> Dict[str, List[str]]:
+    """
+    Generate a batch of resumes and job descriptions
+    """
+    generator = CorpusGenerator(seed)
+    return {
+        'resumes': [
+            generator.resume(index, words=resume_words, skill_density=skill_density)
+            for index in range(resumes)
+        ],
+        'job_descriptions': [
+            generator.job_description(index, words=jd_words)
+            for index in range(max(1, resumes // 10))
+        ]
+    }
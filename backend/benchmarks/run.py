@@ -0,0 +1,481 @@
+"""
+Benchmark Runner
+Microbenchmarks of the services, end-to-end runs through the ASGI app and cold starts
+
+Usage (from the backend directory):
+    python -m benchmarks.run --output report.json
+    python -m benchmarks.run --output new.json --baseline report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .corpus import CorpusGenerator, corpus_fingerprint
+
+
+REPORT_FORMAT_VERSION = 1
+
+# Fixture sizes for the parser benchmarks
+FIXTURE_PAGES = (1, 5, 20)
+
+# Cold starts take seconds each, so the startup suite runs at most this many
+STARTUP_ITERATIONS = 5
+STARTUP_TIMEOUT_SECONDS = 120
+
+
+def summarize(samples: List[float], items_per_call: int = 1) -> Dict:
+    """
+    Summarize call durations (seconds) as latency percentiles and throughput
+    """
+    values = np.asarray(samples)
+    total = float(values.sum())
+    return {
+        'iterations': len(samples),
+        'items_per_call': items_per_call,
+        'mean_ms': round(float(values.mean()) * 1000, 4),
+        'p50_ms': round(float(np.percentile(values, 50)) * 1000, 4),
+        'p95_ms': round(float(np.percentile(values, 95)) * 1000, 4),
+        'p99_ms': round(float(np.percentile(values, 99)) * 1000, 4),
+        'min_ms': round(float(values.min()) * 1000, 4),
+        'max_ms': round(float(values.max()) * 1000, 4),
+        'throughput_per_s': round(len(samples) * items_per_call / total, 2) if total else None
+    }
+
+
+def measure(func: Callable[[int], object], iterations: int, warmup: int) -> List[float]:
+    """
+    Time ``func(i)`` for each iteration after some untimed warm-up calls
+    """
+    for index in range(warmup):
+        func(index)
+
+    samples = []
+    for index in range(iterations):
+        start_time = time.perf_counter()
+        func(index)
+        samples.append(time.perf_counter() - start_time)
+    return samples
+
+
+def run_micro(generator: CorpusGenerator, iterations: int, warmup: int) -> Dict[str, Dict]:
+    """
+    Benchmark the individual service methods
+    """
+    from services.nlp_processor import NLPProcessor
+    from services.resume_parser import ResumeParser
+    from services.scoring_engine import ScoringEngine
+    from services.skill_bitset import match_ratios
+    from utils.text_cleaner import TextCleaner
+
+    parser = ResumeParser()
+    nlp_processor = NLPProcessor()
+    scoring_engine = ScoringEngine()
+    text_cleaner = TextCleaner()
+
+    # A pool of distinct documents, cycled through by iteration number
+    pool_size = 32
+    resumes = [generator.resume(index) for index in range(pool_size)]
+    long_resumes = [generator.resume(index, words=3000) for index in range(pool_size)]
+    jd = text_cleaner.clean_text(generator.job_description(0))
+    cleaned = text_cleaner.clean_many(resumes)
+    batch = text_cleaner.clean_many([generator.resume(index) for index in range(100)])
+    jd_keywords = nlp_processor.extract_keywords(jd)
+    jd_skills = nlp_processor.detect_skills(jd)
+
+    keyword_analysis = nlp_processor.analyze_keywords(nlp_processor.extract_keywords(cleaned[0]), jd_keywords)
+    sections_analysis = nlp_processor.detect_sections(cleaned[0])
+    skill_gap = nlp_processor.compare_skills(nlp_processor.detect_skills(cleaned[0]), jd_skills)
+
+    batch_skills = [nlp_processor.detect_skills(document) for document in batch]
+    skill_vocabulary = nlp_processor.skill_vocabulary
+    batch_skill_bits = skill_vocabulary.encode_many(batch_skills)
+    jd_skill_bits = skill_vocabulary.encode(jd_skills)
+
+    # Synthetic component scores for batch scoring
+    rng = np.random.default_rng(generator.seed)
+    score_batch_size = 100000
+    score_batch = {
+        'keyword_match_ratios': rng.random(score_batch_size),
+        'similarity_scores': rng.random(score_batch_size) * 100,
+        'skills_match_ratios': rng.random(score_batch_size),
+        'sections': rng.random((score_batch_size, len(scoring_engine.section_columns))) < 0.6
+    }
+
+    def pick(documents: List[str], index: int) -> str:
+        return documents[index % len(documents)]
+
+    cases = {
+        'text_cleaner.clean_text': (lambda i: text_cleaner.clean_text(pick(resumes, i)), 1),
+        'text_cleaner.clean_text[3000 words]': (lambda i: text_cleaner.clean_text(pick(long_resumes, i)), 1),
+        'text_cleaner.clean_many[100]': (lambda i: text_cleaner.clean_many(batch), len(batch)),
+        'nlp.extract_keywords': (lambda i: nlp_processor.extract_keywords(pick(cleaned, i)), 1),
+        'nlp.extract_keywords_batch[100]': (lambda i: nlp_processor.extract_keywords_batch(batch), len(batch)),
+        'nlp.calculate_similarity': (lambda i: nlp_processor.calculate_similarity(pick(cleaned, i), jd), 1),
+        'nlp.calculate_similarity_batch[100]': (
+            lambda i: nlp_processor.calculate_similarity_batch(batch, jd), len(batch)
+        ),
+        'nlp.detect_sections': (lambda i: nlp_processor.detect_sections(pick(cleaned, i)), 1),
+        'nlp.detect_skills': (lambda i: nlp_processor.detect_skills(pick(cleaned, i)), 1),
+        'nlp.compare_skills[100]': (
+            lambda i: [nlp_processor.compare_skills(skills, jd_skills) for skills in batch_skills], len(batch)
+        ),
+        'skill_bitset.match_ratios[100]': (
+            lambda i: match_ratios(batch_skill_bits, jd_skill_bits), len(batch)
+        ),
+        'scoring.calculate_scores': (
+            lambda i: scoring_engine.calculate_scores(
+                keyword_match_ratio=keyword_analysis['match_ratio'],
+                similarity_score=55.0,
+                skills_match_ratio=skill_gap['match_ratio'],
+                sections_found=sections_analysis['found']
+            ), 1
+        ),
+        'scoring.calculate_scores_batch[100000]': (
+            lambda i: scoring_engine.calculate_scores_batch(**score_batch), score_batch_size
+        ),
+        'scoring.generate_suggestions': (
+            lambda i: scoring_engine.generate_suggestions(
+                keyword_analysis=keyword_analysis,
+                sections_analysis=sections_analysis,
+                skill_gap=skill_gap,
+                overall_score=62.0
+            ), 1
+        ),
+    }
+
+    # Batch calls and long documents are slow; fewer runs keep the suite short
+    iteration_counts = {
+        name: max(5, iterations // 10) if items_per_call > 1 else iterations
+        for name, (_, items_per_call) in cases.items()
+    }
+
+    for pages in FIXTURE_PAGES:
+        pdf_bytes = generator.pdf(0, pages=pages)
+        docx_bytes = generator.docx(0, pages=pages)
+        cases[f'parser.extract_document[pdf {pages}p]'] = (
+            lambda i, content=pdf_bytes: parser.extract_document(content, '.pdf'), 1
+        )
+        cases[f'parser.extract_document[docx {pages}p]'] = (
+            lambda i, content=docx_bytes: parser.extract_document(content, '.docx'), 1
+        )
+        iteration_counts[f'parser.extract_document[pdf {pages}p]'] = max(3, iterations // (2 * pages))
+        iteration_counts[f'parser.extract_document[docx {pages}p]'] = max(3, iterations // pages)
+
+    results = {}
+    for name, (func, items_per_call) in cases.items():
+        samples = measure(func, iteration_counts[name], min(warmup, iteration_counts[name]))
+        results[name] = summarize(samples, items_per_call)
+        print(f"  {name:45s} p50 {results[name]['p50_ms']:>10.3f} ms")
+    return results
+
+
+def run_stages(generator: CorpusGenerator, iterations: int, warmup: int) -> Dict[str, Dict]:
+    """
+    Benchmark one /analyze in-process with its stages run in order and on stage threads
+
+    This is the ANALYSIS_WORKERS=0 configuration, the only one where the
+    stage threads default to more than 1. The JD profile is cached after the
+    first call, as for repeated analyses against one job description.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from services import pipeline
+
+    pipeline.init_worker()
+    pool_size = 32
+    job_description = generator.job_description(0)
+    documents = {
+        'resume': [generator.resume(index) for index in range(pool_size)],
+        'resume 3000 words': [generator.resume(index, words=3000) for index in range(pool_size)]
+    }
+    thread_counts = sorted({1, max(2, min(4, os.cpu_count() or 1))})
+
+    results = {}
+    for label, resumes in documents.items():
+        for threads in thread_counts:
+            executor = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+            pipeline._services['stage_executor'] = executor
+            name = f'stages.analyze_resume[{label}, {threads} threads]'
+            samples = measure(
+                lambda i: pipeline.analyze_resume(resumes[i % len(resumes)], job_description),
+                iterations if label == 'resume' else max(5, iterations // 5),
+                warmup
+            )
+            results[name] = summarize(samples)
+            print(f"  {name:45s} p50 {results[name]['p50_ms']:>10.3f} ms")
+            if executor is not None:
+                executor.shutdown()
+
+    pipeline._services['stage_executor'] = pipeline._create_stage_executor()
+    return results
+
+
+async def _run_e2e_async(generator: CorpusGenerator, iterations: int, warmup: int) -> Dict[str, Dict]:
+    try:
+        import httpx
+    except ImportError:
+        print("  httpx is not installed; skipping end-to-end benchmarks (pip install httpx)")
+        return {}
+
+    import main
+
+    jd = generator.job_description(0)
+    resumes = [generator.resume(index) for index in range(32)]
+    pdf_fixture = generator.pdf(0, pages=2)
+    docx_fixture = generator.docx(0, pages=2)
+
+    async def analyze(client, index: int):
+        response = await client.post('/analyze', json={
+            'resume_text': resumes[index % len(resumes)],
+            'job_description': jd
+        })
+        response.raise_for_status()
+
+    async def quick_scan(client, index: int, filename: str, content: bytes):
+        # Measure extraction, not the extracted text cache
+        main.resume_text_cache.clear()
+        response = await client.post(
+            '/quick-scan',
+            files={'file': (filename, content)},
+            data={'job_description': jd}
+        )
+        response.raise_for_status()
+
+    cases = {
+        'e2e./analyze': analyze,
+        'e2e./quick-scan[pdf 2p]': lambda client, i: quick_scan(client, i, 'resume.pdf', pdf_fixture),
+        'e2e./quick-scan[docx 2p]': lambda client, i: quick_scan(client, i, 'resume.docx', docx_fixture),
+    }
+
+    results = {}
+    await main.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+            for name, func in cases.items():
+                for index in range(warmup):
+                    await func(client, index)
+
+                samples = []
+                for index in range(iterations):
+                    start_time = time.perf_counter()
+                    await func(client, index)
+                    samples.append(time.perf_counter() - start_time)
+
+                results[name] = summarize(samples)
+                print(f"  {name:45s} p50 {results[name]['p50_ms']:>10.3f} ms")
+    finally:
+        await main.app.router.shutdown()
+    return results
+
+
+def run_e2e(generator: CorpusGenerator, iterations: int, warmup: int) -> Dict[str, Dict]:
+    """
+    Benchmark /analyze and /quick-scan through the ASGI app in-process
+    """
+    return asyncio.run(_run_e2e_async(generator, iterations, warmup))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_cold_start() -> Dict[str, float]:
+    """
+    Launch a server process and time how long until /health and /ready return 200
+
+    Returns:
+        Seconds from launch until each endpoint answered, by endpoint name
+    """
+    port = _free_port()
+    start_time = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    timings = {}
+    try:
+        for endpoint in ('health', 'ready'):
+            while endpoint not in timings:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Server exited with code {process.returncode} during startup")
+                if time.perf_counter() - start_time > STARTUP_TIMEOUT_SECONDS:
+                    raise RuntimeError(f"/{endpoint} did not succeed within {STARTUP_TIMEOUT_SECONDS}s")
+
+                try:
+                    with urllib.request.urlopen(f'http://127.0.0.1:{port}/{endpoint}', timeout=1):
+                        timings[endpoint] = time.perf_counter() - start_time
+                except (urllib.error.URLError, OSError):
+                    # Not listening yet, or 503 until warm-up has finished
+                    time.sleep(0.02)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return timings
+
+
+def run_startup(iterations: int) -> Dict[str, Dict]:
+    """
+    Benchmark cold starts of the server: time until it answers /health and until /ready
+    """
+    runs = [measure_cold_start() for _ in range(min(iterations, STARTUP_ITERATIONS))]
+
+    results = {}
+    for endpoint in ('health', 'ready'):
+        name = f'startup./{endpoint}'
+        results[name] = summarize([timings[endpoint] for timings in runs])
+        print(f"  {name:45s} p50 {results[name]['p50_ms']:>10.3f} ms")
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_metadata(seed: int, iterations: int, warmup: int) -> Dict:
+    generator = CorpusGenerator(seed)
+    sample = [generator.resume(index) for index in range(32)] + [generator.job_description(0)]
+    return {
+        'format_version': REPORT_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'iterations': iterations,
+        'warmup': warmup,
+        'corpus_fingerprint': corpus_fingerprint(sample),
+        'environment': {
+            name: os.environ.get(name)
+            for name in ('NLP_ANALYSIS_MODE', 'ANALYSIS_WORKERS', 'TFIDF_MODEL_PATH')
+        }
+    }
+
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """
+    Compare p50/p95 latencies of the cases present in both reports
+
+    Returns:
+        One row per case with the relative change; ``regression`` is set
+        when p50 got slower by more than ``threshold`` percent
+    """
+    rows = []
+    for name, stats in current['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+
+        row = {'case': name}
+        for field in ('p50_ms', 'p95_ms'):
+            before, after = previous[field], stats[field]
+            row[field] = after
+            row[f'{field}_baseline'] = before
+            row[f'{field}_change_pct'] = round((after - before) / before * 100, 1) if before else None
+
+        change = row['p50_ms_change_pct']
+        row['regression'] = change is not None and change > threshold
+        rows.append(row)
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="SmartATS benchmark suite")
+    arg_parser.add_argument('--output', default='benchmark_report.json', help="Report path")
+    arg_parser.add_argument('--baseline', help="Earlier report to compare against")
+    arg_parser.add_argument('--suite', choices=['all', 'micro', 'stages', 'e2e', 'startup'], default='all')
+    arg_parser.add_argument('--iterations', type=int, default=50)
+    arg_parser.add_argument('--warmup', type=int, default=3)
+    arg_parser.add_argument('--seed', type=int, default=42)
+    arg_parser.add_argument(
+        '--threshold', type=float, default=10.0,
+        help="p50 slowdown (percent) reported as a regression"
+    )
+    arg_parser.add_argument(
+        '--startup-budget', type=float, default=5.0,
+        help="Seconds a cold start may take (p50) until /ready"
+    )
+    args = arg_parser.parse_args()
+
+    generator = CorpusGenerator(args.seed)
+    report = {'meta': build_metadata(args.seed, args.iterations, args.warmup), 'results': {}}
+
+    if args.suite in ('all', 'micro'):
+        print("Microbenchmarks")
+        report['results'].update(run_micro(generator, args.iterations, args.warmup))
+    if args.suite in ('all', 'stages'):
+        print("Stage threads")
+        report['results'].update(run_stages(generator, args.iterations, args.warmup))
+    if args.suite in ('all', 'e2e'):
+        print("End-to-end")
+        report['results'].update(run_e2e(generator, args.iterations, args.warmup))
+    if args.suite in ('all', 'startup'):
+        print("Cold start")
+        report['results'].update(run_startup(args.iterations))
+
+        ready_seconds = report['results']['startup./ready']['p50_ms'] / 1000
+        report['startup_budget'] = {
+            'budget_seconds': args.startup_budget,
+            'ready_p50_seconds': round(ready_seconds, 3),
+            'within_budget': ready_seconds <= args.startup_budget
+        }
+        if ready_seconds > args.startup_budget:
+            print(f"  Cold start to /ready takes {ready_seconds:.2f}s, over the {args.startup_budget:.1f}s budget")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+        if baseline['meta'].get('corpus_fingerprint') != report['meta']['corpus_fingerprint']:
+            print("Warning: baseline was generated from a different corpus; results are not comparable")
+
+        comparison = compare_reports(baseline, report, args.threshold)
+        report['comparison'] = {
+            'baseline': args.baseline,
+            'baseline_commit': baseline['meta'].get('git_commit'),
+            'threshold_pct': args.threshold,
+            'cases': comparison
+        }
+
+        print(f"\nCompared with {args.baseline}")
+        for row in comparison:
+            change = row['p50_ms_change_pct']
+            flag = '  REGRESSION' if row['regression'] else ''
+            print(f"  {row['case']:45s} p50 {change:>+7.1f}%{flag}" if change is not None else f"  {row['case']:45s} p50 n/a")
+
+    with open(args.output, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    if report.get('comparison') and any(row['regression'] for row in report['comparison']['cases']):
+        sys.exit(1)
+    if report.get('startup_budget') and not report['startup_budget']['within_budget']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Gunicorn configuration for the pre-fork server mode
+
+Usage (from the backend directory):
+    gunicorn main:app -c gunicorn.conf.py
+
+The master process imports the app, loads the spaCy model, TF-IDF state and
+skill tables and runs a warm-up analysis, then freezes those objects before
+forking the uvicorn workers. The workers share the model pages copy-on-write
+instead of each loading its own copy, and run analyses in-process
+(ANALYSIS_WORKERS=0) on the preloaded models.
+"""
+
+import gc
+import multiprocessing
+import os
+import sys
+
+
+# Analysis runs in the server workers themselves, on the shared models
+os.environ.setdefault("ANALYSIS_WORKERS", "0")
+# The server workers parse side by side; helper processes for PDF pages in
+# each of them would multiply the process count
+os.environ.setdefault("PDF_PARALLEL_PROCESSES", "1")
+# Likewise for the stage threads of each analysis
+os.environ.setdefault("ANALYSIS_STAGE_THREADS", "1")
+# Lets every worker report the memory of the master and its siblings
+os.environ["PREFORK_MASTER_PID"] = str(os.getpid())
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# State every worker must see the same of: kept in memory per process unless
+# these point at directories the workers share
+SHARED_STATE_DIRS = ("ANALYSIS_STORE_DIR", "BATCH_JOBS_DIR", "JOB_CATALOG_DIR")
+
+# No collections in the master before the fork: freed objects would leave
+# holes in pages the workers are meant to share
+gc.disable()
+
+
+def on_starting(server):
+    """
+    Refuse to start several workers that would each keep their own state
+    """
+    if server.cfg.workers <= 1:
+        return
+
+    missing = [name for name in SHARED_STATE_DIRS if not os.environ.get(name)]
+    if missing:
+        server.log.error(
+            "%d workers need shared state: set %s (or run a single worker)",
+            server.cfg.workers, ", ".join(missing)
+        )
+        sys.exit(1)
+    if os.environ.get("TALENT_INDEX_DIR"):
+        # Index segments and the manifest are written without a lock between processes
+        server.log.error(
+            "The talent index supports a single writer: unset TALENT_INDEX_DIR or run a single worker"
+        )
+        sys.exit(1)
+
+
+def when_ready(server):
+    """
+    Load and warm up the models in the master, right before the workers are forked
+    """
+    from services import pipeline
+
+    if int(os.environ["ANALYSIS_WORKERS"]) > 0:
+        server.log.warning(
+            "ANALYSIS_WORKERS is set: worker pool processes load their own models, nothing is preloaded"
+        )
+    else:
+        seconds = pipeline.warm_up()
+        server.log.info("Models loaded and warmed up in the master in %.2fs", seconds)
+
+    # Objects that exist now are never visited by the collector again, so
+    # collections in the workers do not write to (and un-share) their pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
@@ -3,19 +3,39 @@ SmartATS - AI-Powered Resume Screening & Job Match Analyzer
 Main FastAPI Application
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import APIRouter, FastAPI, UploadFile, File, HTTPException, Form, Header, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+import asyncio
+import functools
+import hashlib
+import io
+import json
+import logging
 import os
+import shutil
 import tempfile
+import time
 import uuid
+import zipfile
 
-from services.resume_parser import ResumeParser
-from services.nlp_processor import NLPProcessor
-from services.scoring_engine import ScoringEngine
-from utils.text_cleaner import TextCleaner
+import numpy as np
+
+from services import pipeline
+from services.analysis_store import COMPONENT_SCORES, AnalysisStore, BatchConflict
+from services.job_catalog import JobCatalog
+from services.job_queue import FINAL_STATUSES, JobQueue
+from services.scoring_engine import ScoringEngine, top_k_indices
+from services.talent_index import SKILL_PREFIX, TalentIndex
+from services.worker_pool import AnalysisWorkerPool, WorkerPoolBusy, WorkerPoolTimeout
+from utils.admission import AdmissionController, AdmissionMiddleware
+from utils.cache import DiskCacheBackend, LRUCache, SingleFlight, content_hash
+from utils.memory import child_pids, process_memory
+from utils.metrics import SIZE_BUCKETS, MetricsRegistry, StageTimer
+from utils.uploads import upload_route
 
 app = FastAPI(
     title="SmartATS API",
@@ -23,25 +43,284 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# CORS Configuration
+# Constants
+MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+# Whole request body of a single-file upload: the file plus form fields such
+# as the job description of /quick-scan
+MAX_UPLOAD_BODY_SIZE = MAX_FILE_SIZE + 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+ALLOWED_EXTENSIONS = {'.pdf', '.docx'}
+MAX_RANK_CANDIDATES = 5000
+BATCH_CONFLICT_DETAIL = "batch_id was already ranked against another job description"
+
+# Worker pool configuration
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", os.cpu_count() or 1))
+ANALYSIS_MAX_QUEUE = int(os.environ.get("ANALYSIS_MAX_QUEUE", 64))
+ANALYSIS_TIMEOUT_SECONDS = float(os.environ.get("ANALYSIS_TIMEOUT_SECONDS", 30))
+RANK_TIMEOUT_SECONDS = float(os.environ.get("RANK_TIMEOUT_SECONDS", 300))
+
+# Set by gunicorn.conf.py in the master of the pre-fork server, so that each
+# worker can report the memory of the master and all its sibling workers
+PREFORK_MASTER_PID = int(os.environ.get("PREFORK_MASTER_PID", 0))
+
+# Admission control of the expensive endpoints, per class (a concurrency of 0
+# disables it for that class); requests whose body is at most
+# ADMISSION_PRIORITY_MAX_BYTES go ahead of the queue
+ADMISSION_PARSE_CONCURRENCY = int(os.environ.get("ADMISSION_PARSE_CONCURRENCY", 2 * max(ANALYSIS_WORKERS, 1)))
+ADMISSION_PARSE_QUEUE = int(os.environ.get("ADMISSION_PARSE_QUEUE", 16))
+ADMISSION_ARCHIVE_CONCURRENCY = int(os.environ.get("ADMISSION_ARCHIVE_CONCURRENCY", max(ANALYSIS_WORKERS, 1)))
+ADMISSION_ARCHIVE_QUEUE = int(os.environ.get("ADMISSION_ARCHIVE_QUEUE", 4))
+ADMISSION_ANALYZE_CONCURRENCY = int(os.environ.get("ADMISSION_ANALYZE_CONCURRENCY", 4 * max(ANALYSIS_WORKERS, 1)))
+ADMISSION_ANALYZE_QUEUE = int(os.environ.get("ADMISSION_ANALYZE_QUEUE", 32))
+ADMISSION_MAX_WAIT_SECONDS = float(os.environ.get("ADMISSION_MAX_WAIT_SECONDS", 10))
+ADMISSION_PRIORITY_MAX_BYTES = int(os.environ.get("ADMISSION_PRIORITY_MAX_BYTES", 16 * 1024))
+
+# Bulk ingestion of ZIP archives; at most ARCHIVE_CONCURRENCY files of an
+# archive are in memory at once
+MAX_ARCHIVE_SIZE = int(os.environ.get("MAX_ARCHIVE_SIZE_MB", 200)) * 1024 * 1024
+MAX_ARCHIVE_FILES = int(os.environ.get("MAX_ARCHIVE_FILES", 1000))
+ARCHIVE_CONCURRENCY = int(os.environ.get("ARCHIVE_CONCURRENCY", 2 * max(ANALYSIS_WORKERS, 1)))
+
+# Extracted resume text cache, keyed by upload digest
+RESUME_CACHE_MAX_MB = int(os.environ.get("RESUME_CACHE_MAX_MB", 64))
+RESUME_CACHE_DIR = os.environ.get("RESUME_CACHE_DIR", "")
+RESUME_CACHE_DISK_MAX_MB = int(os.environ.get("RESUME_CACHE_DISK_MAX_MB", 512))
+
+# Short-lived cache of /analyze results, keyed by the normalized resume and JD
+ANALYSIS_CACHE_SIZE = int(os.environ.get("ANALYSIS_CACHE_SIZE", 1024))
+ANALYSIS_CACHE_TTL_SECONDS = float(os.environ.get("ANALYSIS_CACHE_TTL_SECONDS", 300))
+
+# Talent index of analyzed resumes (disabled unless a directory is set)
+TALENT_INDEX_DIR = os.environ.get("TALENT_INDEX_DIR", "")
+TALENT_INDEX_FLUSH_DOCS = int(os.environ.get("TALENT_INDEX_FLUSH_DOCS", 1000))
+TALENT_INDEX_MAX_SEGMENTS = int(os.environ.get("TALENT_INDEX_MAX_SEGMENTS", 8))
+MAX_SEARCH_RESULTS = 100
+
+# Component scores of ranked candidates, for re-ranking under other weights
+ANALYSIS_STORE_DIR = os.environ.get("ANALYSIS_STORE_DIR", "")
+ANALYSIS_STORE_MAX_BATCHES = int(os.environ.get("ANALYSIS_STORE_MAX_BATCHES", 1000))
+
+# Asynchronous batch ranking jobs (kept in memory unless a directory is set)
+BATCH_JOBS_DIR = os.environ.get("BATCH_JOBS_DIR", "")
+MAX_BATCH_JOB_CANDIDATES = int(os.environ.get("MAX_BATCH_JOB_CANDIDATES", 100000))
+BATCH_JOB_CHUNK_SIZE = int(os.environ.get("BATCH_JOB_CHUNK_SIZE", 500))
+BATCH_JOB_MAX_RUNNING = int(os.environ.get("BATCH_JOB_MAX_RUNNING", 2))
+# Pool tasks batch jobs may occupy at once; the rest of the pool stays free for requests
+BATCH_JOB_CONCURRENCY = int(os.environ.get("BATCH_JOB_CONCURRENCY", max(1, ANALYSIS_WORKERS // 2)))
+BATCH_JOB_TTL_SECONDS = float(os.environ.get("BATCH_JOB_TTL_SECONDS", 86400))
+BATCH_JOB_LEASE_SECONDS = 60
+BATCH_JOB_POLL_SECONDS = 1.0
+
+# Catalog of open jobs for reverse matching (kept in memory unless a directory is set)
+JOB_CATALOG_DIR = os.environ.get("JOB_CATALOG_DIR", "")
+MAX_CATALOG_JOBS_PER_REQUEST = 1000
+MAX_CATALOG_MATCHES = 100
+
+# CPU-bound parsing and NLP run in worker processes, each loading the spaCy model once
+worker_pool = AnalysisWorkerPool(
+    max_workers=ANALYSIS_WORKERS,
+    max_queue=ANALYSIS_MAX_QUEUE,
+    timeout=ANALYSIS_TIMEOUT_SECONDS,
+    initializer=pipeline.init_worker
+)
+
+resume_text_cache = LRUCache(
+    max_size=10000,
+    max_weight=RESUME_CACHE_MAX_MB * 1024 * 1024,
+    weigher=lambda extraction: len(extraction['extracted_text']),
+    backend=DiskCacheBackend(
+        RESUME_CACHE_DIR, max_bytes=RESUME_CACHE_DISK_MAX_MB * 1024 * 1024
+    ) if RESUME_CACHE_DIR else None
+)
+
+# Identical /analyze requests in flight at the same time share one analysis,
+# and repeats within the TTL are served from the cache (disabled with a TTL of 0)
+analysis_flights = SingleFlight()
+analysis_result_cache = LRUCache(
+    max_size=ANALYSIS_CACHE_SIZE,
+    ttl=ANALYSIS_CACHE_TTL_SECONDS
+) if ANALYSIS_CACHE_TTL_SECONDS > 0 else None
+
+# Opened on startup when TALENT_INDEX_DIR is set
+talent_index: Optional[TalentIndex] = None
+
+# Opened on startup
+job_catalog: Optional[JobCatalog] = None
+# Directory of the job catalog database, which the worker pool opens to match
+# resumes: JOB_CATALOG_DIR, or a temporary directory when it is unset
+job_catalog_dir: Optional[str] = None
+analysis_store: Optional[AnalysisStore] = None
+job_queue: Optional[JobQueue] = None
+
+# Batch jobs run by this process, and the dispatcher that starts them
+batch_job_tasks: Dict[str, asyncio.Task] = {}
+batch_job_dispatcher: Optional[asyncio.Task] = None
+batch_job_wakeup: Optional[asyncio.Event] = None
+batch_chunk_slots: Optional[asyncio.Semaphore] = None
+
+# Readiness: set once every worker has loaded and warmed up its models,
+# cleared again when shutdown begins (see /ready)
+ready = False
+warm_up_error: Optional[str] = None
+warm_up_task: Optional[asyncio.Task] = None
+
+# The server's error log, where it reports a failing startup hook
+startup_logger = logging.getLogger("uvicorn.error")
+
+# Metrics exposed on /metrics. Worker processes return their stage timings
+# with each result, so everything is recorded in this process.
+metrics = MetricsRegistry()
+STAGE_DURATION = metrics.histogram(
+    "smartats_stage_duration_seconds",
+    "Time spent in each pipeline stage",
+    ["flow", "stage"]
+)
+REQUEST_DURATION = metrics.histogram(
+    "smartats_request_duration_seconds",
+    "End-to-end handling time of analysis requests",
+    ["flow"]
+)
+UPLOAD_SIZE = metrics.histogram(
+    "smartats_upload_size_bytes",
+    "Size of uploaded resume files",
+    ["file_type"],
+    buckets=SIZE_BUCKETS
+)
+TEXT_SIZE = metrics.histogram(
+    "smartats_text_size_characters",
+    "Length of analyzed texts",
+    ["kind"],
+    buckets=SIZE_BUCKETS
+)
+DOCUMENTS_PROCESSED = metrics.counter(
+    "smartats_documents_processed_total",
+    "Documents processed, by kind",
+    ["kind"]
+)
+CACHE_LOOKUPS = metrics.counter(
+    "smartats_cache_lookups_total",
+    "Cache lookups by cache and result",
+    ["cache", "result"]
+)
+PARSE_FAILURES = metrics.counter(
+    "smartats_parse_failures_total",
+    "Uploads that could not be parsed",
+    ["file_type", "reason"]
+)
+INDEXED_DOCUMENTS = metrics.counter(
+    "smartats_talent_index_operations_total",
+    "Resumes submitted to the talent index, by outcome",
+    ["result"]
+)
+POOL_REJECTIONS = metrics.counter(
+    "smartats_worker_pool_rejections_total",
+    "Tasks rejected or timed out by the worker pool",
+    ["reason"]
+)
+metrics.gauge(
+    "smartats_process_memory_bytes",
+    "Resident (rss), proportional (pss), shared and private memory of each server process",
+    ["process", "pid", "kind"],
+    callback=lambda: server_memory()
+)
+metrics.gauge(
+    "smartats_ready",
+    "1 once warm-up has finished and the instance is ready for traffic",
+    callback=lambda: 1.0 if ready else 0.0
+)
+WARM_UP_DURATION = metrics.gauge(
+    "smartats_warm_up_seconds",
+    "Time from startup until warm-up finished"
+)
+metrics.gauge(
+    "smartats_worker_pool_in_flight",
+    "Tasks currently queued or running in the worker pool",
+    callback=lambda: worker_pool.in_flight
+)
+ADMISSION_REJECTIONS = metrics.counter(
+    "smartats_admission_rejections_total",
+    "Requests shed by admission control, by endpoint class and reason",
+    ["endpoint_class", "reason"]
+)
+ADMISSION_WAIT = metrics.histogram(
+    "smartats_admission_wait_seconds",
+    "Time admitted requests waited for a slot",
+    ["endpoint_class"]
+)
+metrics.gauge(
+    "smartats_admission_queue_depth",
+    "Requests waiting for admission, by endpoint class",
+    ["endpoint_class"],
+    callback=lambda: {(name,): controller.queued for name, controller in admission_controllers.items()}
+)
+metrics.gauge(
+    "smartats_admission_in_flight",
+    "Admitted requests being handled, by endpoint class",
+    ["endpoint_class"],
+    callback=lambda: {(name,): controller.active for name, controller in admission_controllers.items()}
+)
+
+
+# Endpoints held back by admission control, by class: "parse" for uploads
+# (large bodies, text extraction), "archive" for archive uploads, which hold
+# their slot while every file is streamed and would otherwise inflate the
+# service time estimate of single uploads, and "analyze" for NLP scoring.
+# Everything else, such as /health and /metrics, is never queued.
+ADMISSION_CLASSES = {
+    "/upload-resume": "parse",
+    "/upload-archive": "archive",
+    "/quick-scan": "parse",
+    "/analyze": "analyze",
+    "/rank": "analyze",
+    "/catalog/match": "analyze",
+}
+
+admission_controllers = {
+    name: AdmissionController(name, concurrency, max_queue, ADMISSION_MAX_WAIT_SECONDS)
+    for name, concurrency, max_queue in (
+        ("parse", ADMISSION_PARSE_CONCURRENCY, ADMISSION_PARSE_QUEUE),
+        ("archive", ADMISSION_ARCHIVE_CONCURRENCY, ADMISSION_ARCHIVE_QUEUE),
+        ("analyze", ADMISSION_ANALYZE_CONCURRENCY, ADMISSION_ANALYZE_QUEUE),
+    )
+    if concurrency > 0
+}
+
+
+def classify_admission(scope: Dict) -> Optional[Tuple[AdmissionController, bool]]:
+    """
+    Admission class of a request, and whether it is small enough to have priority
+    """
+    if scope["method"] != "POST":
+        return None
+    controller = admission_controllers.get(ADMISSION_CLASSES.get(scope["path"], ""))
+    if controller is None:
+        return None
+    
+    content_length = dict(scope["headers"]).get(b"content-length", b"")
+    priority = content_length.isdigit() and int(content_length) <= ADMISSION_PRIORITY_MAX_BYTES
+    return controller, priority
+
+
+app.add_middleware(
+    AdmissionMiddleware,
+    classify=classify_admission,
+    on_admit=lambda controller, waited: ADMISSION_WAIT.observe(waited, endpoint_class=controller.name),
+    on_reject=lambda controller, rejection: ADMISSION_REJECTIONS.inc(
+        endpoint_class=controller.name, reason=rejection.reason
+    )
+)
+
+# CORS Configuration (added last, so it wraps admission control and shed
+# requests still carry CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure with your frontend URL in production
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "Retry-After"],
 )
 
-# Initialize services
-resume_parser = ResumeParser()
-nlp_processor = NLPProcessor()
-scoring_engine = ScoringEngine()
-text_cleaner = TextCleaner()
-
-# Constants
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-ALLOWED_EXTENSIONS = {'.pdf', '.docx'}
-
 
 class AnalyzeRequest(BaseModel):
     resume_text: str
@@ -62,6 +341,449 @@ class AnalyzeResponse(BaseModel):
     skill_gap_analysis: dict
 
 
+class RankCandidate(BaseModel):
+    id: str
+    resume_text: str
+
+
+class RankRequest(BaseModel):
+    job_description: str
+    resumes: List[RankCandidate]
+    top_k: int = 10
+    batch_id: Optional[str] = None
+
+
+class RankedCandidate(BaseModel):
+    id: str
+    rank: int
+    overall_score: float
+    keyword_score: float
+    similarity_score: float
+    skills_score: float
+    structure_score: float
+    grade: str
+    matched_keywords: List[str]
+    missing_keywords: List[str]
+    sections_found: List[str]
+    sections_missing: List[str]
+    skill_gap_analysis: dict
+
+
+class RankResponse(BaseModel):
+    batch_id: str
+    total_candidates: int
+    ranked_candidates: int
+    skipped: List[str]
+    results: List[RankedCandidate]
+
+
+class WeightProfile(BaseModel):
+    keyword: Optional[float] = None
+    similarity: Optional[float] = None
+    skills: Optional[float] = None
+    structure: Optional[float] = None
+
+
+class GradeThresholds(BaseModel):
+    excellent: Optional[float] = None
+    good: Optional[float] = None
+    fair: Optional[float] = None
+    poor: Optional[float] = None
+
+
+class RescoreRequest(BaseModel):
+    weights: Optional[WeightProfile] = None
+    thresholds: Optional[GradeThresholds] = None
+    top_k: int = 10
+
+
+class RescoredCandidate(BaseModel):
+    id: str
+    rank: int
+    overall_score: float
+    keyword_score: float
+    similarity_score: float
+    skills_score: float
+    structure_score: float
+    grade: str
+
+
+class RescoreResponse(BaseModel):
+    batch_id: str
+    total_candidates: int
+    weights: Dict[str, float]
+    thresholds: Dict[str, float]
+    results: List[RescoredCandidate]
+
+
+class SearchRequest(BaseModel):
+    job_description: str
+    top_k: int = 10
+
+
+class SearchResult(BaseModel):
+    id: int
+    score: float
+    source: str
+    filename: Optional[str]
+    skills: List[str]
+    matched_skills: List[str]
+    preview: str
+    indexed_at: float
+
+
+class SearchResponse(BaseModel):
+    total_indexed: int
+    results: List[SearchResult]
+
+
+class CatalogJob(BaseModel):
+    id: str
+    title: Optional[str] = None
+    description: str
+
+
+class CatalogJobsRequest(BaseModel):
+    jobs: List[CatalogJob]
+
+
+class CatalogJobsResponse(BaseModel):
+    added: int
+    updated: int
+    total_jobs: int
+
+
+class CatalogMatchRequest(BaseModel):
+    resume_text: str
+    top_k: int = 10
+
+
+class CatalogMatch(BaseModel):
+    job_id: str
+    title: Optional[str]
+    rank: int
+    overall_score: float
+    keyword_score: float
+    similarity_score: float
+    skills_score: float
+    structure_score: float
+    grade: str
+    matched_keywords: List[str]
+    missing_keywords: List[str]
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+
+class CatalogMatchResponse(BaseModel):
+    """
+    Best matching jobs of the catalog for one resume
+    
+    Keyword, skills and structure scores, weights and grades are those of
+    /analyze. Similarity is only comparable to /analyze when a corpus
+    TF-IDF model is configured (TFIDF_MODEL_PATH): without one, IDF weights
+    are fitted on the catalog's job descriptions rather than on the
+    resume/JD pair, so similarity and overall scores differ from what
+    /analyze gives for the same resume and job.
+    """
+    total_jobs: int
+    results: List[CatalogMatch]
+
+
+class BatchJobStatus(BaseModel):
+    job_id: str
+    status: str
+    total_candidates: int
+    processed_candidates: int
+    progress: float
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[RankResponse] = None
+
+
+@app.on_event("startup")
+async def start_worker_pool():
+    worker_pool.start()
+
+
+@app.on_event("startup")
+async def open_talent_index():
+    global talent_index
+    if TALENT_INDEX_DIR:
+        talent_index = TalentIndex(
+            TALENT_INDEX_DIR,
+            flush_docs=TALENT_INDEX_FLUSH_DOCS,
+            max_segments=TALENT_INDEX_MAX_SEGMENTS
+        )
+
+
+@app.on_event("startup")
+async def open_job_catalog():
+    global job_catalog, job_catalog_dir
+    # Jobs are added here; match features are built by each worker of the
+    # pool, in the background warm-up (or on its first match)
+    job_catalog_dir = JOB_CATALOG_DIR or tempfile.mkdtemp(prefix="smartats-catalog-")
+    job_catalog = await asyncio.to_thread(JobCatalog, job_catalog_dir)
+
+
+@app.on_event("startup")
+async def open_analysis_store():
+    global analysis_store
+    analysis_store = await asyncio.to_thread(
+        AnalysisStore, ANALYSIS_STORE_DIR or None, max_batches=ANALYSIS_STORE_MAX_BATCHES
+    )
+
+
+@app.on_event("startup")
+async def start_batch_jobs():
+    global job_queue, batch_job_dispatcher, batch_job_wakeup, batch_chunk_slots
+    batch_job_wakeup = asyncio.Event()
+    batch_chunk_slots = asyncio.Semaphore(BATCH_JOB_CONCURRENCY)
+    job_queue = await asyncio.to_thread(
+        JobQueue,
+        BATCH_JOBS_DIR or None,
+        ttl=BATCH_JOB_TTL_SECONDS,
+        lease_seconds=BATCH_JOB_LEASE_SECONDS
+    )
+    batch_job_dispatcher = asyncio.create_task(dispatch_batch_jobs())
+
+
+# Registered after the other startup handlers, so the job catalog is open
+@app.on_event("startup")
+async def start_warm_up():
+    global warm_up_task
+    warm_up_task = asyncio.create_task(warm_up())
+
+
+@app.on_event("shutdown")
+async def stop_warm_up():
+    global ready
+    ready = False
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+
+
+async def warm_up():
+    """
+    Load and warm up the models in every worker, then mark the instance ready
+    
+    Runs in the background, so the server binds and answers /health at
+    once; the first requests are served (more slowly) even before warm-up
+    has finished.
+    """
+    global ready, warm_up_error
+    start_time = time.perf_counter()
+    try:
+        warmup = functools.partial(pipeline.warm_up, job_catalog_dir)
+        await asyncio.gather(*(
+            asyncio.wrap_future(future) for future in worker_pool.start(warmup=warmup)
+        ))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        warm_up_error = str(e)
+        # Warm-up is the part of startup that runs in the background, so its
+        # failure is logged like that of any other startup hook
+        startup_logger.error("Warm-up failed", exc_info=True)
+        return
+    
+    WARM_UP_DURATION.set(time.perf_counter() - start_time)
+    ready = True
+
+
+# Registered before stop_worker_pool, so running jobs stop before the pool does
+@app.on_event("shutdown")
+async def stop_batch_jobs():
+    global job_queue, batch_job_dispatcher
+    if batch_job_dispatcher is not None:
+        batch_job_dispatcher.cancel()
+        batch_job_dispatcher = None
+    
+    running = list(batch_job_tasks.items())
+    for _, task in running:
+        task.cancel()
+    await asyncio.gather(*(task for _, task in running), return_exceptions=True)
+    
+    if job_queue is not None:
+        # Interrupted jobs continue from their last finished chunk after a restart
+        job_queue.release([job_id for job_id, _ in running])
+        job_queue.close()
+        job_queue = None
+
+
+@app.on_event("shutdown")
+async def stop_worker_pool():
+    worker_pool.shutdown()
+
+
+@app.on_event("shutdown")
+async def close_talent_index():
+    global talent_index
+    if talent_index is not None:
+        talent_index.close()
+        talent_index = None
+
+
+@app.on_event("shutdown")
+async def close_analysis_store():
+    global analysis_store
+    if analysis_store is not None:
+        analysis_store.close()
+        analysis_store = None
+
+
+@app.on_event("shutdown")
+async def close_job_catalog():
+    global job_catalog, job_catalog_dir
+    if job_catalog is not None:
+        job_catalog.close()
+        job_catalog = None
+    if job_catalog_dir is not None:
+        # Only open here when the pool runs in-process (ANALYSIS_WORKERS=0)
+        pipeline.close_job_catalog(job_catalog_dir)
+        if not JOB_CATALOG_DIR:
+            shutil.rmtree(job_catalog_dir, ignore_errors=True)
+        job_catalog_dir = None
+
+
+async def run_in_pool(func, *args, timeout: Optional[float] = None):
+    """
+    Run a pipeline task in the worker pool, mapping pool errors to HTTP errors
+    """
+    try:
+        return await worker_pool.run(func, *args, timeout=timeout)
+    except WorkerPoolBusy:
+        POOL_REJECTIONS.inc(reason="busy")
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy. Please retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+    except WorkerPoolTimeout:
+        POOL_REJECTIONS.inc(reason="timeout")
+        raise HTTPException(status_code=504, detail="Analysis timed out")
+
+
+async def run_stages(timer: StageTimer, func, *args, timeout: Optional[float] = None) -> Dict:
+    """
+    Run a pipeline task in the pool and merge its stage timings into timer
+    
+    Time not accounted for by the worker's own stages (waiting for a free
+    worker, pickling arguments and results) is recorded as "queue".
+    """
+    start_time = time.perf_counter()
+    result = await run_in_pool(func, *args, timeout=timeout)
+    elapsed = time.perf_counter() - start_time
+    
+    stage_timings = result.pop('stage_timings', {})
+    timer.update(stage_timings)
+    timer.add('queue', max(0.0, elapsed - sum(stage_timings.values())))
+    return result
+
+
+async def index_resume(resume_text: str, source: str, filename: Optional[str] = None):
+    """
+    Add a resume to the talent index (runs as a background task after the response)
+    """
+    index = talent_index
+    if index is None:
+        return
+    
+    try:
+        document_hash = await asyncio.to_thread(content_hash, resume_text)
+        if await asyncio.to_thread(index.contains, document_hash):
+            INDEXED_DOCUMENTS.inc(result="duplicate")
+            return
+        
+        document = await run_in_pool(pipeline.prepare_index_document, resume_text)
+        await asyncio.to_thread(
+            index.add, document['text'], document['terms'], document_hash, source, filename
+        )
+        INDEXED_DOCUMENTS.inc(result="added")
+    except HTTPException as e:
+        # The pool is saturated; indexing is best effort and never competes with requests
+        INDEXED_DOCUMENTS.inc(result="skipped")
+        print(f"Talent index skipped a resume: {e.detail}")
+    except Exception as e:
+        INDEXED_DOCUMENTS.inc(result="error")
+        print(f"Talent index error: {e}")
+
+
+def server_memory() -> Dict[Tuple[str, ...], float]:
+    """
+    Memory of the server's processes, by process role, PID and kind
+    
+    Roles are "master" and "server_worker" under the pre-fork server (any
+    worker reports all of them), "server" otherwise, and "analysis_worker"
+    for worker pool processes.
+    """
+    if PREFORK_MASTER_PID:
+        servers = [("server_worker", pid) for pid in child_pids(PREFORK_MASTER_PID)]
+        processes = [("master", PREFORK_MASTER_PID)] + servers
+    else:
+        servers = [("server", os.getpid())]
+        processes = list(servers)
+    processes += [("analysis_worker", child) for _, pid in servers for child in child_pids(pid)]
+    
+    values = {}
+    for role, pid in processes:
+        for kind, size in (process_memory(pid) or {}).items():
+            values[(role, str(pid), kind)] = size
+    return values
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+@contextmanager
+def track_request(flow: str, response: Response, debug_timing: Optional[str]):
+    """
+    Time a request and record its stage timings
+    
+    Clients can send ``X-Debug-Timing: 1`` to get the timings of their own
+    request back in a Server-Timing header.
+    """
+    timer = StageTimer()
+    start_time = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        total = time.perf_counter() - start_time
+        REQUEST_DURATION.observe(total, flow=flow)
+        for stage, seconds in timer.timings.items():
+            STAGE_DURATION.observe(seconds, flow=flow, stage=stage)
+        
+        if debug_timing and debug_timing.lower() in ('1', 'true', 'yes'):
+            timer.add('total', total)
+            response.headers['Server-Timing'] = timer.server_timing()
+
+
+async def read_upload(file: UploadFile) -> Tuple[bytes, str]:
+    """
+    Read a file parsed by an upload route and compute its SHA-256 digest
+    
+    Upload routes keep the file in memory and have already rejected it with
+    413 if it exceeds MAX_FILE_SIZE, so it is read in one go.
+    
+    Returns:
+        Tuple of (content bytes, hex digest)
+    """
+    content = await file.read()
+    return content, hashlib.sha256(content).hexdigest()
+
+
+# Single-file uploads are parsed in memory, and rejected before parsing (on
+# Content-Length) or while streaming once they are over the size limit
+upload_router = APIRouter(route_class=upload_route(
+    MAX_FILE_SIZE,
+    MAX_UPLOAD_BODY_SIZE,
+    f"File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024*1024)}MB"
+))
+
+
 @app.get("/")
 async def root():
     return {"message": "SmartATS API is running", "version": "1.0.0"}
@@ -72,10 +794,79 @@ async def health_check():
     return {"status": "healthy"}
 
 
-@app.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
+@app.get("/ready")
+async def readiness_check():
     """
-    Upload and extract text from resume (PDF/DOCX)
+    Readiness for traffic, unlike /health which only reports that the process is up
+    
+    Returns 503 until the models are loaded and warmed up in every worker,
+    and again once shutdown has begun.
+    """
+    if ready:
+        return {"status": "ready"}
+    
+    status = "failed" if warm_up_error else "starting"
+    return JSONResponse(
+        status_code=503,
+        content={"status": status, "detail": warm_up_error},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Stage latencies, document sizes, cache and failure counters (Prometheus format)
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+async def extract_resume_cached(
+    content: bytes,
+    digest: str,
+    file_ext: str,
+    timer: StageTimer,
+    kind: str
+) -> Tuple[Dict, bool]:
+    """
+    Extract and clean a resume's text in a worker process, using the extracted text cache
+    
+    Returns:
+        Tuple of (extraction, whether it came from the cache)
+    """
+    # Re-uploads of the same file are served from the extracted text cache;
+    # a miss in memory reads the disk cache, so lookups run off the event loop
+    cache_key = f"resume-text:v3:{file_ext}:{digest}"
+    extraction = await asyncio.to_thread(resume_text_cache.get, cache_key)
+    cached = extraction is not None
+    record_cache_lookup("resume_text", cached)
+    
+    if extraction is None:
+        try:
+            # Extract and clean text from the in-memory file in a worker process
+            extraction = await run_stages(timer, pipeline.extract_resume, content, file_ext)
+        except HTTPException:
+            raise
+        except Exception as e:
+            PARSE_FAILURES.inc(file_type=file_ext, reason="error")
+            raise HTTPException(status_code=500, detail=str(e))
+        
+        await asyncio.to_thread(resume_text_cache.set, cache_key, extraction)
+        DOCUMENTS_PROCESSED.inc(kind=kind)
+    
+    return extraction, cached
+
+
+async def process_upload(
+    file: UploadFile,
+    timer: StageTimer,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> Dict:
+    """
+    Validate an upload and extract its text, using the extracted text cache
+    
+    With background_tasks, the extracted text is added to the talent index
+    after the response is sent.
     """
     # Validate file extension
     file_ext = os.path.splitext(file.filename)[1].lower()
@@ -85,66 +876,394 @@ async def upload_resume(file: UploadFile = File(...)):
             detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # Read file content
-    content = await file.read()
+    # Read the file content, already held in memory by the upload route
+    with timer.stage('read'):
+        content, digest = await read_upload(file)
+    UPLOAD_SIZE.observe(len(content), file_type=file_ext)
     
-    # Validate file size
-    if len(content) > MAX_FILE_SIZE:
+    extraction, cached = await extract_resume_cached(content, digest, file_ext, timer, kind="upload")
+    
+    if not extraction['extracted_text']:
+        PARSE_FAILURES.inc(file_type=file_ext, reason="insufficient_text")
         raise HTTPException(
             status_code=400,
-            detail=f"File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024*1024)}MB"
+            detail="Could not extract sufficient text from the resume. Please ensure the file is not empty or corrupted."
         )
     
-    # Create temporary file for processing
-    temp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            temp_file.write(content)
-            temp_path = temp_file.name
-        
-        # Extract text from resume
-        extracted_text = resume_parser.extract_text(temp_path, file_ext)
-        
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract sufficient text from the resume. Please ensure the file is not empty or corrupted."
-            )
-        
-        # Clean the extracted text
-        cleaned_text = text_cleaner.clean_text(extracted_text)
-        
-        return {
-            "success": True,
-            "filename": file.filename,
-            "extracted_text": cleaned_text,
-            "character_count": len(cleaned_text),
-            "word_count": len(cleaned_text.split())
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if background_tasks is not None and talent_index is not None:
+        background_tasks.add_task(index_resume, extraction['extracted_text'], "upload", file.filename)
     
-    finally:
-        # Security: Delete file after processing
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
+    return {
+        "success": True,
+        "filename": file.filename,
+        "cached": cached,
+        **extraction
+    }
 
 
-@app.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_resume(request: AnalyzeRequest):
+@upload_router.post("/upload-resume")
+async def upload_resume(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    x_debug_timing: Optional[str] = Header(None)
+):
     """
-    Analyze resume against job description and return ATS compatibility score
+    Upload and extract text from resume (PDF/DOCX)
     """
+    with track_request("upload", response, x_debug_timing) as timer:
+        return await process_upload(file, timer, background_tasks)
+
+
+# Archives are spooled to disk by the multipart parser (unlike single files,
+# they can be far larger than what should be held in memory) and rejected
+# with 413 once they are over the size limit
+archive_router = APIRouter(route_class=upload_route(
+    MAX_ARCHIVE_SIZE,
+    MAX_ARCHIVE_SIZE + 1024 * 1024,
+    f"Archive exceeds maximum allowed size of {MAX_ARCHIVE_SIZE // (1024*1024)}MB",
+    in_memory=False
+))
+
+
+def detach_upload(file: UploadFile) -> BinaryIO:
+    """
+    Take over the spooled file of an upload
+    
+    The multipart form closes its files when the endpoint returns, before a
+    streaming response is sent; the detached file stays open for the stream,
+    without copying the upload.
+    """
+    spool = file.file
+    file.file = io.BytesIO()
+    return spool
+
+
+def list_archive_members(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """
+    Files of an archive, without folders and hidden files (e.g. macOS __MACOSX metadata)
+    """
+    return [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith('__MACOSX/')
+        and not os.path.basename(info.filename).startswith('.')
+    ]
+
+
+def read_archive_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+    """
+    Decompress one archive member, enforcing MAX_FILE_SIZE on the actual data
+    
+    The size in the ZIP header is only a claim, so reading stops one byte
+    past the limit.
+    """
+    with archive.open(info) as member:
+        content = member.read(MAX_FILE_SIZE + 1)
+    if len(content) > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024*1024)}MB"
+        )
+    return content
+
+
+async def process_archive_member(
+    archive: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    include_text: bool
+) -> Tuple[Dict, Optional[str]]:
+    """
+    Extract the text of one archive member
+    
+    Errors are reported in the result rather than raised, so one bad file
+    does not end the stream.
+    
+    Returns:
+        Tuple of (result line, text to add to the talent index or None)
+    """
+    file_ext = os.path.splitext(info.filename)[1].lower()
+    timer = StageTimer()
     try:
-        resume_text = request.resume_text.strip()
-        job_description = request.job_description.strip()
-        
-        if len(resume_text) < 50:
+        if file_ext not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
-                detail="Resume text is too short for analysis"
+                detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
+        if info.flag_bits & 0x1:
+            raise HTTPException(status_code=400, detail="File is encrypted")
+        if info.file_size > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024*1024)}MB"
+            )
+        
+        with timer.stage('read'):
+            content = await asyncio.to_thread(read_archive_member, archive, info)
+        UPLOAD_SIZE.observe(len(content), file_type=file_ext)
+        
+        digest = hashlib.sha256(content).hexdigest()
+        extraction, cached = await extract_resume_cached(content, digest, file_ext, timer, kind="archive")
+        
+        if not extraction['extracted_text']:
+            PARSE_FAILURES.inc(file_type=file_ext, reason="insufficient_text")
+            raise HTTPException(status_code=400, detail="Could not extract sufficient text from the resume")
+        
+        result = {"filename": info.filename, "success": True, "cached": cached, **extraction}
+        text = result['extracted_text'] if talent_index is not None else None
+        if not include_text:
+            del result['extracted_text']
+        return result, text
+    
+    except HTTPException as e:
+        return {"filename": info.filename, "success": False, "status_code": e.status_code, "error": e.detail}, None
+    except Exception as e:
+        return {"filename": info.filename, "success": False, "status_code": 500, "error": str(e)}, None
+    finally:
+        for stage, seconds in timer.timings.items():
+            STAGE_DURATION.observe(seconds, flow="archive", stage=stage)
+
+
+async def stream_archive_results(
+    spool: BinaryIO,
+    archive: zipfile.ZipFile,
+    members: List[zipfile.ZipInfo],
+    include_text: bool
+) -> AsyncIterator[bytes]:
+    """
+    Process archive members in the worker pool, yielding NDJSON lines as they finish
+    
+    Only ARCHIVE_CONCURRENCY members are read, in flight or being added to
+    the talent index at a time, so memory does not depend on the size of the
+    archive. A file's line is sent as soon as its text is extracted; indexing
+    goes on in the worker pool alongside the next files. A summary line ends
+    the stream.
+    """
+    start_time = time.perf_counter()
+    remaining = iter(members)
+    pending = set()
+    indexing = set()
+    succeeded = failed = 0
+    try:
+        while True:
+            while len(pending) + len(indexing) < ARCHIVE_CONCURRENCY:
+                info = next(remaining, None)
+                if info is None:
+                    break
+                pending.add(asyncio.create_task(process_archive_member(archive, info, include_text)))
+            
+            if not pending and not indexing:
+                break
+            
+            done, _ = await asyncio.wait(pending | indexing, return_when=asyncio.FIRST_COMPLETED)
+            indexing -= done
+            for task in done & pending:
+                result, text = task.result()
+                if text:
+                    indexing.add(asyncio.create_task(index_resume(text, "archive", result['filename'])))
+                if result['success']:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield (json.dumps(result) + "\n").encode()
+            pending -= done
+        
+        yield (json.dumps({
+            "done": True,
+            "files": len(members),
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 1)
+        }) + "\n").encode()
+    finally:
+        # The client went away: stop queued work before closing the archive under it
+        for task in pending | indexing:
+            task.cancel()
+        await asyncio.gather(*pending, *indexing, return_exceptions=True)
+        archive.close()
+        spool.close()
+        REQUEST_DURATION.observe(time.perf_counter() - start_time, flow="archive")
+
+
+@archive_router.post("/upload-archive")
+async def upload_archive(
+    file: UploadFile = File(...),
+    include_text: bool = Form(False)
+):
+    """
+    Extract text from every resume (PDF/DOCX) in a ZIP archive
+    
+    Members are decompressed one at a time straight from the spooled upload
+    (never unpacked to disk) and parsed in parallel in the worker pool.
+    Results are streamed back as NDJSON, one line per file in completion
+    order, followed by a summary line.
+    """
+    if os.path.splitext(file.filename)[1].lower() != '.zip':
+        raise HTTPException(status_code=400, detail="Invalid file type. Allowed types: .zip")
+    
+    spool = detach_upload(file)
+    try:
+        archive = await asyncio.to_thread(zipfile.ZipFile, spool)
+    except zipfile.BadZipFile:
+        spool.close()
+        raise HTTPException(status_code=400, detail="File is not a valid ZIP archive")
+    
+    members = list_archive_members(archive)
+    if len(members) > MAX_ARCHIVE_FILES:
+        archive.close()
+        spool.close()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum allowed per archive is {MAX_ARCHIVE_FILES}"
+        )
+    
+    return StreamingResponse(
+        stream_archive_results(spool, archive, members, include_text),
+        media_type="application/x-ndjson"
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header value matches an ETag (weak comparison)
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag in (tag.strip().removeprefix('W/') for tag in if_none_match.split(','))
+
+
+async def analyze_once(key: str, resume_text: str, job_description: str, timer: StageTimer) -> Dict:
+    """
+    Run one analysis in a worker process and cache it with its ETag
+    
+    The returned entry may be shared by several requests, so it is never
+    modified afterwards.
+    """
+    result = await run_stages(timer, pipeline.analyze_resume, resume_text, job_description)
+    record_cache_lookup("jd_profile", result.pop('jd_cache_hit'))
+    DOCUMENTS_PROCESSED.inc(kind="analysis")
+    
+    analysis = AnalyzeResponse(**result).model_dump()
+    body_hash = hashlib.sha256(json.dumps(analysis, sort_keys=True).encode('utf-8')).hexdigest()
+    entry = {'analysis': analysis, 'etag': f'"{body_hash[:32]}"'}
+    
+    if analysis_result_cache is not None:
+        analysis_result_cache.set(key, entry)
+    return entry
+
+
+async def process_analysis(
+    request: AnalyzeRequest,
+    timer: StageTimer,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> Tuple[AnalyzeResponse, str]:
+    """
+    Validate an analysis request and score the resume in a worker process
+    
+    Requests with the same normalized resume and JD (see content_hash) are
+    served from the result cache, or wait for an identical analysis already
+    in flight instead of starting their own.
+    
+    Returns:
+        Tuple of (analysis, ETag of the analysis)
+    """
+    resume_text = request.resume_text.strip()
+    job_description = request.job_description.strip()
+    
+    if len(resume_text) < 50:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume text is too short for analysis"
+        )
+    
+    if len(job_description) < 20:
+        raise HTTPException(
+            status_code=400,
+            detail="Job description is too short for analysis"
+        )
+    
+    TEXT_SIZE.observe(len(resume_text), kind="resume")
+    TEXT_SIZE.observe(len(job_description), kind="job_description")
+    
+    # Cleaning up to 5MB of text to hash it would block the event loop
+    resume_hash, job_description_hash = await asyncio.gather(
+        asyncio.to_thread(content_hash, resume_text),
+        asyncio.to_thread(content_hash, job_description)
+    )
+    key = f"analysis:v2:{resume_hash}:{job_description_hash}"
+    entry = analysis_result_cache.get(key) if analysis_result_cache is not None else None
+    if entry is not None:
+        CACHE_LOOKUPS.inc(cache="analysis_result", result="hit")
+    else:
+        start_time = time.perf_counter()
+        entry, shared = await analysis_flights.run(
+            key, lambda: analyze_once(key, resume_text, job_description, timer)
+        )
+        if shared:
+            # The stages were timed by the request that started the analysis
+            timer.add('coalesced', time.perf_counter() - start_time)
+        CACHE_LOOKUPS.inc(cache="analysis_result", result="coalesced" if shared else "miss")
+    
+    if background_tasks is not None and talent_index is not None:
+        background_tasks.add_task(index_resume, resume_text, "analyze")
+    
+    return AnalyzeResponse(**entry['analysis']), entry['etag']
+
+
+@app.post("/analyze", response_model=AnalyzeResponse)
+async def analyze_resume(
+    request: AnalyzeRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    x_debug_timing: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Analyze resume against job description and return ATS compatibility score
+    
+    The response carries an ETag; clients can send it back in If-None-Match
+    to get an empty 304 when the analysis has not changed.
+    """
+    try:
+        with track_request("analyze", response, x_debug_timing) as timer:
+            analysis, etag = await process_analysis(request, timer, background_tasks)
+        
+        response.headers["ETag"] = etag
+        if etag_matches(if_none_match, etag):
+            # A response returned as is would drop the headers set on the
+            # injected one (Server-Timing among them)
+            return Response(status_code=304, headers=response.headers)
+        
+        return analysis
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+@app.post("/rank", response_model=RankResponse)
+async def rank_resumes(
+    request: RankRequest,
+    response: Response,
+    x_debug_timing: Optional[str] = Header(None)
+):
+    """
+    Rank many resumes against a single job description
+    
+    The job description is cleaned and analyzed once, and all resumes are
+    vectorized together, so the cost scales with the number of resumes
+    rather than the number of requests.
+    
+    Component scores of every ranked candidate are stored under batch_id
+    (a new one unless given), so the batch can be re-ranked with other
+    weights through /rank/{batch_id}/rescore. A given batch_id must have
+    been ranked against the same job description, otherwise 409.
+    """
+    try:
+        job_description = request.job_description.strip()
         
         if len(job_description) < 20:
             raise HTTPException(
@@ -152,83 +1271,644 @@ async def analyze_resume(request: AnalyzeRequest):
                 detail="Job description is too short for analysis"
             )
         
-        # Clean texts
-        cleaned_resume = text_cleaner.clean_text(resume_text)
-        cleaned_jd = text_cleaner.clean_text(job_description)
+        if not request.resumes:
+            raise HTTPException(status_code=400, detail="No resumes provided")
+        
+        if len(request.resumes) > MAX_RANK_CANDIDATES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many resumes. Maximum allowed per request is {MAX_RANK_CANDIDATES}"
+            )
         
-        # NLP Processing
-        resume_keywords = nlp_processor.extract_keywords(cleaned_resume)
-        jd_keywords = nlp_processor.extract_keywords(cleaned_jd)
+        if request.top_k < 1:
+            raise HTTPException(status_code=400, detail="top_k must be at least 1")
         
-        # Calculate similarity score using TF-IDF and cosine similarity
-        similarity_score = nlp_processor.calculate_similarity(cleaned_resume, cleaned_jd)
+        batch_id = request.batch_id or uuid.uuid4().hex
+        job_description_hash = await asyncio.to_thread(content_hash, job_description)
+        if request.batch_id and not await asyncio.to_thread(
+            analysis_store.accepts, batch_id, job_description_hash
+        ):
+            raise HTTPException(status_code=409, detail=BATCH_CONFLICT_DETAIL)
         
-        # Keyword matching analysis
-        keyword_analysis = nlp_processor.analyze_keywords(resume_keywords, jd_keywords)
+        resumes = [(candidate.id, candidate.resume_text) for candidate in request.resumes]
         
-        # Section detection
-        sections_analysis = nlp_processor.detect_sections(cleaned_resume)
+        with track_request("rank", response, x_debug_timing) as timer:
+            result = await run_stages(
+                timer,
+                pipeline.rank_resumes,
+                job_description,
+                resumes,
+                request.top_k,
+                timeout=RANK_TIMEOUT_SECONDS
+            )
+            
+            with timer.stage('store'):
+                await asyncio.to_thread(
+                    analysis_store.save,
+                    batch_id,
+                    job_description_hash,
+                    result.pop('candidate_ids'),
+                    result.pop('component_scores')
+                )
         
-        # Skills gap analysis
-        skill_gap = nlp_processor.analyze_skill_gap(cleaned_resume, cleaned_jd)
+        record_cache_lookup("jd_profile", result.pop('jd_cache_hit'))
+        DOCUMENTS_PROCESSED.inc(result['ranked_candidates'], kind="rank_candidate")
         
-        # Calculate final scores
-        scores = scoring_engine.calculate_scores(
-            keyword_match_ratio=keyword_analysis['match_ratio'],
-            similarity_score=similarity_score,
-            skills_match_ratio=skill_gap['match_ratio'],
-            sections_found=sections_analysis['found']
-        )
+        return RankResponse(batch_id=batch_id, **result)
         
-        # Generate improvement suggestions
-        suggestions = scoring_engine.generate_suggestions(
-            keyword_analysis=keyword_analysis,
-            sections_analysis=sections_analysis,
-            skill_gap=skill_gap,
-            overall_score=scores['overall_score']
+    except HTTPException:
+        raise
+    except BatchConflict:
+        # Another request stored this batch_id for another job description meanwhile
+        raise HTTPException(status_code=409, detail=BATCH_CONFLICT_DETAIL)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ranking failed: {str(e)}")
+
+
+@app.post("/rank/{batch_id}/rescore", response_model=RescoreResponse)
+async def rescore_batch(
+    batch_id: str,
+    request: RescoreRequest,
+    response: Response,
+    x_debug_timing: Optional[str] = Header(None)
+):
+    """
+    Re-rank a stored /rank batch under another weight and grade threshold profile
+    
+    Only the stored component scores are re-weighted; no resume is analyzed
+    again. Weights left out keep their defaults and must still sum to 1.
+    """
+    if request.top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
+    
+    try:
+        scoring_engine = ScoringEngine(
+            weights=request.weights.model_dump(exclude_none=True) if request.weights else None,
+            thresholds=request.thresholds.model_dump(exclude_none=True) if request.thresholds else None
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        with track_request("rescore", response, x_debug_timing) as timer:
+            with timer.stage('load'):
+                batch = await asyncio.to_thread(analysis_store.load, batch_id)
+            if batch is None:
+                raise HTTPException(status_code=404, detail="Batch not found")
+            
+            with timer.stage('scoring'):
+                scores = scoring_engine.combine_scores(*(batch[name] for name in COMPONENT_SCORES))
+                order = top_k_indices(scores['overall_score'], request.top_k)
+        
+        results = [
+            RescoredCandidate(
+                id=batch['candidate_ids'][index],
+                rank=rank,
+                overall_score=round(float(scores['overall_score'][index]), 1),
+                keyword_score=round(float(scores['keyword_score'][index]), 1),
+                similarity_score=round(float(scores['similarity_score'][index]), 1),
+                skills_score=round(float(scores['skills_score'][index]), 1),
+                structure_score=round(float(scores['structure_score'][index]), 1),
+                grade=str(scores['grade'][index])
+            )
+            for rank, index in enumerate(order, start=1)
+        ]
         
-        return AnalyzeResponse(
-            overall_score=round(scores['overall_score'], 1),
-            keyword_score=round(scores['keyword_score'], 1),
-            similarity_score=round(scores['similarity_score'], 1),
-            skills_score=round(scores['skills_score'], 1),
-            structure_score=round(scores['structure_score'], 1),
-            matched_keywords=keyword_analysis['matched'],
-            missing_keywords=keyword_analysis['missing'],
-            sections_found=sections_analysis['found'],
-            sections_missing=sections_analysis['missing'],
-            suggestions=suggestions,
-            skill_gap_analysis=skill_gap
+        return RescoreResponse(
+            batch_id=batch_id,
+            total_candidates=len(batch['candidate_ids']),
+            weights=scoring_engine.weights,
+            thresholds=scoring_engine.thresholds,
+            results=results
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Rescoring failed: {str(e)}")
+
 
+@app.delete("/rank/{batch_id}")
+async def delete_batch(batch_id: str):
+    """
+    Delete the stored component scores of a /rank batch
+    """
+    if not await asyncio.to_thread(analysis_store.delete, batch_id):
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    return {"success": True, "batch_id": batch_id}
+
+
+def batch_job_status(job: Dict) -> BatchJobStatus:
+    return BatchJobStatus(
+        job_id=job['job_id'],
+        status=job['status'],
+        total_candidates=job['total'],
+        processed_candidates=job['processed'],
+        progress=round(job['processed'] / job['total'], 4) if job['total'] else 1.0,
+        created_at=job['created_at'],
+        started_at=job['started_at'],
+        finished_at=job['finished_at'],
+        expires_at=job['expires_at'],
+        error=job['error'],
+        result=job.get('result')
+    )
+
+
+async def dispatch_batch_jobs():
+    """
+    Start queued batch jobs while slots are free, renew leases and purge expired jobs
+    
+    Wakes up when a job is submitted or finishes, and at least every
+    BATCH_JOB_POLL_SECONDS to pick up jobs queued by other processes.
+    """
+    last_heartbeat = last_purge = 0.0
+    while True:
+        try:
+            now = time.monotonic()
+            if now - last_heartbeat >= BATCH_JOB_LEASE_SECONDS / 4:
+                last_heartbeat = now
+                # Jobs cancelled through another process are stopped here
+                for job_id in await asyncio.to_thread(job_queue.heartbeat, list(batch_job_tasks)):
+                    task = batch_job_tasks.get(job_id)
+                    if task is not None:
+                        task.cancel()
+            
+            if now - last_purge >= 60:
+                last_purge = now
+                await asyncio.to_thread(job_queue.purge_expired)
+            
+            while len(batch_job_tasks) < BATCH_JOB_MAX_RUNNING:
+                job = await asyncio.to_thread(job_queue.claim)
+                if job is None:
+                    break
+                task = asyncio.create_task(run_batch_job(job))
+                batch_job_tasks[job['job_id']] = task
+                task.add_done_callback(lambda _, job_id=job['job_id']: finish_batch_job_task(job_id))
+        except Exception as e:
+            print(f"Batch job dispatcher error: {e}")
+        
+        try:
+            await asyncio.wait_for(batch_job_wakeup.wait(), timeout=BATCH_JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        batch_job_wakeup.clear()
 
-@app.post("/quick-scan")
+
+def finish_batch_job_task(job_id: str):
+    batch_job_tasks.pop(job_id, None)
+    batch_job_wakeup.set()
+
+
+async def run_batch_job(job: Dict):
+    """
+    Rank the chunks of a batch job that are not finished yet, then merge them into the result
+    """
+    job_id = job['job_id']
+    request = job['request']
+    tasks = [
+        asyncio.create_task(run_batch_chunk(job_id, request, chunk))
+        for chunk in range(job['chunks'])
+        if chunk not in job['finished_chunks']
+    ]
+    try:
+        await asyncio.gather(*tasks)
+        
+        chunks = await asyncio.to_thread(job_queue.load_chunks, job_id)
+        if len(chunks) < job['chunks']:
+            # Cancelled through another process while the last chunks ran
+            return
+        result, candidate_ids, component_scores = await asyncio.to_thread(merge_batch_chunks, request, chunks)
+        job_description_hash = await asyncio.to_thread(content_hash, request['job_description'])
+        await asyncio.to_thread(
+            analysis_store.save, result['batch_id'], job_description_hash, candidate_ids, component_scores
+        )
+        await asyncio.to_thread(job_queue.complete, job_id, result)
+    except asyncio.CancelledError:
+        # Cancelled by the client (already recorded) or by shutdown (released for a restart)
+        for task in tasks:
+            task.cancel()
+        raise
+    except Exception as e:
+        for task in tasks:
+            task.cancel()
+        print(f"Batch job {job_id} failed: {e}")
+        await asyncio.to_thread(job_queue.fail, job_id, str(e))
+
+
+async def run_batch_chunk(job_id: str, request: Dict, chunk: int):
+    """
+    Rank one chunk of a batch job in the worker pool and store its result
+    
+    Chunks wait for a slot in BATCH_JOB_CONCURRENCY, and retry instead of
+    failing while the pool is full, so interactive requests keep priority.
+    """
+    chunk_size = request['chunk_size']
+    resumes = [tuple(resume) for resume in request['resumes'][chunk * chunk_size:(chunk + 1) * chunk_size]]
+    
+    async with batch_chunk_slots:
+        while True:
+            try:
+                result = await worker_pool.run(
+                    pipeline.rank_resumes,
+                    request['job_description'],
+                    resumes,
+                    request['top_k'],
+                    timeout=RANK_TIMEOUT_SECONDS
+                )
+                break
+            except WorkerPoolBusy:
+                POOL_REJECTIONS.inc(reason="busy")
+                await asyncio.sleep(BATCH_JOB_POLL_SECONDS)
+    
+    for stage, seconds in result['stage_timings'].items():
+        STAGE_DURATION.observe(seconds, flow="batch_job", stage=stage)
+    record_cache_lookup("jd_profile", result['jd_cache_hit'])
+    DOCUMENTS_PROCESSED.inc(result['ranked_candidates'], kind="rank_candidate")
+    
+    await asyncio.to_thread(job_queue.save_chunk, job_id, chunk, len(resumes), {
+        'skipped': result['skipped'],
+        'results': result['results'],
+        'candidate_ids': result['candidate_ids'],
+        'component_scores': {name: result['component_scores'][name].tolist() for name in COMPONENT_SCORES}
+    })
+
+
+def merge_batch_chunks(request: Dict, chunks: List[Dict]) -> Tuple[Dict, List[str], Dict]:
+    """
+    Merge the chunk results of a batch job into one ranking, as /rank returns it
+    
+    The top candidates overall are among the top candidates of their chunk,
+    so the stored details of each chunk's top_k are enough. Candidates are
+    ordered by their full-precision scores, with ties in submitted order.
+    Candidate IDs need not be unique, so details are matched to candidates
+    by position: each chunk's results are in the order its scores give.
+    
+    Returns:
+        Tuple of (result, candidate IDs, component scores for the analysis store)
+    """
+    scoring_engine = ScoringEngine()
+    candidate_ids = []
+    skipped = []
+    component_scores = {name: [] for name in COMPONENT_SCORES}
+    details = {}
+    for chunk in chunks:
+        offset = len(candidate_ids)
+        chunk_scores = scoring_engine.combine_scores(
+            *(np.array(chunk['component_scores'][name], dtype=np.float64) for name in COMPONENT_SCORES)
+        )
+        chunk_order = top_k_indices(chunk_scores['overall_score'], request['top_k'])
+        for index, detail in zip(chunk_order, chunk['results']):
+            details[offset + int(index)] = detail
+        candidate_ids.extend(chunk['candidate_ids'])
+        skipped.extend(chunk['skipped'])
+        for name in COMPONENT_SCORES:
+            component_scores[name].extend(chunk['component_scores'][name])
+    
+    component_scores = {name: np.array(values, dtype=np.float64) for name, values in component_scores.items()}
+    scores = scoring_engine.combine_scores(*(component_scores[name] for name in COMPONENT_SCORES))
+    order = top_k_indices(scores['overall_score'], request['top_k'])
+    
+    result = {
+        'batch_id': request['batch_id'],
+        'total_candidates': len(request['resumes']),
+        'ranked_candidates': len(candidate_ids),
+        'skipped': skipped,
+        'results': [{**details[index], 'rank': rank} for rank, index in enumerate(order, start=1)]
+    }
+    return result, candidate_ids, component_scores
+
+
+@app.post("/batch-jobs", response_model=BatchJobStatus, status_code=202)
+async def submit_batch_job(request: RankRequest):
+    """
+    Queue a /rank batch too large to finish within one HTTP request
+    
+    Returns a job ID right away. Progress and the result (in the format of
+    /rank) are available from /batch-jobs/{job_id}, or as server-sent events
+    from /batch-jobs/{job_id}/events. Jobs survive restarts when
+    BATCH_JOBS_DIR is set.
+    """
+    job_description = request.job_description.strip()
+    
+    if len(job_description) < 20:
+        raise HTTPException(
+            status_code=400,
+            detail="Job description is too short for analysis"
+        )
+    
+    if not request.resumes:
+        raise HTTPException(status_code=400, detail="No resumes provided")
+    
+    if len(request.resumes) > MAX_BATCH_JOB_CANDIDATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many resumes. Maximum allowed per job is {MAX_BATCH_JOB_CANDIDATES}"
+        )
+    
+    if request.top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
+    
+    if request.batch_id:
+        job_description_hash = await asyncio.to_thread(content_hash, job_description)
+        if not await asyncio.to_thread(analysis_store.accepts, request.batch_id, job_description_hash):
+            raise HTTPException(status_code=409, detail=BATCH_CONFLICT_DETAIL)
+    
+    job_request = {
+        'job_description': job_description,
+        'resumes': [(candidate.id, candidate.resume_text) for candidate in request.resumes],
+        'top_k': request.top_k,
+        'batch_id': request.batch_id or uuid.uuid4().hex,
+        'chunk_size': BATCH_JOB_CHUNK_SIZE
+    }
+    chunks = -(-len(request.resumes) // BATCH_JOB_CHUNK_SIZE)
+    
+    job = await asyncio.to_thread(job_queue.submit, job_request, len(request.resumes), chunks)
+    batch_job_wakeup.set()
+    return batch_job_status(job)
+
+
+@app.get("/batch-jobs/{job_id}", response_model=BatchJobStatus)
+async def get_batch_job(job_id: str):
+    """
+    Get the status and progress of a batch job, with its result once completed
+    """
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return batch_job_status(job)
+
+
+@app.get("/batch-jobs/{job_id}/events")
+async def batch_job_events(job_id: str):
+    """
+    Stream a batch job's progress as server-sent events until it finishes
+    
+    A "progress" event is sent whenever the status or progress changes, and
+    a final "completed", "failed" or "cancelled" event carries the full
+    status (with the result, if any).
+    """
+    job = await asyncio.to_thread(job_queue.get, job_id, False)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events() -> AsyncIterator[str]:
+        current = job
+        last_seen = None
+        while True:
+            if current['status'] in FINAL_STATUSES:
+                final = await asyncio.to_thread(job_queue.get, job_id) or current
+                yield f"event: {final['status']}\ndata: {batch_job_status(final).model_dump_json()}\n\n"
+                return
+            
+            seen = (current['status'], current['processed'])
+            if seen != last_seen:
+                last_seen = seen
+                yield f"event: progress\ndata: {batch_job_status(current).model_dump_json()}\n\n"
+            
+            await asyncio.sleep(BATCH_JOB_POLL_SECONDS)
+            current = await asyncio.to_thread(job_queue.get, job_id, False)
+            if current is None:
+                # Deleted while streaming
+                return
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.delete("/batch-jobs/{job_id}")
+async def delete_batch_job(job_id: str):
+    """
+    Cancel a queued or running batch job, or delete a finished one
+    
+    A cancelled job stays visible (status "cancelled") until it expires.
+    """
+    job = await asyncio.to_thread(job_queue.get, job_id, False)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if job['status'] in FINAL_STATUSES:
+        await asyncio.to_thread(job_queue.delete, job_id)
+        return {"success": True, "job_id": job_id, "status": "deleted"}
+    
+    if not await asyncio.to_thread(job_queue.cancel, job_id):
+        raise HTTPException(status_code=409, detail="Job has already finished")
+    
+    task = batch_job_tasks.get(job_id)
+    if task is not None:
+        task.cancel()
+    return {"success": True, "job_id": job_id, "status": "cancelled"}
+
+
+@upload_router.post("/quick-scan")
 async def quick_scan(
+    response: Response,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    x_debug_timing: Optional[str] = Header(None)
 ):
     """
     Combined endpoint: Upload resume and analyze in one request
     """
-    # First, upload and extract text
-    upload_result = await upload_resume(file)
+    with track_request("quick_scan", response, x_debug_timing) as timer:
+        # First, upload and extract text
+        # The extracted text is indexed once, as an upload
+        upload_result = await process_upload(file, timer, background_tasks)
+        
+        if not upload_result['success']:
+            raise HTTPException(status_code=400, detail="Failed to process resume")
+        
+        # Then analyze
+        analyze_request = AnalyzeRequest(
+            resume_text=upload_result['extracted_text'],
+            job_description=job_description
+        )
+        
+        try:
+            analysis, _ = await process_analysis(analyze_request, timer)
+            return analysis
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+# Included once all upload routes are declared, since routes are copied
+app.include_router(upload_router)
+app.include_router(archive_router)
+
+
+@app.post("/search", response_model=SearchResponse)
+async def search_candidates(
+    request: SearchRequest,
+    response: Response,
+    x_debug_timing: Optional[str] = Header(None)
+):
+    """
+    Find the indexed candidates that best match a job description
     
-    if not upload_result['success']:
-        raise HTTPException(status_code=400, detail="Failed to process resume")
+    Candidates are scored with BM25 over an inverted index of every resume
+    seen by /upload-resume and /analyze, so only resumes sharing terms with
+    the job description are touched.
+    """
+    if talent_index is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Talent index is disabled. Set TALENT_INDEX_DIR to enable it."
+        )
     
-    # Then analyze
-    analyze_request = AnalyzeRequest(
-        resume_text=upload_result['extracted_text'],
-        job_description=job_description
-    )
+    job_description = request.job_description.strip()
+    if len(job_description) < 20:
+        raise HTTPException(
+            status_code=400,
+            detail="Job description is too short for analysis"
+        )
+    
+    if not 1 <= request.top_k <= MAX_SEARCH_RESULTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"top_k must be between 1 and {MAX_SEARCH_RESULTS}"
+        )
+    
+    try:
+        with track_request("search", response, x_debug_timing) as timer:
+            with timer.stage('query_terms'):
+                query = await run_in_pool(pipeline.prepare_index_document, job_description)
+            with timer.stage('search'):
+                results = await asyncio.to_thread(talent_index.search, query['terms'], request.top_k)
+        
+        jd_skills = {
+            term[len(SKILL_PREFIX):] for term in query['terms'] if term.startswith(SKILL_PREFIX)
+        }
+        for result in results:
+            result['matched_skills'] = [skill for skill in result['skills'] if skill in jd_skills]
+        
+        return SearchResponse(total_indexed=len(talent_index), results=results)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
+@app.delete("/candidates/{candidate_id}")
+async def delete_candidate(candidate_id: int):
+    """
+    Remove a candidate from the talent index, purging the stored resume text
+    """
+    if talent_index is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Talent index is disabled. Set TALENT_INDEX_DIR to enable it."
+        )
+    
+    if not await asyncio.to_thread(talent_index.delete, candidate_id):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    return {"success": True, "id": candidate_id}
+
+
+@app.post("/catalog/jobs", response_model=CatalogJobsResponse)
+async def add_catalog_jobs(request: CatalogJobsRequest):
+    """
+    Add or replace open jobs in the job catalog
+    
+    Each job description is profiled once here (cleaning, keywords, skills),
+    so matching a resume against the catalog does no per-job NLP work. Each
+    worker rebuilds its catalog matrices in the background once it sees the
+    change, so new jobs become matchable a moment later.
+    """
+    if not request.jobs:
+        raise HTTPException(status_code=400, detail="No jobs provided")
+    
+    if len(request.jobs) > MAX_CATALOG_JOBS_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many jobs. Maximum allowed per request is {MAX_CATALOG_JOBS_PER_REQUEST}"
+        )
     
-    return await analyze_resume(analyze_request)
+    for job in request.jobs:
+        if len(job.description.strip()) < 20:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Job description of {job.id} is too short for analysis"
+            )
+    
+    try:
+        profiles = await run_in_pool(
+            pipeline.profile_jobs,
+            [job.description.strip() for job in request.jobs],
+            timeout=RANK_TIMEOUT_SECONDS
+        )
+        jobs = [
+            {'id': job.id, 'title': job.title, **profile}
+            for job, profile in zip(request.jobs, profiles)
+        ]
+        DOCUMENTS_PROCESSED.inc(len(jobs), kind="catalog_job")
+        
+        counts = await asyncio.to_thread(job_catalog.upsert, jobs)
+        
+        return CatalogJobsResponse(**counts, total_jobs=len(job_catalog))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Adding jobs failed: {str(e)}")
+
+
+@app.delete("/catalog/jobs/{job_id}")
+async def delete_catalog_job(job_id: str):
+    """
+    Remove a job from the job catalog
+    """
+    if not await asyncio.to_thread(job_catalog.remove, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {"success": True, "id": job_id}
+
+
+@app.post("/catalog/match", response_model=CatalogMatchResponse)
+async def match_catalog(
+    request: CatalogMatchRequest,
+    response: Response,
+    x_debug_timing: Optional[str] = Header(None)
+):
+    """
+    Score one resume against every job in the catalog and return the best matches
+    
+    The resume is profiled once in a worker of the pool, which then scores
+    all jobs together with sparse matrix products and skill bitsets. Scores
+    use the same weights and grades as /analyze (see CatalogMatchResponse
+    for similarity).
+    """
+    resume_text = request.resume_text.strip()
+    if len(resume_text) < 50:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume text is too short for analysis"
+        )
+    
+    if not 1 <= request.top_k <= MAX_CATALOG_MATCHES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"top_k must be between 1 and {MAX_CATALOG_MATCHES}"
+        )
+    
+    try:
+        with track_request("catalog_match", response, x_debug_timing) as timer:
+            TEXT_SIZE.observe(len(resume_text), kind="resume")
+            result = await run_stages(
+                timer, pipeline.match_catalog, job_catalog_dir, resume_text, request.top_k
+            )
+        
+        DOCUMENTS_PROCESSED.inc(kind="catalog_match")
+        return CatalogMatchResponse(total_jobs=len(job_catalog), results=result['results'])
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Matching failed: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -2,8 +2,20 @@
 SmartATS Services Package
 """
 
-from .resume_parser import ResumeParser
-from .nlp_processor import NLPProcessor
-from .scoring_engine import ScoringEngine
+import importlib
+
+# Services are imported on first access, so importing one module of the
+# package (as the API process does) does not load spaCy and scikit-learn
+_EXPORTS = {
+    'ResumeParser': '.resume_parser',
+    'NLPProcessor': '.nlp_processor',
+    'ScoringEngine': '.scoring_engine',
+}
 
 __all__ = ['ResumeParser', 'NLPProcessor', 'ScoringEngine']
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
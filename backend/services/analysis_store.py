@@ -0,0 +1,217 @@
+"""
+Analysis Store Service
+Component scores of analyzed candidates, kept so batches can be re-ranked without NLP
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# Stored per candidate; the overall score and grade are derived from these
+COMPONENT_SCORES = ['keyword_score', 'similarity_score', 'skills_score', 'structure_score']
+
+
+class BatchConflict(Exception):
+    """
+    Raised when candidates scored against one job description are added to a batch of another
+    """
+
+
+class AnalysisStore:
+    """
+    Batches of per-candidate component scores (keyword, similarity, skills, structure)
+
+    A batch is typically one requisition: the candidates ranked against one
+    job description, possibly over several /rank calls. Storing a candidate
+    again in the same batch replaces its scores. Each batch records a hash
+    of its job description, and scores for any other job description are
+    rejected, since mixed scores cannot be ranked against each other.
+
+    Scores are kept in SQLite (in memory unless a directory is given). The
+    most recently used batches are also cached as NumPy arrays, so
+    re-ranking one is pure array arithmetic. Once there are more than
+    max_batches batches, the least recently updated are dropped. Several
+    processes can share a directory: the cache is dropped whenever another
+    one writes.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_batches: int = 1000, cache_batches: int = 16):
+        self.max_batches = max_batches
+        self.cache_batches = cache_batches
+
+        path = ':memory:'
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, 'analyses.db')
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS batches (
+                batch_id TEXT PRIMARY KEY,
+                job_description_hash TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS scores (
+                batch_id TEXT NOT NULL,
+                candidate_id TEXT NOT NULL,
+                {', '.join(f'{name} REAL NOT NULL' for name in COMPONENT_SCORES)},
+                UNIQUE (batch_id, candidate_id)
+            );
+            CREATE INDEX IF NOT EXISTS batches_updated_at ON batches (updated_at);
+        """)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(batches)")]
+        if 'job_description_hash' not in columns:
+            # Batches stored before the hash was recorded take the first one saved to them
+            self._db.execute("ALTER TABLE batches ADD COLUMN job_description_hash TEXT")
+        self._db.commit()
+        (self._data_version,) = self._db.execute("PRAGMA data_version").fetchone()
+
+    def save(
+        self,
+        batch_id: str,
+        job_description_hash: str,
+        candidate_ids: List[str],
+        component_scores: Dict[str, np.ndarray]
+    ) -> int:
+        """
+        Store component scores of candidates in a batch, creating it if needed
+
+        Args:
+            batch_id: Batch to add to
+            job_description_hash: Hash of the job description the candidates were scored against
+            candidate_ids: Candidate IDs, aligned with the score arrays
+            component_scores: One array per name in COMPONENT_SCORES
+
+        Returns:
+            Number of candidates in the batch afterwards
+
+        Raises:
+            BatchConflict: If the batch holds scores for another job description
+        """
+        columns = [np.asarray(component_scores[name], dtype=np.float64).tolist() for name in COMPONENT_SCORES]
+        rows = [(batch_id, candidate_id, *scores) for candidate_id, *scores in zip(candidate_ids, *columns)]
+        now = time.time()
+
+        with self._lock:
+            # Take the write lock before checking, so another process cannot
+            # store another job description in between
+            self._db.execute("BEGIN IMMEDIATE")
+            if not self._matches(batch_id, job_description_hash):
+                self._db.rollback()
+                raise BatchConflict(f"Batch {batch_id} was ranked against another job description")
+
+            self._db.execute(
+                "INSERT INTO batches (batch_id, job_description_hash, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (batch_id) DO UPDATE SET "
+                "job_description_hash = excluded.job_description_hash, updated_at = excluded.updated_at",
+                (batch_id, job_description_hash, now, now)
+            )
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO scores (batch_id, candidate_id, {', '.join(COMPONENT_SCORES)}) "
+                f"VALUES (?, ?, {', '.join('?' for _ in COMPONENT_SCORES)})",
+                rows
+            )
+            self._evict()
+            self._db.commit()
+            self._cache.pop(batch_id, None)
+
+            (size,) = self._db.execute(
+                "SELECT COUNT(*) FROM scores WHERE batch_id = ?", (batch_id,)
+            ).fetchone()
+        return size
+
+    def accepts(self, batch_id: str, job_description_hash: str) -> bool:
+        """
+        Check whether scores for a job description can be saved to a batch
+
+        True when the batch does not exist yet or was ranked against the same
+        job description, so a conflict can be reported before any scoring.
+        """
+        with self._lock:
+            return self._matches(batch_id, job_description_hash)
+
+    def _matches(self, batch_id: str, job_description_hash: str) -> bool:
+        row = self._db.execute(
+            "SELECT job_description_hash FROM batches WHERE batch_id = ?", (batch_id,)
+        ).fetchone()
+        return row is None or row[0] is None or row[0] == job_description_hash
+
+    def _evict(self):
+        expired = [
+            batch_id for (batch_id,) in self._db.execute(
+                "SELECT batch_id FROM batches ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+                (self.max_batches,)
+            )
+        ]
+        for batch_id in expired:
+            self._db.execute("DELETE FROM batches WHERE batch_id = ?", (batch_id,))
+            self._db.execute("DELETE FROM scores WHERE batch_id = ?", (batch_id,))
+            self._cache.pop(batch_id, None)
+
+    def load(self, batch_id: str) -> Optional[Dict]:
+        """
+        Get a batch as candidate IDs plus one array per component score
+
+        Candidates are in the order they were stored. Returns None if the
+        batch does not exist.
+        """
+        with self._lock:
+            # data_version changes when another process sharing the database
+            # commits, in which case cached batches may be out of date
+            (data_version,) = self._db.execute("PRAGMA data_version").fetchone()
+            if data_version != self._data_version:
+                self._data_version = data_version
+                self._cache.clear()
+
+            batch = self._cache.get(batch_id)
+            if batch is not None:
+                self._cache.move_to_end(batch_id)
+                return batch
+
+            exists = self._db.execute(
+                "SELECT 1 FROM batches WHERE batch_id = ?", (batch_id,)
+            ).fetchone()
+            if exists is None:
+                return None
+
+            rows = self._db.execute(
+                f"SELECT candidate_id, {', '.join(COMPONENT_SCORES)} FROM scores "
+                f"WHERE batch_id = ? ORDER BY rowid",
+                (batch_id,)
+            ).fetchall()
+
+            batch = {'candidate_ids': [row[0] for row in rows]}
+            values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(COMPONENT_SCORES))
+            for column, name in enumerate(COMPONENT_SCORES):
+                batch[name] = np.ascontiguousarray(values[:, column])
+
+            self._cache[batch_id] = batch
+            while len(self._cache) > self.cache_batches:
+                self._cache.popitem(last=False)
+            return batch
+
+    def delete(self, batch_id: str) -> bool:
+        """
+        Delete a batch, returning False if it does not exist
+        """
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM batches WHERE batch_id = ?", (batch_id,)).rowcount
+            self._db.execute("DELETE FROM scores WHERE batch_id = ?", (batch_id,))
+            self._db.commit()
+            self._cache.pop(batch_id, None)
+        return bool(deleted)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+            self._cache.clear()
@@ -0,0 +1,306 @@
+"""
+Job Catalog Service
+Open jobs with precomputed match features, for scoring one resume against all of them
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from scipy import sparse
+
+from .matching import TECH_SKILLS, analyze_keywords
+from .scoring_engine import ScoringEngine, top_k_indices
+from .similarity_engine import SimilarityEngine
+from .skill_bitset import SkillVocabulary, match_ratios
+
+
+class _CatalogMatrices:
+    """
+    Immutable match features of every job in the catalog
+
+    - TF-IDF rows of all job descriptions (one sparse matrix)
+    - A binary job x keyword matrix with each job's keyword count
+    - A job x word matrix of skill bitsets (see services/skill_bitset.py)
+    """
+
+    def __init__(self, jobs: List[Dict], similarity_engine: Optional[SimilarityEngine]):
+        self.jobs = jobs
+
+        texts = [job['cleaned_text'] for job in jobs]
+        if similarity_engine is not None and similarity_engine.is_fitted:
+            self.engine = similarity_engine
+            self.tfidf = similarity_engine.transform(texts)
+        else:
+            # Without a corpus model the catalog itself is the IDF corpus
+            self.engine = SimilarityEngine()
+            self.tfidf = self.engine.fit_transform(texts)
+
+        self.keyword_ids: Dict[str, int] = {}
+        rows, columns = [], []
+        for row, job in enumerate(jobs):
+            for keyword in {keyword.lower() for keyword in job['keywords']}:
+                rows.append(row)
+                columns.append(self.keyword_ids.setdefault(keyword, len(self.keyword_ids)))
+        self.keywords = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(jobs), max(len(self.keyword_ids), 1))
+        )
+        self.keyword_counts = np.asarray(self.keywords.sum(axis=1), dtype=np.float64).ravel()
+
+        # Skills of older taxonomies, if any, get IDs after the current taxonomy
+        self.skill_vocabulary = SkillVocabulary(TECH_SKILLS)
+        for job in jobs:
+            self.skill_vocabulary.extend(job['skills'])
+        self.skill_bits = self.skill_vocabulary.encode_many(job['skills'] for job in jobs)
+
+
+class JobCatalog:
+    """
+    Catalog of open jobs that a resume can be matched against in one pass
+
+    Jobs are added with their precomputed profile (cleaned text, keywords and
+    skills, as produced for /analyze). Matching a resume scores every job
+    with vectorized operations: a sparse matrix-vector product for TF-IDF
+    similarity and for keyword overlap, and AND + popcount over skill bitsets for
+    skill overlap. Only the top-k jobs get a full keyword and skill breakdown.
+
+    Scores come from ScoringEngine.calculate_scores_batch and equal those of
+    calculate_scores given the same inputs. Similarity is measured in the
+    TF-IDF space of the corpus model, or of the catalog itself when no model
+    is configured.
+
+    Changes take effect once refresh() rebuilds the match features; until
+    then, removed and replaced jobs are excluded from matches and new jobs
+    are not yet matched. Jobs are persisted in SQLite when a directory is given;
+    changes written by other processes sharing it count as changes too.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        similarity_engine: Optional[SimilarityEngine] = None,
+        scoring_engine: Optional[ScoringEngine] = None
+    ):
+        self.similarity_engine = similarity_engine
+        self.scoring_engine = scoring_engine or ScoringEngine()
+
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._matrices: Optional[_CatalogMatrices] = None
+        self._version = 0
+        self._built_version = -1
+        # Jobs changed since the served matrices, and since the last build started
+        self._stale: Set[str] = set()
+        self._pending: Set[str] = set()
+
+        self._db = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(directory, 'jobs.db'), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, job TEXT NOT NULL)"
+            )
+            self._db.commit()
+            for (job,) in self._db.execute("SELECT job FROM jobs ORDER BY rowid"):
+                job = json.loads(job)
+                self._jobs[job['id']] = job
+            (self._data_version,) = self._db.execute("PRAGMA data_version").fetchone()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._jobs)
+
+    @property
+    def outdated(self) -> bool:
+        """
+        Whether jobs changed since the match features were last built
+        """
+        with self._lock:
+            return self._built_version != self._version
+
+    def _sync(self):
+        # Pick up jobs changed by other processes sharing the database (such
+        # as the workers of a pre-fork server). SQLite's data_version only
+        # changes when another connection commits. Call with _lock held.
+        if self._db is None:
+            return
+        (data_version,) = self._db.execute("PRAGMA data_version").fetchone()
+        if data_version == self._data_version:
+            return
+
+        self._data_version = data_version
+        jobs = {}
+        for (job,) in self._db.execute("SELECT job FROM jobs ORDER BY rowid"):
+            job = json.loads(job)
+            jobs[job['id']] = job
+        for job_id in self._jobs.keys() | jobs.keys():
+            if self._jobs.get(job_id) != jobs.get(job_id):
+                self._mark_changed(job_id)
+        self._jobs = jobs
+
+    def upsert(self, jobs: List[Dict]) -> Dict:
+        """
+        Add or replace jobs
+
+        Args:
+            jobs: Dictionaries with id, title, cleaned_text, keywords and skills
+
+        Returns:
+            Counts of added and updated jobs
+        """
+        with self._lock:
+            self._sync()
+            added = sum(1 for job in jobs if job['id'] not in self._jobs)
+            for job in jobs:
+                self._jobs[job['id']] = job
+                self._mark_changed(job['id'])
+
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO jobs (job_id, job) VALUES (?, ?)",
+                    [(job['id'], json.dumps(job)) for job in jobs]
+                )
+                self._db.commit()
+
+        return {'added': added, 'updated': len(jobs) - added}
+
+    def remove(self, job_id: str) -> bool:
+        """
+        Remove a job, returning False if it is not in the catalog
+        """
+        with self._lock:
+            self._sync()
+            if self._jobs.pop(job_id, None) is None:
+                return False
+            self._mark_changed(job_id)
+            if self._db is not None:
+                self._db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+                self._db.commit()
+            return True
+
+    def _mark_changed(self, job_id: str):
+        self._version += 1
+        self._stale.add(job_id)
+        self._pending.add(job_id)
+
+    def refresh(self) -> Optional[_CatalogMatrices]:
+        """
+        Rebuild the match features if jobs changed since the last build
+
+        The build runs without holding the catalog lock, so matches keep
+        being served from the previous matrices until the new ones are swapped in.
+        """
+        with self._build_lock:
+            with self._lock:
+                self._sync()
+                if self._built_version == self._version:
+                    return self._matrices
+                version = self._version
+                jobs = list(self._jobs.values())
+                pending, self._pending = self._pending, set()
+
+            try:
+                matrices = _CatalogMatrices(jobs, self.similarity_engine) if jobs else None
+            except Exception:
+                with self._lock:
+                    self._pending |= pending
+                raise
+
+            with self._lock:
+                self._matrices = matrices
+                self._built_version = version
+                # Only changes made during the build are still missing from the matrices
+                self._stale = set(self._pending)
+            return matrices
+
+    def match(self, resume: Dict, top_k: int = 10) -> List[Dict]:
+        """
+        Score a resume against every job and return the best top_k
+
+        Args:
+            resume: Dictionary with cleaned_text, keywords, skills and sections_found
+            top_k: Number of jobs to return
+
+        Returns:
+            Ranked jobs with their score breakdown
+        """
+        with self._lock:
+            self._sync()
+            matrices = self._matrices
+            stale = set(self._stale)
+        if matrices is None:
+            matrices = self.refresh()
+            stale = set()
+        if matrices is None or top_k < 1:
+            return []
+
+        # TF-IDF cosine similarity against all jobs in one matrix-vector product
+        resume_vector = matrices.engine.transform([resume['cleaned_text']]).toarray().ravel()
+        similarities = matrices.tfidf @ resume_vector * 100
+
+        # Keyword overlap: jobs x keywords matrix times the resume's indicator vector
+        indicator = np.zeros(matrices.keywords.shape[1], dtype=np.float32)
+        resume_keywords = {keyword.lower() for keyword in resume['keywords']}
+        indicator[[matrices.keyword_ids[kw] for kw in resume_keywords if kw in matrices.keyword_ids]] = 1
+        matched_keywords = (matrices.keywords @ indicator).astype(np.float64)
+        keyword_ratios = np.divide(
+            matched_keywords, matrices.keyword_counts,
+            out=np.zeros(len(matrices.jobs)), where=matrices.keyword_counts > 0
+        )
+
+        # Skill overlap: popcount of each job's bitset ANDed with the resume's
+        resume_skill_bits = matrices.skill_vocabulary.encode(
+            resume['skills'], words=matrices.skill_bits.shape[1]
+        )
+        skill_ratios = match_ratios(resume_skill_bits, matrices.skill_bits)
+
+        # One section row for the resume, broadcast against all jobs
+        scores = self.scoring_engine.calculate_scores_batch(
+            keyword_match_ratios=keyword_ratios,
+            similarity_scores=similarities,
+            skills_match_ratios=skill_ratios,
+            sections=self.scoring_engine.encode_sections([resume['sections_found']])
+        )
+        overall_scores = scores['overall_score'].copy()
+
+        # Jobs removed or replaced since the matrices were built are left out
+        # until the next rebuild
+        if stale:
+            overall_scores[[row for row, job in enumerate(matrices.jobs) if job['id'] in stale]] = -np.inf
+            top_k = min(top_k, int(np.isfinite(overall_scores).sum()))
+
+        top = top_k_indices(overall_scores, top_k)
+
+        results = []
+        for rank, index in enumerate(top, start=1):
+            job = matrices.jobs[index]
+            keyword_analysis = analyze_keywords(resume_keywords, job['keywords'])
+            skill_gap = matrices.skill_vocabulary.skill_gap(resume_skill_bits, matrices.skill_bits[index])
+            results.append({
+                'job_id': job['id'],
+                'title': job.get('title'),
+                'rank': rank,
+                'overall_score': round(float(scores['overall_score'][index]), 1),
+                'keyword_score': round(float(scores['keyword_score'][index]), 1),
+                'similarity_score': round(float(scores['similarity_score'][index]), 1),
+                'skills_score': round(float(scores['skills_score'][index]), 1),
+                'structure_score': round(float(scores['structure_score'][index]), 1),
+                'grade': str(scores['grade'][index]),
+                'matched_keywords': keyword_analysis['matched'],
+                'missing_keywords': keyword_analysis['missing'],
+                'matched_skills': skill_gap['matched_skills'],
+                'missing_skills': skill_gap['missing_skills']
+            })
+        return results
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
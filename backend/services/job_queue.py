@@ -0,0 +1,308 @@
+"""
+Job Queue Service
+Persistent queue of long-running batch analyses, with progress, cancellation and expiry
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+
+# Job states; a job ends in one of FINAL_STATUSES
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINAL_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+# Columns of a job's status; the request itself is only loaded by claim()
+_STATUS_COLUMNS = (
+    'job_id', 'status', 'total', 'processed', 'chunks', 'error',
+    'created_at', 'started_at', 'finished_at'
+)
+
+
+class JobQueue:
+    """
+    Batch analysis jobs persisted in SQLite
+
+    A job is a JSON request processed in a fixed number of chunks. The result
+    of every finished chunk is stored with the job, so a job interrupted by a
+    restart continues from its last finished chunk instead of starting over.
+
+    Running jobs hold a lease that their runner renews with heartbeat(). If
+    the process running a job dies, claim() hands the job out again once the
+    lease has run out. Finished jobs are kept for ttl seconds.
+
+    Several processes can share one database directory; jobs are claimed
+    with a compare-and-set update, so each is run by one process at a time.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 86400, lease_seconds: float = 60):
+        self.ttl = ttl
+        self.lease_seconds = lease_seconds
+
+        path = ':memory:'
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, 'jobs.db')
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                request TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                processed INTEGER NOT NULL DEFAULT 0,
+                chunks INTEGER NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                lease_expires_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS job_chunks (
+                job_id TEXT NOT NULL,
+                chunk INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (job_id, chunk)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status_created_at ON jobs (status, created_at);
+        """)
+        self._db.commit()
+
+    def submit(self, request: Dict, total: int, chunks: int) -> Dict:
+        """
+        Queue a job
+
+        Args:
+            request: JSON-serializable job request
+            total: Number of items in the job, for progress reporting
+            chunks: Number of chunks the job is processed in
+
+        Returns:
+            Status of the new job (see get)
+        """
+        job_id = uuid.uuid4().hex
+        payload = json.dumps(request)
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (job_id, status, request, total, chunks, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, payload, total, chunks, time.time())
+            )
+            self._db.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict]:
+        """
+        Get a job's status, progress and (once completed) result
+
+        Returns None if the job does not exist or has expired.
+        """
+        columns = _STATUS_COLUMNS + (('result',) if include_result else ())
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(columns)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(zip(columns, row))
+        job['expires_at'] = job['finished_at'] + self.ttl if job['finished_at'] is not None else None
+        if job['expires_at'] is not None and job['expires_at'] <= time.time():
+            return None
+        if include_result:
+            job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def claim(self) -> Optional[Dict]:
+        """
+        Take the oldest queued job (or a running job whose lease expired) and mark it running
+
+        Returns:
+            The job's status plus its request and the indices of chunks
+            finished in an earlier run, or None if no job is waiting
+        """
+        while True:
+            now = time.time()
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT job_id, status, lease_expires_at FROM jobs "
+                    "WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                job_id, status, lease_expires_at = row
+                claimed = self._db.execute(
+                    "UPDATE jobs SET status = ?, started_at = COALESCE(started_at, ?), lease_expires_at = ? "
+                    "WHERE job_id = ? AND status = ? AND lease_expires_at IS ?",
+                    (RUNNING, now, now + self.lease_seconds, job_id, status, lease_expires_at)
+                ).rowcount
+                self._db.commit()
+                if not claimed:
+                    # Another process claimed it first
+                    continue
+
+                (request,) = self._db.execute(
+                    "SELECT request FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                finished_chunks = [
+                    chunk for (chunk,) in self._db.execute(
+                        "SELECT chunk FROM job_chunks WHERE job_id = ?", (job_id,)
+                    )
+                ]
+
+            job = self.get(job_id, include_result=False)
+            job['request'] = json.loads(request)
+            job['finished_chunks'] = finished_chunks
+            return job
+
+    def heartbeat(self, job_ids: List[str]) -> List[str]:
+        """
+        Renew the leases of running jobs
+
+        Returns:
+            IDs among job_ids that are no longer running (cancelled or
+            expired), whose work should be stopped
+        """
+        if not job_ids:
+            return []
+
+        lost = []
+        now = time.time()
+        with self._lock:
+            for job_id in job_ids:
+                renewed = self._db.execute(
+                    "UPDATE jobs SET lease_expires_at = ? WHERE job_id = ? AND status = ?",
+                    (now + self.lease_seconds, job_id, RUNNING)
+                ).rowcount
+                if not renewed:
+                    lost.append(job_id)
+            self._db.commit()
+        return lost
+
+    def release(self, job_ids: List[str]):
+        """
+        Put running jobs back in the queue (on shutdown), keeping their finished chunks
+        """
+        with self._lock:
+            self._db.executemany(
+                "UPDATE jobs SET status = ?, lease_expires_at = NULL WHERE job_id = ? AND status = ?",
+                [(QUEUED, job_id, RUNNING) for job_id in job_ids]
+            )
+            self._db.commit()
+
+    def save_chunk(self, job_id: str, chunk: int, size: int, result: Dict) -> bool:
+        """
+        Store the result of a finished chunk and advance the job's progress by size
+
+        Returns False (storing nothing) if the job is no longer running.
+        """
+        payload = json.dumps(result)
+        with self._lock:
+            advanced = self._db.execute(
+                "UPDATE jobs SET processed = processed + ? WHERE job_id = ? AND status = ? "
+                "AND NOT EXISTS (SELECT 1 FROM job_chunks WHERE job_id = ? AND chunk = ?)",
+                (size, job_id, RUNNING, job_id, chunk)
+            ).rowcount
+            if advanced:
+                self._db.execute(
+                    "INSERT INTO job_chunks (job_id, chunk, size, result) VALUES (?, ?, ?, ?)",
+                    (job_id, chunk, size, payload)
+                )
+            self._db.commit()
+        return bool(advanced)
+
+    def load_chunks(self, job_id: str) -> List[Dict]:
+        """
+        Results of a job's finished chunks, in chunk order
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT result FROM job_chunks WHERE job_id = ? ORDER BY chunk", (job_id,)
+            ).fetchall()
+        return [json.loads(result) for (result,) in rows]
+
+    def complete(self, job_id: str, result: Dict) -> bool:
+        """
+        Mark a running job completed with its result, dropping its chunk results
+        """
+        return self._finish(job_id, COMPLETED, result=json.dumps(result))
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """
+        Mark a running job failed
+        """
+        return self._finish(job_id, FAILED, error=error)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job
+
+        Returns False if the job does not exist or has already finished.
+        """
+        return self._finish(job_id, CANCELLED, statuses=(QUEUED, RUNNING))
+
+    def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+        statuses: tuple = (RUNNING,)
+    ) -> bool:
+        with self._lock:
+            finished = self._db.execute(
+                f"UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_expires_at = NULL "
+                f"WHERE job_id = ? AND status IN ({', '.join('?' for _ in statuses)})",
+                (status, result, error, time.time(), job_id, *statuses)
+            ).rowcount
+            if finished:
+                self._db.execute("DELETE FROM job_chunks WHERE job_id = ?", (job_id,))
+            self._db.commit()
+        return bool(finished)
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Delete a job, returning False if it does not exist
+        """
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount
+            self._db.execute("DELETE FROM job_chunks WHERE job_id = ?", (job_id,))
+            self._db.commit()
+        return bool(deleted)
+
+    def purge_expired(self) -> int:
+        """
+        Delete finished jobs older than the TTL, returning how many were removed
+        """
+        with self._lock:
+            expired = [
+                job_id for (job_id,) in self._db.execute(
+                    "SELECT job_id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                    (time.time() - self.ttl,)
+                )
+            ]
+            for job_id in expired:
+                self._db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+                self._db.execute("DELETE FROM job_chunks WHERE job_id = ?", (job_id,))
+            self._db.commit()
+        return len(expired)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
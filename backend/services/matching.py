@@ -0,0 +1,83 @@
+"""
+Matching Service
+Keyword and skill overlap between a resume and a job description
+
+These functions have no model dependencies, so they can run in the API
+process (e.g. for the job catalog) as well as in analysis workers.
+"""
+
+from typing import Dict, Iterable, Set
+
+
+# Technical skills taxonomy used for skill detection and skill IDs
+TECH_SKILLS = frozenset({
+    # Programming Languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'go', 'rust',
+    'php', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'sql', 'bash', 'shell',
+
+    # Web Technologies
+    'html', 'css', 'react', 'angular', 'vue', 'nodejs', 'node.js', 'express',
+    'django', 'flask', 'fastapi', 'spring', 'nextjs', 'next.js', 'nuxt',
+    'tailwind', 'bootstrap', 'sass', 'less', 'webpack', 'vite',
+
+    # Databases
+    'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'cassandra',
+    'oracle', 'sqlite', 'dynamodb', 'firebase', 'supabase',
+
+    # Cloud & DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform',
+    'ansible', 'ci/cd', 'github actions', 'gitlab', 'circleci', 'linux',
+
+    # Data Science & ML
+    'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'keras',
+    'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'nlp', 'computer vision',
+    'data analysis', 'data science', 'statistics', 'ai', 'neural networks',
+
+    # Tools & Others
+    'git', 'jira', 'agile', 'scrum', 'rest api', 'graphql', 'microservices',
+    'api', 'testing', 'unit testing', 'selenium', 'cypress', 'figma',
+})
+
+
+def analyze_keywords(resume_keywords: Iterable[str], jd_keywords: Iterable[str]) -> Dict:
+    """
+    Analyze keyword overlap between resume and job description
+    """
+    resume_set = set(kw.lower() for kw in resume_keywords)
+    jd_set = set(kw.lower() for kw in jd_keywords)
+    
+    matched = resume_set.intersection(jd_set)
+    missing = jd_set - resume_set
+    extra = resume_set - jd_set
+    
+    # Calculate match ratio
+    match_ratio = len(matched) / len(jd_set) if jd_set else 0
+    
+    return {
+        'matched': sorted(list(matched)),
+        'missing': sorted(list(missing))[:20],  # Limit to top 20
+        'extra': sorted(list(extra)),
+        'match_ratio': match_ratio,
+        'total_jd_keywords': len(jd_set),
+        'total_resume_keywords': len(resume_set)
+    }
+
+
+def compare_skills(resume_skills: Set[str], jd_skills: Set[str]) -> Dict:
+    """
+    Compare pre-detected resume skills against job description skills
+    """
+    matched_skills = jd_skills.intersection(resume_skills)
+    missing_skills = jd_skills - resume_skills
+    extra_skills = resume_skills - jd_skills
+    
+    match_ratio = len(matched_skills) / len(jd_skills) if jd_skills else 1.0
+    
+    return {
+        'required_skills': sorted(list(jd_skills)),
+        'matched_skills': sorted(list(matched_skills)),
+        'missing_skills': sorted(list(missing_skills)),
+        'additional_skills': sorted(list(extra_skills)),
+        'match_ratio': match_ratio,
+        'coverage_percentage': round(match_ratio * 100, 1)
+    }
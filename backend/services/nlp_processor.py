@@ -3,24 +3,71 @@ NLP Processor Service
 Handles keyword extraction, TF-IDF vectorization, and cosine similarity
 """
 
+import math
+import os
 import re
 import string
-from typing import List, Dict, Set, Tuple
+import threading
+from typing import Iterable, List, Dict, Optional, Set, Tuple
 from collections import Counter
 
 import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    # If model not found, download it
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
+from utils.skill_matcher import SkillMatcher
+from . import matching
+from .skill_bitset import SkillVocabulary
+from .similarity_engine import SimilarityEngine
+
+# Analysis mode: "full" runs the whole pipeline; "fast" drops the parser and NER,
+# skipping noun phrases and named entities in exchange for much cheaper parsing
+NLP_ANALYSIS_MODE = os.environ.get("NLP_ANALYSIS_MODE", "full")
+NLP_MAX_CHARS = int(os.environ.get("NLP_MAX_CHARS", 100000))
+NLP_BATCH_SIZE = int(os.environ.get("NLP_BATCH_SIZE", 64))
+NLP_N_PROCESS = int(os.environ.get("NLP_N_PROCESS", 1))
+
+# Pipeline components not needed for each analysis mode
+EXCLUDED_COMPONENTS = {
+    'full': [],
+    'fast': ['parser', 'ner'],
+}
+
+if NLP_ANALYSIS_MODE not in EXCLUDED_COMPONENTS:
+    raise ValueError(f"Unknown NLP_ANALYSIS_MODE: {NLP_ANALYSIS_MODE}")
+
+# spaCy model, loaded on first use by load_nlp()
+_nlp: Optional[Language] = None
+_nlp_lock = threading.Lock()
+
+# The model is shared by every thread of the process (concurrent analysis
+# stages, in-process analyses) but is not thread-safe: one call at a time
+_nlp_call_lock = threading.Lock()
+
+
+def load_nlp() -> Language:
+    """
+    Load the spaCy model once per process
+    
+    The model is installed at build time (``python -m spacy download
+    en_core_web_sm``); it is never downloaded at runtime.
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                try:
+                    _nlp = spacy.load("en_core_web_sm", exclude=EXCLUDED_COMPONENTS[NLP_ANALYSIS_MODE])
+                except OSError as e:
+                    raise RuntimeError(
+                        "spaCy model en_core_web_sm is not installed; "
+                        "run `python -m spacy download en_core_web_sm`"
+                    ) from e
+    return _nlp
 
 
 class NLPProcessor:
@@ -28,7 +75,14 @@ class NLPProcessor:
     NLP Processing service for resume analysis
     """
     
-    def __init__(self):
+    def __init__(self, similarity_engine: Optional[SimilarityEngine] = None):
+        # spaCy pipeline, shared by every processor in the process
+        self.nlp = load_nlp()
+        
+        # Corpus-level TF-IDF model; when absent, each comparison fits its own vectorizer
+        self.similarity_engine = similarity_engine
+        
+        # Template for per-call vectorizers (cloned, never fitted in place)
         self.tfidf_vectorizer = TfidfVectorizer(
             stop_words='english',
             ngram_range=(1, 2),
@@ -36,34 +90,20 @@ class NLPProcessor:
             lowercase=True
         )
         
+        # Unigram tokenizer of the TF-IDF vectorizer, used for the talent index
+        self.index_analyzer = clone(self.tfidf_vectorizer).set_params(ngram_range=(1, 1)).build_analyzer()
+        
+        # Tokenizer of the vectorizer, for pairwise similarity without fitting
+        self.pair_analyzer = self.tfidf_vectorizer.build_analyzer()
+        
         # Common technical skills for detection
-        self.tech_skills = {
-            # Programming Languages
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'go', 'rust',
-            'php', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'sql', 'bash', 'shell',
-            
-            # Web Technologies
-            'html', 'css', 'react', 'angular', 'vue', 'nodejs', 'node.js', 'express',
-            'django', 'flask', 'fastapi', 'spring', 'nextjs', 'next.js', 'nuxt',
-            'tailwind', 'bootstrap', 'sass', 'less', 'webpack', 'vite',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'cassandra',
-            'oracle', 'sqlite', 'dynamodb', 'firebase', 'supabase',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform',
-            'ansible', 'ci/cd', 'github actions', 'gitlab', 'circleci', 'linux',
-            
-            # Data Science & ML
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'keras',
-            'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'nlp', 'computer vision',
-            'data analysis', 'data science', 'statistics', 'ai', 'neural networks',
-            
-            # Tools & Others
-            'git', 'jira', 'agile', 'scrum', 'rest api', 'graphql', 'microservices',
-            'api', 'testing', 'unit testing', 'selenium', 'cypress', 'figma',
-        }
+        self.tech_skills = set(matching.TECH_SKILLS)
+        
+        # Stable skill IDs, for skill sets encoded as bitsets
+        self.skill_vocabulary = SkillVocabulary(self.tech_skills)
+        
+        # Compiled once so skill detection is a single pass over the text
+        self.skill_matcher = SkillMatcher(self.tech_skills)
         
         # Important resume sections
         self.resume_sections = {
@@ -76,11 +116,54 @@ class NLPProcessor:
             'achievements': ['achievements', 'accomplishments', 'awards', 'honors']
         }
     
-    def extract_keywords(self, text: str) -> List[str]:
+    def parse(self, text: str, lowercased: bool = False) -> Doc:
+        """
+        Run the spaCy pipeline once over text, capped at NLP_MAX_CHARS
+        
+        The returned Doc can be shared by extract_keywords and
+        get_keyword_frequency so a text is only parsed once.
+        
+        Args:
+            text: Text to parse
+            lowercased: Whether text is already lowercase
+        """
+        if not lowercased:
+            text = text.lower()
+        with _nlp_call_lock:
+            return self.nlp(text[:NLP_MAX_CHARS])
+    
+    def parse_many(
+        self,
+        texts: Iterable[str],
+        batch_size: int = NLP_BATCH_SIZE,
+        n_process: int = NLP_N_PROCESS
+    ) -> List[Doc]:
+        """
+        Parse many texts in batches with nlp.pipe
+        """
+        with _nlp_call_lock:
+            return list(self.nlp.pipe(
+                (text.lower()[:NLP_MAX_CHARS] for text in texts),
+                batch_size=batch_size,
+                n_process=n_process
+            ))
+    
+    def extract_keywords(
+        self,
+        text: str,
+        doc: Optional[Doc] = None,
+        skills: Optional[Set[str]] = None
+    ) -> List[str]:
         """
         Extract meaningful keywords from text using spaCy NER and POS tagging
+        
+        Args:
+            text: Text to analyze
+            doc: Pre-parsed Doc of the text from parse(), if available
+            skills: Skills already detected in the text, if available
         """
-        doc = nlp(text.lower())
+        if doc is None:
+            doc = self.parse(text)
         keywords = set()
         
         # Extract named entities
@@ -94,66 +177,147 @@ class NLPProcessor:
                 if not token.is_stop and token.is_alpha:
                     keywords.add(token.lemma_.lower())
         
-        # Extract noun phrases
-        for chunk in doc.noun_chunks:
-            phrase = chunk.text.lower().strip()
-            if len(phrase) > 3 and len(phrase.split()) <= 3:
-                keywords.add(phrase)
+        # Extract noun phrases (requires the dependency parser)
+        if doc.has_annotation("DEP"):
+            for chunk in doc.noun_chunks:
+                phrase = chunk.text.lower().strip()
+                if len(phrase) > 3 and len(phrase.split()) <= 3:
+                    keywords.add(phrase)
         
         # Add detected technical skills
-        text_lower = text.lower()
-        for skill in self.tech_skills:
-            if skill in text_lower:
-                keywords.add(skill)
+        keywords.update(skills if skills is not None else self.detect_skills(text))
         
         return list(keywords)
     
-    def calculate_similarity(self, resume_text: str, job_description: str) -> float:
+    def extract_keywords_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Extract keywords from many texts with a single batched pipeline run
+        """
+        docs = self.parse_many(texts)
+        return [self.extract_keywords(text, doc) for text, doc in zip(texts, docs)]
+    
+    @property
+    def similarity_model_version(self) -> str:
+        """
+        Identifier of the TF-IDF model in use, for keying cached term weights
+        """
+        if self._has_similarity_model():
+            return self.similarity_engine.version
+        return 'pairwise'
+    
+    def _has_similarity_model(self) -> bool:
+        return self.similarity_engine is not None and self.similarity_engine.is_fitted
+    
+    def calculate_similarity(
+        self,
+        resume_text: str,
+        job_description: str,
+        jd_term_weights: Optional[Dict[str, float]] = None
+    ) -> float:
         """
         Calculate TF-IDF cosine similarity between resume and job description
+        
+        With a corpus-level model the job description can be passed as
+        precomputed term weights (from get_term_weights) to skip re-vectorizing it.
         """
+        return self.calculate_similarity_batch([resume_text], job_description, jd_term_weights)[0]
+    
+    def calculate_similarity_batch(
+        self,
+        resume_texts: List[str],
+        job_description: str,
+        jd_term_weights: Optional[Dict[str, float]] = None
+    ) -> List[float]:
+        """
+        Calculate TF-IDF cosine similarity of many resumes against one job description
+        
+        With a corpus-level model all resumes are transformed in one read-only
+        pass. Without one, each resume is scored as if a vectorizer were fitted
+        on that resume and the job description alone. Either way a resume's
+        score does not depend on the other resumes in the batch, and matches
+        calculate_similarity (and /analyze).
+        """
+        if not resume_texts:
+            return []
+        
+        if self._has_similarity_model():
+            query = jd_term_weights if jd_term_weights is not None else job_description
+            similarities = self.similarity_engine.similarities(list(resume_texts), query)
+        else:
+            similarities = self._pairwise_similarities(resume_texts, job_description)
+        
+        return [float(similarity) for similarity in similarities]
+    
+    def _pairwise_similarities(self, resume_texts: List[str], job_description: str) -> List[float]:
+        """
+        Similarity of each resume under a TF-IDF fit on just that resume and the job description
+        
+        Gives the scores of fitting the vectorizer on each pair, but tokenizes
+        the job description once and skips building a vectorizer per resume.
+        Only pairs with more distinct terms than max_features, where the fit
+        would keep just the most frequent ones, are actually fitted.
+        """
+        jd_counts = Counter(self.pair_analyzer(job_description))
+        max_features = self.tfidf_vectorizer.max_features
+        
+        similarities = []
+        for resume_text in resume_texts:
+            resume_counts = Counter(self.pair_analyzer(resume_text))
+            if max_features is not None and len(jd_counts.keys() | resume_counts.keys()) > max_features:
+                vectorizer = clone(self.tfidf_vectorizer)
+                tfidf_matrix = vectorizer.fit_transform([job_description, resume_text])
+                similarities.append(float(cosine_similarity(tfidf_matrix[1:], tfidf_matrix[0:1])[0, 0]) * 100)
+            else:
+                similarities.append(_pair_cosine(resume_counts, jd_counts) * 100)
+        return similarities
+    
+    def get_term_weights(self, text: str) -> Optional[Dict[str, float]]:
+        """
+        Get TF-IDF weights of the terms in a single document
+        
+        Only a corpus-level model uses precomputed weights; pairwise
+        similarity fits on each resume/JD pair, so without a model there is
+        nothing worth computing and None is returned.
+        """
+        if not self._has_similarity_model():
+            return None
+        
         try:
-            # Fit and transform both texts
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform([resume_text, job_description])
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            
-            # Convert to percentage (0-100)
-            return float(similarity * 100)
+            return self.similarity_engine.term_weights(text)
             
         except Exception as e:
-            print(f"Similarity calculation error: {e}")
-            return 0.0
+            print(f"Term weight calculation error: {e}")
+            return None
+    
+    def get_index_terms(self, text: str) -> Dict[str, int]:
+        """
+        Get term frequencies for the talent index
+        
+        Terms are the normalized words the TF-IDF vectorizer sees, plus each
+        detected skill as a single "skill:" term, so multi-word skills such as
+        "machine learning" match as a unit.
+        """
+        terms = Counter(self.index_analyzer(text))
+        for _, _, skill in self.skill_matcher.find_all(text):
+            terms[f"skill:{skill}"] += 1
+        return dict(terms)
     
     def analyze_keywords(self, resume_keywords: List[str], jd_keywords: List[str]) -> Dict:
         """
         Analyze keyword overlap between resume and job description
         """
-        resume_set = set(kw.lower() for kw in resume_keywords)
-        jd_set = set(kw.lower() for kw in jd_keywords)
-        
-        matched = resume_set.intersection(jd_set)
-        missing = jd_set - resume_set
-        extra = resume_set - jd_set
-        
-        # Calculate match ratio
-        match_ratio = len(matched) / len(jd_set) if jd_set else 0
-        
-        return {
-            'matched': sorted(list(matched)),
-            'missing': sorted(list(missing))[:20],  # Limit to top 20
-            'extra': sorted(list(extra)),
-            'match_ratio': match_ratio,
-            'total_jd_keywords': len(jd_set),
-            'total_resume_keywords': len(resume_set)
-        }
+        return matching.analyze_keywords(resume_keywords, jd_keywords)
     
-    def detect_sections(self, resume_text: str) -> Dict:
+    def detect_sections(self, resume_text: str, text_lower: Optional[str] = None) -> Dict:
         """
         Detect which resume sections are present
+        
+        Args:
+            resume_text: Resume text
+            text_lower: The text already lowercased, if available
         """
-        text_lower = resume_text.lower()
+        if text_lower is None:
+            text_lower = resume_text.lower()
         found_sections = []
         missing_sections = []
         
@@ -179,45 +343,33 @@ class NLPProcessor:
             'has_all_required': len(missing_sections) == 0
         }
     
+    def detect_skills(self, text: str) -> Set[str]:
+        """
+        Detect known technical skills mentioned in text
+        """
+        return self.skill_matcher.find_skills(text)
+    
     def analyze_skill_gap(self, resume_text: str, job_description: str) -> Dict:
         """
         Analyze skill gap between resume and job requirements
         """
-        resume_lower = resume_text.lower()
-        jd_lower = job_description.lower()
-        
-        # Find skills mentioned in job description
-        jd_skills = set()
-        for skill in self.tech_skills:
-            if skill in jd_lower:
-                jd_skills.add(skill)
-        
-        # Find skills in resume
-        resume_skills = set()
-        for skill in self.tech_skills:
-            if skill in resume_lower:
-                resume_skills.add(skill)
-        
-        matched_skills = jd_skills.intersection(resume_skills)
-        missing_skills = jd_skills - resume_skills
-        extra_skills = resume_skills - jd_skills
-        
-        match_ratio = len(matched_skills) / len(jd_skills) if jd_skills else 1.0
-        
-        return {
-            'required_skills': sorted(list(jd_skills)),
-            'matched_skills': sorted(list(matched_skills)),
-            'missing_skills': sorted(list(missing_skills)),
-            'additional_skills': sorted(list(extra_skills)),
-            'match_ratio': match_ratio,
-            'coverage_percentage': round(match_ratio * 100, 1)
-        }
+        return self.compare_skills(
+            self.detect_skills(resume_text),
+            self.detect_skills(job_description)
+        )
     
-    def get_keyword_frequency(self, text: str) -> Dict[str, int]:
+    def compare_skills(self, resume_skills: Set[str], jd_skills: Set[str]) -> Dict:
+        """
+        Compare pre-detected resume skills against job description skills
+        """
+        return matching.compare_skills(resume_skills, jd_skills)
+    
+    def get_keyword_frequency(self, text: str, doc: Optional[Doc] = None) -> Dict[str, int]:
         """
         Get frequency of important keywords in text
         """
-        doc = nlp(text.lower())
+        if doc is None:
+            doc = self.parse(text)
         
         # Filter meaningful tokens
         meaningful_tokens = [
@@ -229,3 +381,25 @@ class NLPProcessor:
         ]
         
         return dict(Counter(meaningful_tokens).most_common(50))
+
+
+# Smoothed IDF (scikit-learn's default) over two documents: ln(3 / (1 + df)) + 1
+_PAIR_IDF = {1: math.log(3 / 2) + 1, 2: 1.0}
+
+
+def _pair_cosine(first: Counter, second: Counter) -> float:
+    """
+    Cosine similarity of two term counts under TF-IDF fitted on the two documents
+    """
+    def norm(counts: Counter, other: Counter) -> float:
+        return math.sqrt(sum(
+            (count * _PAIR_IDF[2 if term in other else 1]) ** 2 for term, count in counts.items()
+        ))
+    
+    first_norm, second_norm = norm(first, second), norm(second, first)
+    if not first_norm or not second_norm:
+        return 0.0
+    
+    # Terms in both documents have an IDF of 1
+    dot = sum(count * second[term] for term, count in first.items() if term in second)
+    return dot / (first_norm * second_norm)
@@ -0,0 +1,648 @@
+"""
+Analysis Pipeline
+Picklable entry points for the parsing and NLP stages, run inside worker processes
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .analysis_store import COMPONENT_SCORES
+from .scoring_engine import ScoringEngine, top_k_indices
+from .similarity_engine import SimilarityEngine
+from .skill_bitset import match_ratios
+from utils.cache import CacheBackend, LRUCache, RedisCacheBackend, content_hash
+from utils.metrics import StageTimer
+from utils.stage_graph import StageGraph
+from utils.text_cleaner import TextCleaner
+
+if TYPE_CHECKING:
+    from .job_catalog import JobCatalog
+    from .nlp_processor import NLPProcessor
+    from .resume_parser import ResumeParser
+
+# JD profile cache configuration
+JD_CACHE_SIZE = int(os.environ.get("JD_CACHE_SIZE", 256))
+JD_CACHE_TTL_SECONDS = float(os.environ.get("JD_CACHE_TTL_SECONDS", 3600))
+JD_CACHE_REDIS_URL = os.environ.get("JD_CACHE_REDIS_URL", "")
+
+# Bump when the profile contents or the key's content hash change so shared
+# caches are not misread
+JD_PROFILE_VERSION = 3
+
+# Corpus-level TF-IDF model (see services/similarity_engine.py)
+TFIDF_MODEL_PATH = os.environ.get("TFIDF_MODEL_PATH", "")
+
+# Threads per worker for running independent stages of one analysis
+# concurrently (1 runs them one after another). With the analysis process
+# pool active (ANALYSIS_WORKERS above 0, as in the API) the worker processes
+# already use every core, so stages run one after another by default.
+_PROCESS_POOL_ACTIVE = int(os.environ.get("ANALYSIS_WORKERS", os.cpu_count() or 1)) > 0
+ANALYSIS_STAGE_THREADS = int(os.environ.get(
+    "ANALYSIS_STAGE_THREADS", 1 if _PROCESS_POOL_ACTIVE else min(4, os.cpu_count() or 1)
+))
+
+
+# Synthetic documents analyzed by warm_up()
+WARM_UP_RESUME = """
+Jane Doe
+Senior Software Engineer
+
+Summary
+Backend engineer with 8 years of experience building Python and Go services.
+
+Experience
+Led a team of five engineers developing REST APIs with FastAPI and PostgreSQL.
+Deployed microservices on Kubernetes and AWS, cutting latency by 40%.
+
+Skills
+Python, Go, SQL, Docker, Kubernetes, AWS, React, machine learning
+
+Education
+B.Sc. Computer Science
+"""
+WARM_UP_JOB_DESCRIPTION = """
+We are hiring a Senior Backend Engineer to design and build scalable APIs.
+Requirements: 5+ years of Python, experience with Docker, Kubernetes and AWS,
+strong SQL skills and familiarity with machine learning pipelines.
+"""
+
+# Per-process service instances, created once by init_worker
+_services = {}
+_services_lock = threading.Lock()
+
+# Job catalogs opened by this process, by directory, and their background rebuilds
+_job_catalogs: Dict[str, 'JobCatalog'] = {}
+_job_catalog_refreshes: Dict[str, threading.Thread] = {}
+_job_catalogs_lock = threading.Lock()
+
+
+def init_worker():
+    """
+    Initialize the services once per worker process
+
+    Creating the NLP processor loads the spaCy model, so each worker pays
+    the model load a single time instead of once per request.
+    """
+    if _services:
+        return
+
+    # The background warm-up and the first requests can get here at once;
+    # services are published together, so none sees a partial set
+    with _services_lock:
+        if not _services:
+            _services.update(_create_services())
+
+
+def _create_services() -> Dict:
+    # spaCy, scikit-learn and pdfplumber take seconds to import; the API
+    # process imports this module only to name tasks, so it never loads them
+    from .nlp_processor import NLPProcessor
+    from .resume_parser import ResumeParser
+
+    # Analysis pool workers already parse documents side by side; helper
+    # processes of their own would multiply the process count per worker
+    in_pool_worker = multiprocessing.parent_process() is not None
+    nlp_processor = NLPProcessor(similarity_engine=load_similarity_engine(TFIDF_MODEL_PATH))
+    scoring_engine = ScoringEngine()
+    text_cleaner = TextCleaner()
+    return {
+        'resume_parser': ResumeParser(parallel_processes=1) if in_pool_worker else ResumeParser(),
+        'nlp_processor': nlp_processor,
+        'scoring_engine': scoring_engine,
+        'text_cleaner': text_cleaner,
+        'jd_cache': LRUCache(
+            max_size=JD_CACHE_SIZE,
+            ttl=JD_CACHE_TTL_SECONDS or None,
+            backend=_create_cache_backend(JD_CACHE_REDIS_URL)
+        ),
+        'stage_executor': _create_stage_executor(),
+        'analysis_graph': _build_analysis_graph(nlp_processor, scoring_engine, text_cleaner),
+    }
+
+
+def _create_stage_executor() -> Optional[ThreadPoolExecutor]:
+    if ANALYSIS_STAGE_THREADS <= 1:
+        return None
+    return ThreadPoolExecutor(max_workers=ANALYSIS_STAGE_THREADS, thread_name_prefix='analysis-stage')
+
+
+def _reset_after_fork():
+    # Threads do not survive fork; a child of a process that already ran
+    # analyses (such as a pre-fork server master) needs its own stage threads,
+    # and a fresh lock in case a parent thread held it
+    global _services_lock
+    _services_lock = threading.Lock()
+    if _services:
+        _services['stage_executor'] = _create_stage_executor()
+    # The parent's catalog connections and rebuild threads are not the child's
+    _job_catalogs.clear()
+    _job_catalog_refreshes.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def load_similarity_engine(path: str) -> Optional[SimilarityEngine]:
+    """
+    Load the corpus-level TF-IDF model if one is configured
+    """
+    if not path:
+        return None
+
+    try:
+        return SimilarityEngine.load(path)
+    except (OSError, ValueError) as e:
+        print(f"Could not load TF-IDF model from {path}, falling back to per-request fitting: {e}")
+        return None
+
+
+def _create_cache_backend(url: str) -> Optional[CacheBackend]:
+    """
+    Create a shared Redis-protocol cache backend if a URL is configured
+    """
+    if not url:
+        return None
+
+    try:
+        import redis
+    except ImportError:
+        print("JD_CACHE_REDIS_URL is set but the redis package is not installed")
+        return None
+
+    return RedisCacheBackend(redis.Redis.from_url(url))
+
+
+def _get_services() -> Tuple['ResumeParser', 'NLPProcessor', ScoringEngine, TextCleaner]:
+    init_worker()
+    return (
+        _services['resume_parser'],
+        _services['nlp_processor'],
+        _services['scoring_engine'],
+        _services['text_cleaner'],
+    )
+
+
+def get_jd_cache_stats() -> Dict:
+    """
+    Get hit/miss counters of this worker's JD profile cache
+    """
+    init_worker()
+    return _services['jd_cache'].stats()
+
+
+def get_jd_profile(job_description: str) -> Dict:
+    """
+    Get the precomputed profile of a job description
+
+    The profile holds everything the analysis needs from the JD: cleaned
+    text, keywords, skills and, with a corpus-level model, TF-IDF term
+    weights. It is cached by a hash of the normalized content, so repeat JDs
+    skip cleaning and all NLP work.
+    """
+    return _load_jd_profile(job_description)[0]
+
+
+def _load_jd_profile(job_description: str) -> Tuple[Dict, bool]:
+    """
+    Get the profile of a job description and whether it came from the cache
+    """
+    _, nlp_processor, _, text_cleaner = _get_services()
+
+    def build_profile() -> Dict:
+        cleaned_jd = text_cleaner.clean_text(job_description)
+        return {
+            'cleaned_text': cleaned_jd,
+            'keywords': sorted(nlp_processor.extract_keywords(cleaned_jd)),
+            'skills': sorted(nlp_processor.detect_skills(cleaned_jd)),
+            'term_weights': nlp_processor.get_term_weights(cleaned_jd)
+        }
+
+    key = (
+        f"jd-profile:v{JD_PROFILE_VERSION}:{nlp_processor.similarity_model_version}:"
+        f"{content_hash(job_description)}"
+    )
+    jd_cache = _services['jd_cache']
+    profile = jd_cache.get(key)
+    if profile is not None:
+        return profile, True
+
+    profile = build_profile()
+    jd_cache.set(key, profile)
+    return profile, False
+
+
+def ping() -> bool:
+    """
+    No-op task used to start and warm up worker processes
+    """
+    init_worker()
+    return True
+
+
+def warm_up(job_catalog_directory: Optional[str] = None) -> float:
+    """
+    Initialize the services and run a synthetic analysis
+
+    The first analysis in a process pays one-off costs (spaCy's lexeme and
+    vocabulary caches, lazily compiled patterns, the first vectorizer fit),
+    which this moves out of the first real request. With a job catalog
+    directory, the catalog match features are built too.
+
+    Returns:
+        Seconds taken
+    """
+    start_time = time.perf_counter()
+    init_worker()
+    analyze_resume(WARM_UP_RESUME, WARM_UP_JOB_DESCRIPTION)
+    if job_catalog_directory:
+        _get_job_catalog(job_catalog_directory).refresh()
+    return time.perf_counter() - start_time
+
+
+def extract_resume(content: bytes, file_extension: str) -> Dict:
+    """
+    Extract and clean text from an uploaded resume, with parse metadata
+
+    The file is parsed from memory; nothing is written to disk. Per-stage
+    durations in seconds are returned under ``stage_timings``.
+    """
+    resume_parser, _, _, text_cleaner = _get_services()
+    timer = StageTimer()
+
+    start_time = time.perf_counter()
+    with timer.stage('parse'):
+        document = resume_parser.extract_document(content, file_extension)
+    extracted_text = document['text']
+
+    with timer.stage('clean'):
+        if not extracted_text or len(extracted_text.strip()) < 50:
+            cleaned_text = ''
+        else:
+            cleaned_text = text_cleaner.clean_text(extracted_text)
+
+    return {
+        'extracted_text': cleaned_text,
+        'character_count': len(cleaned_text),
+        'word_count': len(cleaned_text.split()),
+        'page_count': document['page_count'],
+        'truncated': document['truncated'],
+        'extraction_time_ms': round((time.perf_counter() - start_time) * 1000, 1),
+        'stage_timings': timer.timings
+    }
+
+
+def prepare_index_document(text: str) -> Dict:
+    """
+    Clean text and compute its talent index terms
+
+    Used both for resumes being indexed and for search queries, so both go
+    through the same normalization.
+    """
+    _, nlp_processor, _, text_cleaner = _get_services()
+
+    cleaned_text = text_cleaner.clean_text(text)
+    return {
+        'text': cleaned_text,
+        'terms': nlp_processor.get_index_terms(cleaned_text)
+    }
+
+
+def profile_jobs(job_descriptions: List[str]) -> List[Dict]:
+    """
+    Compute the match profile of many job descriptions for the job catalog
+
+    Returns one dictionary per description with cleaned text, keywords and
+    skills, the same features /analyze derives from a single JD.
+    """
+    _, nlp_processor, _, text_cleaner = _get_services()
+
+    cleaned_jds = text_cleaner.clean_many(job_descriptions)
+    jds_keywords = nlp_processor.extract_keywords_batch(cleaned_jds)
+    return [
+        {
+            'cleaned_text': cleaned_jd,
+            'keywords': sorted(jd_keywords),
+            'skills': sorted(nlp_processor.detect_skills(cleaned_jd))
+        }
+        for cleaned_jd, jd_keywords in zip(cleaned_jds, jds_keywords)
+    ]
+
+
+def profile_resume(resume_text: str) -> Dict:
+    """
+    Compute the match profile of a resume for matching against the job catalog
+    """
+    _, nlp_processor, _, text_cleaner = _get_services()
+    timer = StageTimer()
+
+    with timer.stage('clean'):
+        cleaned_resume = text_cleaner.clean_text(resume_text)
+    with timer.stage('keywords'):
+        resume_keywords = nlp_processor.extract_keywords(cleaned_resume)
+    with timer.stage('sections'):
+        sections_analysis = nlp_processor.detect_sections(cleaned_resume)
+    with timer.stage('skills'):
+        resume_skills = nlp_processor.detect_skills(cleaned_resume)
+
+    return {
+        'cleaned_text': cleaned_resume,
+        'keywords': sorted(resume_keywords),
+        'skills': sorted(resume_skills),
+        'sections_found': sections_analysis['found'],
+        'stage_timings': timer.timings
+    }
+
+
+def match_catalog(job_catalog_directory: str, resume_text: str, top_k: int) -> Dict:
+    """
+    Match a resume against every job of the job catalog stored in a directory
+
+    Each worker opens the catalog once and builds its own match features.
+    Jobs changed since then (by the API process, through the shared SQLite
+    database) are picked up by a rebuild in the background, and matches are
+    served from the previous features until it finishes.
+
+    Returns:
+        Dictionary with the ranked jobs under ``results``, and per-stage
+        durations in seconds under ``stage_timings``
+    """
+    catalog = _get_job_catalog(job_catalog_directory)
+    resume_profile = profile_resume(resume_text)
+    timer = StageTimer()
+    timer.update(resume_profile.pop('stage_timings'))
+
+    with timer.stage('match'):
+        results = catalog.match(resume_profile, top_k)
+
+    if catalog.outdated:
+        with _job_catalogs_lock:
+            refresh = _job_catalog_refreshes.get(job_catalog_directory)
+            if refresh is None or not refresh.is_alive():
+                refresh = threading.Thread(target=_refresh_job_catalog, args=(catalog,), daemon=True)
+                _job_catalog_refreshes[job_catalog_directory] = refresh
+                refresh.start()
+
+    return {'results': results, 'stage_timings': timer.timings}
+
+
+def close_job_catalog(job_catalog_directory: str):
+    """
+    Close this process's copy of a job catalog, if it has one
+    """
+    with _job_catalogs_lock:
+        catalog = _job_catalogs.pop(job_catalog_directory, None)
+        _job_catalog_refreshes.pop(job_catalog_directory, None)
+    if catalog is not None:
+        catalog.close()
+
+
+def _get_job_catalog(directory: str) -> 'JobCatalog':
+    init_worker()
+    with _job_catalogs_lock:
+        catalog = _job_catalogs.get(directory)
+        if catalog is None:
+            from .job_catalog import JobCatalog
+
+            catalog = JobCatalog(
+                directory,
+                similarity_engine=_services['nlp_processor'].similarity_engine,
+                scoring_engine=_services['scoring_engine']
+            )
+            _job_catalogs[directory] = catalog
+        return catalog
+
+
+def _refresh_job_catalog(catalog: 'JobCatalog'):
+    try:
+        catalog.refresh()
+    except Exception as e:
+        print(f"Job catalog refresh error: {e}")
+
+
+def _build_analysis_graph(
+    nlp_processor: 'NLPProcessor',
+    scoring_engine: ScoringEngine,
+    text_cleaner: TextCleaner
+) -> StageGraph:
+    """
+    Stage graph of a single resume/JD analysis
+
+    The lowercased text, spaCy Doc and detected skills of the resume are
+    each computed once and shared. Parsing, skill detection, section
+    detection, similarity and the JD profile do not depend on each other,
+    so they run concurrently; only scoring needs all of them.
+    """
+    def score(keyword_match: Dict, similarity: float, skill_gap: Dict, sections: Dict) -> Dict:
+        scores = scoring_engine.calculate_scores(
+            keyword_match_ratio=keyword_match['match_ratio'],
+            similarity_score=similarity,
+            skills_match_ratio=skill_gap['match_ratio'],
+            sections_found=sections['found']
+        )
+        suggestions = scoring_engine.generate_suggestions(
+            keyword_analysis=keyword_match,
+            sections_analysis=sections,
+            skill_gap=skill_gap,
+            overall_score=scores['overall_score']
+        )
+        return {'scores': scores, 'suggestions': suggestions}
+
+    return (
+        StageGraph()
+        .input('resume_text', 'job_description')
+        # Job description analysis is cached across requests
+        .stage('jd_profile', lambda job_description: _load_jd_profile(job_description), ['job_description'])
+        .stage('clean', lambda resume_text: text_cleaner.clean_text(resume_text), ['resume_text'])
+        .stage('lowercase', lambda clean: clean.lower(), ['clean'])
+        .stage('parse', lambda lowercase: nlp_processor.parse(lowercase, lowercased=True), ['lowercase'])
+        .stage('skills', lambda lowercase: nlp_processor.detect_skills(lowercase), ['lowercase'])
+        .stage(
+            'sections',
+            lambda clean, lowercase: nlp_processor.detect_sections(clean, text_lower=lowercase),
+            ['clean', 'lowercase']
+        )
+        .stage(
+            'keywords',
+            lambda clean, parse, skills: nlp_processor.extract_keywords(clean, doc=parse, skills=skills),
+            ['clean', 'parse', 'skills']
+        )
+        # TF-IDF cosine similarity against the JD's precomputed term weights
+        .stage(
+            'similarity',
+            lambda clean, jd_profile: nlp_processor.calculate_similarity(
+                clean, jd_profile[0]['cleaned_text'], jd_profile[0]['term_weights']
+            ),
+            ['clean', 'jd_profile']
+        )
+        .stage(
+            'keyword_match',
+            lambda keywords, jd_profile: nlp_processor.analyze_keywords(keywords, jd_profile[0]['keywords']),
+            ['keywords', 'jd_profile']
+        )
+        .stage(
+            'skill_gap',
+            lambda skills, jd_profile: nlp_processor.compare_skills(skills, set(jd_profile[0]['skills'])),
+            ['skills', 'jd_profile']
+        )
+        # Final scores and improvement suggestions
+        .stage('scoring', score, ['keyword_match', 'similarity', 'skill_gap', 'sections'])
+    )
+
+
+def analyze_resume(resume_text: str, job_description: str) -> Dict:
+    """
+    Analyze a resume against a job description
+
+    Stages run as a graph (see _build_analysis_graph), concurrently on the
+    worker's stage threads. Besides the response fields, the result carries
+    ``stage_timings`` (seconds per stage) and ``jd_cache_hit`` for the
+    caller's metrics.
+    """
+    init_worker()
+    timer = StageTimer()
+
+    results = _services['analysis_graph'].run(
+        _services['stage_executor'],
+        timer,
+        resume_text=resume_text,
+        job_description=job_description
+    )
+    _, jd_cache_hit = results['jd_profile']
+    scores = results['scoring']['scores']
+    keyword_analysis = results['keyword_match']
+    sections_analysis = results['sections']
+
+    return {
+        'overall_score': round(scores['overall_score'], 1),
+        'keyword_score': round(scores['keyword_score'], 1),
+        'similarity_score': round(scores['similarity_score'], 1),
+        'skills_score': round(scores['skills_score'], 1),
+        'structure_score': round(scores['structure_score'], 1),
+        'matched_keywords': keyword_analysis['matched'],
+        'missing_keywords': keyword_analysis['missing'],
+        'sections_found': sections_analysis['found'],
+        'sections_missing': sections_analysis['missing'],
+        'suggestions': results['scoring']['suggestions'],
+        'skill_gap_analysis': results['skill_gap'],
+        'stage_timings': timer.timings,
+        'jd_cache_hit': jd_cache_hit
+    }
+
+
+def rank_resumes(job_description: str, resumes: List[Tuple[str, str]], top_k: int) -> Dict:
+    """
+    Rank many resumes against a single job description
+
+    Args:
+        job_description: Raw job description text
+        resumes: List of (candidate_id, resume_text) pairs
+        top_k: Number of top candidates to return
+
+    Returns:
+        Dictionary with the ranked candidates and skipped candidate IDs, plus
+        the component scores of every ranked candidate for the analysis store
+    """
+    _, nlp_processor, scoring_engine, text_cleaner = _get_services()
+    timer = StageTimer()
+
+    # Analyze the job description once for the whole batch
+    with timer.stage('jd_profile'):
+        jd_profile, jd_cache_hit = _load_jd_profile(job_description)
+    cleaned_jd = jd_profile['cleaned_text']
+    jd_keywords = jd_profile['keywords']
+    jd_skills = set(jd_profile['skills'])
+
+    # Clean resumes, skipping the ones too short to analyze
+    candidate_ids = []
+    resume_texts = []
+    skipped = []
+    for candidate_id, resume_text in resumes:
+        resume_text = resume_text.strip()
+        if len(resume_text) < 50:
+            skipped.append(candidate_id)
+            continue
+        candidate_ids.append(candidate_id)
+        resume_texts.append(resume_text)
+
+    with timer.stage('clean'):
+        cleaned_resumes = text_cleaner.clean_many(resume_texts)
+
+    # Vectorize all resumes together against the job description
+    with timer.stage('similarity'):
+        similarity_scores = nlp_processor.calculate_similarity_batch(
+            cleaned_resumes, cleaned_jd, jd_profile['term_weights']
+        )
+
+    # One batched spaCy run over all resumes
+    with timer.stage('keywords'):
+        resumes_keywords = nlp_processor.extract_keywords_batch(cleaned_resumes)
+
+    # Skill overlap of all resumes at once, on bitsets over the skill taxonomy
+    with timer.stage('skills'):
+        skill_vocabulary = nlp_processor.skill_vocabulary
+        resumes_skill_bits = skill_vocabulary.encode_many(
+            nlp_processor.detect_skills(cleaned_resume) for cleaned_resume in cleaned_resumes
+        )
+        jd_skill_bits = skill_vocabulary.encode(jd_skills)
+        skills_match_ratios = match_ratios(resumes_skill_bits, jd_skill_bits)
+
+    keyword_analyses = []
+    sections_analyses = []
+    for resume_keywords, cleaned_resume in zip(resumes_keywords, cleaned_resumes):
+        with timer.stage('keyword_match'):
+            keyword_analyses.append(nlp_processor.analyze_keywords(resume_keywords, jd_keywords))
+        with timer.stage('sections'):
+            sections_analyses.append(nlp_processor.detect_sections(cleaned_resume))
+
+    # Score all candidates in one vectorized pass
+    with timer.stage('scoring'):
+        scores = scoring_engine.calculate_scores_batch(
+            keyword_match_ratios=np.array([analysis['match_ratio'] for analysis in keyword_analyses]),
+            similarity_scores=np.asarray(similarity_scores, dtype=np.float64),
+            skills_match_ratios=skills_match_ratios,
+            sections=scoring_engine.encode_sections(analysis['found'] for analysis in sections_analyses)
+        )
+
+    # Candidates with equal scores keep their submitted order
+    with timer.stage('sort'):
+        order = top_k_indices(scores['overall_score'], top_k)
+
+    # Skill names are only decoded for the candidates that are returned
+    results = []
+    for rank, index in enumerate(order, start=1):
+        keyword_analysis = keyword_analyses[index]
+        sections_analysis = sections_analyses[index]
+        results.append({
+            'id': candidate_ids[index],
+            'rank': rank,
+            'overall_score': round(float(scores['overall_score'][index]), 1),
+            'keyword_score': round(float(scores['keyword_score'][index]), 1),
+            'similarity_score': round(float(scores['similarity_score'][index]), 1),
+            'skills_score': round(float(scores['skills_score'][index]), 1),
+            'structure_score': round(float(scores['structure_score'][index]), 1),
+            'grade': str(scores['grade'][index]),
+            'matched_keywords': keyword_analysis['matched'],
+            'missing_keywords': keyword_analysis['missing'],
+            'sections_found': sections_analysis['found'],
+            'sections_missing': sections_analysis['missing'],
+            'skill_gap_analysis': skill_vocabulary.skill_gap(resumes_skill_bits[index], jd_skill_bits)
+        })
+
+    return {
+        'total_candidates': len(resumes),
+        'ranked_candidates': len(candidate_ids),
+        'skipped': skipped,
+        'results': results,
+        'candidate_ids': candidate_ids,
+        'component_scores': {
+            name: np.ascontiguousarray(scores[name]) for name in COMPONENT_SCORES
+        },
+        'stage_timings': timer.timings,
+        'jd_cache_hit': jd_cache_hit
+    }
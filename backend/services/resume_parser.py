@@ -3,61 +3,247 @@ Resume Parser Service
 Extracts text from PDF and DOCX files
 """
 
-import pdfplumber
 from docx import Document
+import atexit
+import io
+import multiprocessing
+import os
 import re
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from utils import docx_text, pdf_text
+
+
+# A document can be given as a file path, its raw bytes or an open binary file
+DocumentSource = Union[str, bytes, BinaryIO]
+
+# PDF extraction: "fast" reads the text layer with pdfium and falls back to
+# pdfplumber for pages that come back empty or garbled; "accurate" uses
+# pdfplumber's layout analysis for every page
+PDF_EXTRACTION_MODE = os.environ.get("PDF_EXTRACTION_MODE", "fast")
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", 50))
+PDF_TIME_BUDGET_SECONDS = float(os.environ.get("PDF_TIME_BUDGET_SECONDS", 10))
+PDF_PARALLEL_PROCESSES = int(os.environ.get("PDF_PARALLEL_PROCESSES", min(4, os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 8))
+
+# DOCX extraction: "stream" parses word/document.xml incrementally and falls
+# back to python-docx if that fails; "python-docx" always loads the full model
+DOCX_EXTRACTION_MODE = os.environ.get("DOCX_EXTRACTION_MODE", "stream")
+
+if PDF_EXTRACTION_MODE not in ('fast', 'accurate'):
+    raise ValueError(f"Unknown PDF_EXTRACTION_MODE: {PDF_EXTRACTION_MODE}")
+if DOCX_EXTRACTION_MODE not in ('stream', 'python-docx'):
+    raise ValueError(f"Unknown DOCX_EXTRACTION_MODE: {DOCX_EXTRACTION_MODE}")
+
+# Helper processes for pdfplumber pages, shared by all parsers in this process
+# and stopped when it exits
+_page_executor: Optional[ProcessPoolExecutor] = None
+_page_executor_lock = threading.Lock()
+
+
+def _get_page_executor(processes: int) -> ProcessPoolExecutor:
+    global _page_executor
+    with _page_executor_lock:
+        if _page_executor is None:
+            _page_executor = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _page_executor
+
+
+def _shutdown_page_executor():
+    global _page_executor
+    with _page_executor_lock:
+        executor, _page_executor = _page_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _reset_after_fork():
+    # The helper processes belong to the parent; a forked child starts its own if needed
+    global _page_executor, _page_executor_lock
+    _page_executor = None
+    _page_executor_lock = threading.Lock()
+
+
+atexit.register(_shutdown_page_executor)
+os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 class ResumeParser:
     """
     Service for extracting text from resume files (PDF/DOCX)
+    
+    PDFs are extracted page by page, up to max_pages pages and within
+    time_budget seconds, which is checked before every page whether it is
+    read by pdfium or pdfplumber. Pages that need pdfplumber are spread over
+    helper processes when there are at least parallel_min_pages of them.
+    
+    DOCX files are streamed from their XML in document order, so tables
+    appear where they are in the document rather than after all paragraphs.
     """
     
-    def extract_text(self, file_path: str, file_extension: str) -> str:
+    def __init__(
+        self,
+        pdf_mode: str = PDF_EXTRACTION_MODE,
+        max_pages: int = PDF_MAX_PAGES,
+        time_budget: float = PDF_TIME_BUDGET_SECONDS,
+        parallel_processes: int = PDF_PARALLEL_PROCESSES,
+        parallel_min_pages: int = PDF_PARALLEL_MIN_PAGES,
+        docx_mode: str = DOCX_EXTRACTION_MODE
+    ):
+        # Without pdfium every page goes through pdfplumber
+        self.pdf_mode = pdf_mode if pdf_text.has_fast_path() else 'accurate'
+        self.max_pages = max_pages
+        self.time_budget = time_budget
+        self.parallel_processes = parallel_processes
+        self.parallel_min_pages = parallel_min_pages
+        self.docx_mode = docx_mode
+    
+    def extract_text(self, source: DocumentSource, file_extension: str) -> str:
         """
         Extract text from a resume file based on its extension
         
         Args:
-            file_path: Path to the temporary file
+            source: File path, raw file bytes or a binary file-like object
             file_extension: File extension (.pdf or .docx)
             
         Returns:
             Extracted text content
         """
+        return self.extract_document(source, file_extension)['text']
+    
+    def extract_document(self, source: DocumentSource, file_extension: str) -> Dict:
+        """
+        Extract text and parse metadata from a resume file
+        
+        In-memory uploads can be passed as bytes and are read from a buffer,
+        without writing them to disk first.
+        
+        Args:
+            source: File path, raw file bytes or a binary file-like object
+            file_extension: File extension (.pdf or .docx)
+            
+        Returns:
+            Dictionary with the extracted text, page count (None for DOCX,
+            which has no fixed pagination) and whether the page or time
+            budget cut the extraction short
+        """
         if file_extension.lower() == '.pdf':
-            return self._extract_from_pdf(file_path)
-        elif file_extension.lower() == '.docx':
-            return self._extract_from_docx(file_path)
-        else:
-            raise ValueError(f"Unsupported file type: {file_extension}")
+            return self._extract_from_pdf(self._read_bytes(source))
+        
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        
+        if file_extension.lower() == '.docx':
+            return {'text': self._extract_from_docx(source), 'page_count': None, 'truncated': False}
+        
+        raise ValueError(f"Unsupported file type: {file_extension}")
     
-    def _extract_from_pdf(self, file_path: str) -> str:
+    @staticmethod
+    def _read_bytes(source: DocumentSource) -> bytes:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return bytes(source)
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return f.read()
+        return source.read()
+    
+    def _extract_from_pdf(self, content: bytes) -> Dict:
         """
-        Extract text from PDF using pdfplumber
+        Extract text page by page from a PDF
+        
+        In fast mode, pdfium's text layer is used for every page where it is
+        readable, and only the remaining pages go through pdfplumber.
         """
-        text_content = []
+        start_time = time.monotonic()
         
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(page_text)
+            page_count = pdf_text.count_pages(content)
+            page_numbers = list(range(min(page_count, self.max_pages)))
             
-            return '\n'.join(text_content)
+            texts: Dict[int, Optional[str]] = {}
+            if self.pdf_mode == 'fast':
+                remaining = self.time_budget - (time.monotonic() - start_time)
+                fast_texts = pdf_text.extract_pages_fast(content, page_numbers, remaining)
+                for page_number, page_text in zip(page_numbers, fast_texts):
+                    if not pdf_text.looks_garbled(page_text):
+                        texts[page_number] = page_text
+            
+            fallback_pages = [page_number for page_number in page_numbers if page_number not in texts]
+            remaining = self.time_budget - (time.monotonic() - start_time)
+            if fallback_pages and remaining > 0:
+                texts.update(self._extract_layout_pages(content, fallback_pages, remaining))
             
         except Exception as e:
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
+        
+        # Pages beyond max_pages or not reached within the time budget
+        truncated = page_count > len(page_numbers) or any(
+            texts.get(page_number) is None for page_number in page_numbers
+        )
+        
+        return {
+            'text': '\n'.join(texts[page_number] for page_number in page_numbers if texts.get(page_number)),
+            'page_count': page_count,
+            'truncated': truncated
+        }
+    
+    def _extract_layout_pages(self, content: bytes, page_numbers: List[int], budget: float) -> Dict[int, Optional[str]]:
+        """
+        Extract pages with pdfplumber, in helper processes for many pages
+        """
+        if self.parallel_processes < 2 or len(page_numbers) < self.parallel_min_pages:
+            return dict(zip(page_numbers, pdf_text.extract_pages_layout(content, page_numbers, budget)))
+        
+        # Contiguous chunks, so each process parses a compact range of the file
+        chunk_size = -(-len(page_numbers) // self.parallel_processes)
+        chunks = [page_numbers[start:start + chunk_size] for start in range(0, len(page_numbers), chunk_size)]
+        
+        executor = _get_page_executor(self.parallel_processes)
+        futures = [
+            executor.submit(pdf_text.extract_pages_layout, content, chunk, budget)
+            for chunk in chunks
+        ]
+        
+        deadline = time.monotonic() + budget
+        texts: Dict[int, Optional[str]] = {}
+        for chunk, future in zip(chunks, futures):
+            try:
+                # Helpers stop between pages at the deadline; allow the current page to finish
+                chunk_texts = future.result(timeout=max(0.0, deadline - time.monotonic()) + 1)
+            except FutureTimeoutError:
+                future.cancel()
+                continue
+            texts.update(zip(chunk, chunk_texts))
+        return texts
+    
+    def _extract_from_docx(self, source: Union[str, BinaryIO]) -> str:
+        """
+        Extract text from DOCX, streaming the XML unless python-docx is configured
+        """
+        if self.docx_mode == 'stream':
+            try:
+                return docx_text.extract_docx_text(source)
+            except Exception as e:
+                print(f"Streaming DOCX extraction error, falling back to python-docx: {e}")
+                if hasattr(source, 'seek'):
+                    source.seek(0)
+        
+        return self._extract_from_docx_model(source)
     
-    def _extract_from_docx(self, file_path: str) -> str:
+    def _extract_from_docx_model(self, source: Union[str, BinaryIO]) -> str:
         """
         Extract text from DOCX using python-docx
         """
         text_content = []
         
         try:
-            doc = Document(file_path)
+            doc = Document(source)
             
             # Extract paragraphs
             for paragraph in doc.paragraphs:
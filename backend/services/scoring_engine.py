@@ -3,21 +3,52 @@ Scoring Engine Service
 Calculates ATS compatibility scores based on multiple factors
 """
 
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
+
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Indices of the top_k highest scores, best first
+    
+    Same result as a stable descending sort truncated to top_k (ties keep
+    their original order), but only the selected scores are sorted.
+    """
+    top_k = max(0, min(top_k, len(scores)))
+    if top_k == 0:
+        return np.arange(0)
+    
+    if top_k < len(scores):
+        # Everything above the k-th best score, then the earliest ties with it
+        cutoff = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        above = np.flatnonzero(scores > cutoff)
+        ties = np.flatnonzero(scores == cutoff)[:top_k - len(above)]
+        candidates = np.sort(np.concatenate([above, ties]))
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
 
 
 class ScoringEngine:
     """
     Professional scoring engine for ATS compatibility analysis
     
-    Scoring Weights:
+    Default Scoring Weights:
     - 40% → Keyword Match
     - 30% → TF-IDF Cosine Similarity  
     - 20% → Required Skills Match
     - 10% → Resume Structure Score
+    
+    Custom weight and grade threshold profiles can be passed in; missing
+    entries keep their defaults.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        thresholds: Optional[Dict[str, float]] = None
+    ):
         # Scoring weights (sum = 100%)
         self.weights = {
             'keyword': 0.40,
@@ -33,6 +64,32 @@ class ScoringEngine:
             'fair': 55,
             'poor': 40
         }
+        
+        self._update_profile(self.weights, weights or {}, 'weight')
+        self._update_profile(self.thresholds, thresholds or {}, 'threshold')
+        
+        if any(weight < 0 for weight in self.weights.values()):
+            raise ValueError("Weights must not be negative")
+        if abs(sum(self.weights.values()) - 1) > 1e-6:
+            raise ValueError("Weights must sum to 1")
+        
+        ordered = [self.thresholds[grade] for grade in ('poor', 'fair', 'good', 'excellent')]
+        if ordered != sorted(ordered):
+            raise ValueError("Thresholds must satisfy poor <= fair <= good <= excellent")
+        
+        # Sections counted by the structure score
+        self.required_sections = ['Skills', 'Experience', 'Education']
+        self.bonus_sections = ['Projects', 'Summary', 'Certifications', 'Achievements']
+        
+        # Column order of section matrices for calculate_scores_batch
+        self.section_columns = self.required_sections + self.bonus_sections
+    
+    @staticmethod
+    def _update_profile(profile: Dict[str, float], overrides: Dict[str, float], kind: str):
+        unknown = set(overrides) - set(profile)
+        if unknown:
+            raise ValueError(f"Unknown {kind} names: {', '.join(sorted(unknown))}")
+        profile.update({name: float(value) for name, value in overrides.items()})
     
     def calculate_scores(
         self,
@@ -80,8 +137,8 @@ class ScoringEngine:
         """
         Calculate score based on resume structure completeness
         """
-        required_sections = ['Skills', 'Experience', 'Education']
-        bonus_sections = ['Projects', 'Summary', 'Certifications', 'Achievements']
+        required_sections = self.required_sections
+        bonus_sections = self.bonus_sections
         
         # Base score for required sections (max 70 points)
         required_found = sum(1 for s in required_sections if s in sections_found)
@@ -93,6 +150,116 @@ class ScoringEngine:
         
         return base_score + bonus_score
     
+    def encode_sections(self, sections_found: Iterable[List[str]]) -> np.ndarray:
+        """
+        Build a section-presence matrix for calculate_scores_batch
+        
+        Args:
+            sections_found: Detected sections of each candidate
+            
+        Returns:
+            Boolean array of shape (candidates, len(self.section_columns))
+        """
+        columns = {section: column for column, section in enumerate(self.section_columns)}
+        rows = [
+            [columns[section] for section in sections if section in columns]
+            for sections in sections_found
+        ]
+        
+        matrix = np.zeros((len(rows), len(columns)), dtype=bool)
+        for row, found in enumerate(rows):
+            matrix[row, found] = True
+        return matrix
+    
+    def calculate_scores_batch(
+        self,
+        keyword_match_ratios: np.ndarray,
+        similarity_scores: np.ndarray,
+        skills_match_ratios: np.ndarray,
+        sections: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate scores for many candidates at once
+        
+        Performs the same floating-point operations as calculate_scores, so
+        every value equals the scalar result. Inputs are broadcast against
+        each other, e.g. one section row for a single resume scored
+        against many job descriptions.
+        
+        Args:
+            keyword_match_ratios: Ratios of matched keywords (0-1)
+            similarity_scores: TF-IDF cosine similarities (0-100)
+            skills_match_ratios: Ratios of matched skills (0-1)
+            sections: Section-presence matrix with columns in self.section_columns
+            
+        Returns:
+            Dictionary of score arrays, plus grades as an array of letters
+        """
+        sections = np.asarray(sections, dtype=bool)
+        required_count = len(self.required_sections)
+        
+        # Same arithmetic as _calculate_structure_score
+        required_found = sections[:, :required_count].sum(axis=1)
+        bonus_found = sections[:, required_count:].sum(axis=1)
+        structure_scores = (
+            (required_found / required_count) * 70 +
+            np.minimum((bonus_found / len(self.bonus_sections)) * 30, 30)
+        )
+        
+        keyword_scores = np.minimum(np.asarray(keyword_match_ratios, dtype=np.float64) * 100, 100)
+        similarity_scores = np.minimum(np.asarray(similarity_scores, dtype=np.float64), 100)
+        skills_scores = np.minimum(np.asarray(skills_match_ratios, dtype=np.float64) * 100, 100)
+        return self.combine_scores(keyword_scores, similarity_scores, skills_scores, structure_scores)
+    
+    def combine_scores(
+        self,
+        keyword_scores: np.ndarray,
+        similarity_scores: np.ndarray,
+        skills_scores: np.ndarray,
+        structure_scores: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Weight component scores (0-100) into overall scores and grades
+        
+        This is the only step that depends on the weights and thresholds, so
+        stored component scores can be re-ranked under another profile
+        without repeating any text analysis.
+        
+        Returns:
+            Dictionary in the format of calculate_scores_batch
+        """
+        keyword_scores, similarity_scores, skills_scores, structure_scores = np.broadcast_arrays(
+            keyword_scores, similarity_scores, skills_scores, structure_scores
+        )
+        
+        overall_scores = (
+            keyword_scores * self.weights['keyword'] +
+            similarity_scores * self.weights['similarity'] +
+            skills_scores * self.weights['skills'] +
+            structure_scores * self.weights['structure']
+        )
+        
+        return {
+            'overall_score': overall_scores,
+            'keyword_score': keyword_scores,
+            'similarity_score': similarity_scores,
+            'skills_score': skills_scores,
+            'structure_score': structure_scores,
+            'grade': self._get_grades(overall_scores)
+        }
+    
+    def _get_grades(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Convert an array of scores to letter grades (same cut-offs as _get_grade)
+        """
+        cutoffs = [
+            self.thresholds['poor'],
+            self.thresholds['fair'],
+            self.thresholds['good'],
+            self.thresholds['excellent']
+        ]
+        return np.array(['F', 'D', 'C', 'B', 'A'])[np.searchsorted(cutoffs, scores, side='right')]
+    
     def _get_grade(self, score: float) -> str:
         """
         Convert score to letter grade
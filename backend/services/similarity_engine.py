@@ -0,0 +1,282 @@
+"""
+Similarity Engine Service
+Corpus-level TF-IDF model with a pre-fit vocabulary and IDF table
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# scikit-learn is imported where it is used: the import takes about a second,
+# and the API process only needs it once a model is actually loaded or fitted
+
+
+MODEL_FORMAT_VERSION = 1
+
+
+class _ModelState:
+    """
+    Immutable snapshot of the vocabulary and IDF table
+
+    Requests only ever read a state object; updates build a new one and swap
+    the reference, so concurrent transforms never see a half-updated model.
+    """
+
+    def __init__(self, terms: List[str], doc_freq: np.ndarray, n_docs: int, params: Dict):
+        self.terms = terms
+        self.doc_freq = doc_freq
+        self.n_docs = n_docs
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+
+        # Smoothed IDF, identical to scikit-learn's TfidfTransformer default
+        self.idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+        self.idf_diagonal = sparse.diags(self.idf, format='csr')
+
+        from sklearn.feature_extraction.text import CountVectorizer
+        self.counter = CountVectorizer(vocabulary=self.vocabulary, **params)
+        # Validate the fixed vocabulary now, so transform() never mutates the vectorizer
+        self.counter.transform([''])
+
+        digest = hashlib.sha256('\n'.join(terms).encode('utf-8'))
+        digest.update(doc_freq.astype(np.int64).tobytes())
+        digest.update(str(n_docs).encode('utf-8'))
+        self.fingerprint = digest.hexdigest()[:16]
+
+
+class SimilarityEngine:
+    """
+    TF-IDF similarity backed by a vocabulary and IDF fitted on a corpus
+
+    Unlike fitting a vectorizer on each resume/JD pair, the IDF here reflects
+    how common a term is across many documents, and the model is read-only
+    at request time so it is safe to share between threads. Many documents
+    are transformed in a single sparse-matrix pass.
+    """
+
+    def __init__(
+        self,
+        stop_words: Optional[str] = 'english',
+        ngram_range: Tuple[int, int] = (1, 2),
+        max_features: int = 5000
+    ):
+        self.params = {
+            'stop_words': stop_words,
+            'ngram_range': tuple(ngram_range),
+            'lowercase': True
+        }
+        self.max_features = max_features
+        self._state: Optional[_ModelState] = None
+        self._update_lock = threading.RLock()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self._state is not None
+
+    @property
+    def version(self) -> str:
+        """
+        Fingerprint of the current model, for keying derived caches
+        """
+        state = self._state
+        return state.fingerprint if state is not None else 'unfitted'
+
+    @property
+    def vocabulary_size(self) -> int:
+        state = self._state
+        return len(state.terms) if state is not None else 0
+
+    def fit(self, documents: Iterable[str]) -> 'SimilarityEngine':
+        """
+        Fit the vocabulary and IDF table on a corpus
+        """
+        self.fit_transform(documents)
+        return self
+
+    def fit_transform(self, documents: Iterable[str]) -> sparse.csr_matrix:
+        """
+        Fit on a corpus and return its L2-normalized TF-IDF rows
+
+        Equivalent to fit() followed by transform(), but tokenizes the corpus once.
+        """
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.preprocessing import normalize
+
+        documents = list(documents)
+        counter = CountVectorizer(max_features=self.max_features, **self.params)
+        counts = counter.fit_transform(documents)
+
+        terms = [str(term) for term in counter.get_feature_names_out()]
+        doc_freq = np.asarray((counts > 0).sum(axis=0)).ravel()
+
+        state = _ModelState(terms, doc_freq, len(documents), self.params)
+        with self._update_lock:
+            self._state = state
+        return normalize(counts @ state.idf_diagonal, norm='l2', copy=False)
+
+    def partial_fit(self, documents: Iterable[str]) -> 'SimilarityEngine':
+        """
+        Update document frequencies with new documents
+
+        New terms are added while the vocabulary is below ``max_features``.
+        The updated model is swapped in atomically.
+        """
+        documents = list(documents)
+        if not documents:
+            return self
+
+        with self._update_lock:
+            state = self._state
+            if state is None:
+                return self.fit(documents)
+
+            analyzer = state.counter.build_analyzer()
+            terms = list(state.terms)
+            vocabulary = dict(state.vocabulary)
+            doc_freq = list(state.doc_freq)
+
+            for document in documents:
+                for term in set(analyzer(document)):
+                    index = vocabulary.get(term)
+                    if index is None:
+                        if len(terms) >= self.max_features:
+                            continue
+                        index = len(terms)
+                        vocabulary[term] = index
+                        terms.append(term)
+                        doc_freq.append(0)
+                    doc_freq[index] += 1
+
+            self._state = _ModelState(
+                terms, np.asarray(doc_freq), state.n_docs + len(documents), self.params
+            )
+        return self
+
+    def transform(self, documents: List[str]) -> sparse.csr_matrix:
+        """
+        Transform documents into L2-normalized TF-IDF rows
+        """
+        from sklearn.preprocessing import normalize
+
+        state = self._require_state()
+        counts = state.counter.transform(documents)
+        return normalize(counts @ state.idf_diagonal, norm='l2', copy=False)
+
+    def term_weights(self, document: str) -> Dict[str, float]:
+        """
+        Get the TF-IDF weights of the terms in one document
+        """
+        state = self._require_state()
+        vector = self.transform([document]).tocoo()
+        return {state.terms[index]: float(weight) for index, weight in zip(vector.col, vector.data)}
+
+    def vector_from_weights(self, term_weights: Dict[str, float]) -> sparse.csr_matrix:
+        """
+        Rebuild a TF-IDF row from stored term weights
+        """
+        state = self._require_state()
+        indices = []
+        weights = []
+        for term, weight in term_weights.items():
+            index = state.vocabulary.get(term)
+            if index is not None:
+                indices.append(index)
+                weights.append(weight)
+
+        return sparse.csr_matrix(
+            (weights, ([0] * len(indices), indices)),
+            shape=(1, len(state.terms))
+        )
+
+    def similarities(self, documents: List[str], query) -> np.ndarray:
+        """
+        Cosine similarity (0-100) of each document to a query
+
+        Args:
+            documents: Texts to score
+            query: Query text, or its term weights from term_weights()
+        """
+        if not documents:
+            return np.zeros(0)
+
+        if isinstance(query, dict):
+            query_vector = self.vector_from_weights(query)
+        else:
+            query_vector = self.transform([query])
+
+        matrix = self.transform(documents)
+        return (matrix @ query_vector.T).toarray().ravel() * 100
+
+    def _require_state(self) -> _ModelState:
+        state = self._state
+        if state is None:
+            raise RuntimeError("Similarity model is not fitted")
+        return state
+
+    def save(self, path: str):
+        """
+        Save the vocabulary and document frequencies as JSON
+        """
+        state = self._require_state()
+        model = {
+            'format_version': MODEL_FORMAT_VERSION,
+            'stop_words': self.params['stop_words'],
+            'ngram_range': list(self.params['ngram_range']),
+            'max_features': self.max_features,
+            'n_docs': state.n_docs,
+            'terms': state.terms,
+            'doc_freq': [int(value) for value in state.doc_freq]
+        }
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as model_file:
+            json.dump(model, model_file)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SimilarityEngine':
+        """
+        Load a model saved with save()
+        """
+        with open(path, 'r', encoding='utf-8') as model_file:
+            model = json.load(model_file)
+
+        if model.get('format_version') != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported similarity model format: {model.get('format_version')}")
+
+        engine = cls(
+            stop_words=model['stop_words'],
+            ngram_range=tuple(model['ngram_range']),
+            max_features=model['max_features']
+        )
+        engine._state = _ModelState(
+            model['terms'], np.asarray(model['doc_freq']), model['n_docs'], engine.params
+        )
+        return engine
+
+
+def _read_corpus(directory: str) -> List[str]:
+    documents = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.txt'):
+            with open(os.path.join(directory, name), 'r', encoding='utf-8', errors='ignore') as text_file:
+                documents.append(text_file.read())
+    return documents
+
+
+if __name__ == "__main__":
+    # Fit a model from a directory of .txt resumes and job descriptions:
+    #   python -m services.similarity_engine corpus_dir tfidf_model.json
+    if len(sys.argv) != 3:
+        print("Usage: python -m services.similarity_engine <corpus_dir> <output.json>")
+        sys.exit(1)
+
+    corpus = _read_corpus(sys.argv[1])
+    engine = SimilarityEngine().fit(corpus)
+    engine.save(sys.argv[2])
+    print(f"Fitted on {len(corpus)} documents, {engine.vocabulary_size} terms -> {sys.argv[2]}")
@@ -0,0 +1,143 @@
+"""
+Skill Bitset Service
+Skill sets packed into uint64 words, for skill-gap computation over whole batches
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+WORD_BITS = 64
+
+# Set bits per byte value; numpy 1.26 has no bitwise_count
+_POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """
+    Count the set bits of each bitset
+
+    Args:
+        bits: One bitset (1-D array of words) or a batch (2-D, one bitset per row)
+
+    Returns:
+        Number of set bits (a scalar for one bitset, an array for a batch)
+    """
+    as_bytes = np.ascontiguousarray(bits, dtype='<u8').view(np.uint8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def match_ratios(resume_bits: np.ndarray, jd_bits: np.ndarray) -> np.ndarray:
+    """
+    Fraction of each job description's skills found in each resume
+
+    Either side can be a batch: many resumes against one JD, or one resume
+    against many JDs. A JD without skills has a ratio of 1.0, as in
+    matching.compare_skills.
+    """
+    matched = popcount(resume_bits & jd_bits)
+    required = np.broadcast_to(popcount(jd_bits), np.shape(matched))
+    return np.divide(
+        matched, required,
+        out=np.ones(np.shape(matched)), where=required > 0
+    )
+
+
+class SkillVocabulary:
+    """
+    Stable integer IDs for skills
+
+    IDs are assigned in sorted order of the initial skills (the taxonomy), so
+    every process built from the same taxonomy agrees on them. Skills added
+    later get the next free IDs; existing IDs never change.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self.skills: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.extend(sorted(set(skills)))
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    @property
+    def words(self) -> int:
+        """Number of uint64 words in a bitset over this vocabulary"""
+        return max(1, -(-len(self.skills) // WORD_BITS))
+
+    def extend(self, skills: Iterable[str]):
+        """
+        Assign IDs to skills not in the vocabulary yet
+        """
+        for skill in skills:
+            if skill not in self._ids:
+                self._ids[skill] = len(self.skills)
+                self.skills.append(skill)
+
+    def encode(self, skills: Iterable[str], words: Optional[int] = None) -> np.ndarray:
+        """
+        Encode one skill set as a bitset (skills outside the vocabulary are ignored)
+        """
+        return self.encode_many([skills], words)[0]
+
+    def encode_many(self, skill_sets: Iterable[Iterable[str]], words: Optional[int] = None) -> np.ndarray:
+        """
+        Encode skill sets as a matrix with one bitset per row
+
+        Args:
+            skill_sets: Skill sets to encode
+            words: Bitset width in words (defaults to the vocabulary's width).
+                Skills with IDs beyond the width are dropped.
+
+        Returns:
+            uint64 array of shape (number of sets, words)
+        """
+        words = words or self.words
+        rows, ids = [], []
+        count = 0
+        for row, skills in enumerate(skill_sets):
+            count += 1
+            for skill in skills:
+                skill_id = self._ids.get(skill)
+                if skill_id is not None and skill_id < words * WORD_BITS:
+                    rows.append(row)
+                    ids.append(skill_id)
+
+        bits = np.zeros((count, words), dtype=np.uint64)
+        if ids:
+            ids = np.array(ids, dtype=np.uint64)
+            np.bitwise_or.at(
+                bits,
+                (np.array(rows), (ids // WORD_BITS).astype(np.intp)),
+                np.left_shift(np.uint64(1), ids % np.uint64(WORD_BITS))
+            )
+        return bits
+
+    def decode(self, bits: np.ndarray) -> List[str]:
+        """
+        Decode a bitset back to its sorted skill names
+        """
+        as_bytes = np.ascontiguousarray(bits, dtype='<u8').view(np.uint8)
+        ids = np.flatnonzero(np.unpackbits(as_bytes, bitorder='little'))
+        return sorted(self.skills[skill_id] for skill_id in ids if skill_id < len(self.skills))
+
+    def skill_gap(self, resume_bits: np.ndarray, jd_bits: np.ndarray) -> Dict:
+        """
+        Skill gap of one resume/JD pair, in the format of matching.compare_skills
+
+        Only called for results that are returned, since decoding names is
+        the expensive part.
+        """
+        required = popcount(jd_bits)
+        matched_bits = resume_bits & jd_bits
+        match_ratio = int(popcount(matched_bits)) / int(required) if required else 1.0
+
+        return {
+            'required_skills': self.decode(jd_bits),
+            'matched_skills': self.decode(matched_bits),
+            'missing_skills': self.decode(jd_bits & ~resume_bits),
+            'additional_skills': self.decode(resume_bits & ~jd_bits),
+            'match_ratio': match_ratio,
+            'coverage_percentage': round(match_ratio * 100, 1)
+        }
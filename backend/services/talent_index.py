@@ -0,0 +1,605 @@
+"""
+Talent Index Service
+Persistent inverted index of analyzed resumes with BM25 search
+"""
+
+import json
+import math
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+INDEX_FORMAT_VERSION = 1
+
+# Prefix of skill terms, so "go" the skill and "go" the word never share postings
+SKILL_PREFIX = 'skill:'
+
+# What is left of a deleted document's row: its ID, length and deleted flag.
+# The content hash becomes a per-document marker to keep the column unique.
+_PURGED_COLUMNS = (
+    "content_hash = 'deleted:' || doc_id, filename = NULL, skills = '[]', terms = '{}', text = ''"
+)
+
+
+def encode_varints(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode non-negative integers as LEB128 varints (7 bits per byte)
+
+    Returns:
+        Tuple of (encoded bytes, number of bytes used by each value)
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(len(values), dtype=np.int64)
+    remaining = values >> np.uint64(7)
+    while remaining.any():
+        sizes += remaining > 0
+        remaining >>= np.uint64(7)
+
+    starts = np.cumsum(sizes) - sizes
+    output = np.empty(int(sizes.sum()), dtype=np.uint8)
+    for byte_index in range(int(sizes.max()) if len(sizes) else 0):
+        present = sizes > byte_index
+        chunk = (values[present] >> np.uint64(7 * byte_index)) & np.uint64(0x7F)
+        continues = (sizes[present] > byte_index + 1).astype(np.uint64) << np.uint64(7)
+        output[starts[present] + byte_index] = (chunk | continues).astype(np.uint8)
+    return output, sizes
+
+
+def decode_varints(data: np.ndarray) -> np.ndarray:
+    """
+    Decode a buffer of LEB128 varints into int64 values, without a Python loop
+    """
+    data = np.asarray(data, dtype=np.uint8)
+    is_last = data < 0x80
+    if is_last.all():
+        # Small values (the common case for gaps and term frequencies) are one byte each
+        return data.astype(np.int64)
+
+    ends = np.flatnonzero(is_last)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+
+    value_index = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shifts = (np.arange(len(data)) - starts[value_index]) * 7
+    payload = (data & 0x7F).astype(np.int64) << shifts
+    return np.add.reduceat(payload, starts)
+
+
+class _Segment:
+    """
+    Immutable, memory-mapped block of postings
+
+    The postings file holds, for each term, the varint-encoded doc ID gaps
+    followed by the term frequencies. The lexicon maps a term to its byte
+    offset, byte length and document frequency.
+    """
+
+    def __init__(self, directory: str, segment_id: int):
+        self.segment_id = segment_id
+        base = os.path.join(directory, f"segment_{segment_id:06d}")
+        self.postings_path = f"{base}.postings"
+        self.lexicon_path = f"{base}.lexicon.json"
+
+        with open(self.lexicon_path, 'r', encoding='utf-8') as lexicon_file:
+            self.lexicon: Dict[str, List[int]] = json.load(lexicon_file)
+
+        self._data = np.zeros(0, dtype=np.uint8)
+        if os.path.getsize(self.postings_path) > 0:
+            with open(self.postings_path, 'rb') as postings_file:
+                self._mmap = mmap.mmap(postings_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = np.frombuffer(self._mmap, dtype=np.uint8)
+
+    def postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Get (doc_ids, term_frequencies) of a term, or None if absent
+        """
+        entry = self.lexicon.get(term)
+        if entry is None:
+            return None
+
+        offset, length, doc_freq = entry
+        values = decode_varints(self._data[offset:offset + length])
+        return np.cumsum(values[:doc_freq]), values[doc_freq:]
+
+    def iter_postings(self):
+        """
+        Yield (term, doc_ids, term_frequencies) for every term, decoding the file once
+        """
+        values = decode_varints(self._data) if len(self._data) else np.zeros(0, dtype=np.int64)
+        position = 0
+        for term, (_, _, doc_freq) in sorted(self.lexicon.items(), key=lambda item: item[1][0]):
+            doc_ids = np.cumsum(values[position:position + doc_freq])
+            frequencies = values[position + doc_freq:position + 2 * doc_freq]
+            position += 2 * doc_freq
+            yield term, doc_ids, frequencies
+
+
+def write_segment(directory: str, segment_id: int, postings: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> _Segment:
+    """
+    Write sorted postings as a new segment and open it
+
+    All terms are varint-encoded in a single vectorized pass; files are
+    written under temporary names and renamed, so a crash never leaves a
+    half-written segment behind.
+    """
+    terms = sorted(postings)
+    doc_freqs = np.array([len(postings[term][0]) for term in terms], dtype=np.int64)
+
+    blocks = []
+    for term in terms:
+        doc_ids, frequencies = postings[term]
+        blocks.append(np.diff(np.asarray(doc_ids, dtype=np.int64), prepend=0))
+        blocks.append(np.asarray(frequencies, dtype=np.int64))
+    values = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int64)
+    encoded, sizes = encode_varints(values)
+
+    # Byte offset of each term: every term owns 2 * doc_freq consecutive values
+    value_ends = np.cumsum(2 * doc_freqs)
+    byte_ends = np.cumsum(sizes)[value_ends - 1] if len(terms) else np.zeros(0, dtype=np.int64)
+    byte_starts = np.concatenate([[0], byte_ends[:-1]]) if len(terms) else byte_ends
+
+    lexicon = {
+        term: [int(start), int(end - start), int(doc_freq)]
+        for term, start, end, doc_freq in zip(terms, byte_starts, byte_ends, doc_freqs)
+    }
+
+    base = os.path.join(directory, f"segment_{segment_id:06d}")
+    with open(f"{base}.postings.tmp", 'wb') as postings_file:
+        postings_file.write(encoded.tobytes())
+    with open(f"{base}.lexicon.json.tmp", 'w', encoding='utf-8') as lexicon_file:
+        json.dump(lexicon, lexicon_file)
+    os.replace(f"{base}.postings.tmp", f"{base}.postings")
+    os.replace(f"{base}.lexicon.json.tmp", f"{base}.lexicon.json")
+
+    return _Segment(directory, segment_id)
+
+
+class TalentIndex:
+    """
+    On-disk inverted index of resumes, searchable by job description
+
+    Documents are stored in SQLite (text, skills, term frequencies) and their
+    postings in immutable, memory-mapped segments. New documents go to an
+    in-memory buffer that is written out as a segment every ``flush_docs``
+    documents; when there are more than ``max_segments`` segments they are
+    merged into one, dropping deleted documents. Deleting a document purges
+    its text, terms, skills, file name and content hash at once; only a
+    tombstone (doc ID and length) is kept for the postings that still
+    reference it until the next merge. Documents not yet flushed are
+    recovered from SQLite on open, so nothing is lost on a crash.
+
+    Search scores candidates with BM25 over the postings of the query terms
+    only, so its cost depends on how common those terms are rather than on
+    the size of the pool.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        flush_docs: int = 1000,
+        max_segments: int = 8,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.directory = directory
+        self.flush_docs = max(1, flush_docs)
+        self.max_segments = max(1, max_segments)
+        self.k1 = k1
+        self.b = b
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._merge_lock = threading.Lock()
+
+        self._db = sqlite3.connect(
+            os.path.join(directory, 'documents.db'), check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # Freed pages are zeroed, so purged resume text does not linger in the file
+        self._db.execute("PRAGMA secure_delete=ON")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_hash TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                filename TEXT,
+                length INTEGER NOT NULL,
+                skills TEXT NOT NULL,
+                terms TEXT NOT NULL,
+                text TEXT NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                indexed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+        self._manifest = self._read_manifest()
+        self._segments = [_Segment(directory, segment_id) for segment_id in self._manifest['segments']]
+
+        # Per-document length and liveness, indexed by doc ID
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._live = np.zeros(1024, dtype=bool)
+        self._live_count = 0
+        self._deleted_count = 0
+        self._total_length = 0.0
+        self._max_doc_id = 0
+
+        # Unflushed postings: term -> ([doc_ids], [term_frequencies])
+        self._buffer: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._buffer_docs = 0
+
+        self._load_documents()
+        self._remove_orphaned_segments()
+
+    # Manifest
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, 'manifest.json')
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self._manifest_path(), 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except FileNotFoundError:
+            return {'format_version': INDEX_FORMAT_VERSION, 'segments': [], 'next_segment_id': 1, 'flushed_through': 0}
+
+        if manifest.get('format_version') != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported talent index format: {manifest.get('format_version')}")
+        return manifest
+
+    def _remove_orphaned_segments(self):
+        # Left behind by a crash between writing a segment and updating the manifest
+        active = {f"segment_{segment_id:06d}" for segment_id in self._manifest['segments']}
+        for name in os.listdir(self.directory):
+            if name.startswith('segment_') and name.split('.')[0] not in active:
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _write_manifest(self):
+        temp_path = f"{self._manifest_path()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(self._manifest, manifest_file)
+        os.replace(temp_path, self._manifest_path())
+
+    # Document bookkeeping
+
+    def _ensure_capacity(self, doc_id: int):
+        if doc_id < len(self._lengths):
+            return
+        size = max(doc_id + 1, len(self._lengths) * 2)
+        lengths = np.zeros(size, dtype=np.float32)
+        live = np.zeros(size, dtype=bool)
+        lengths[:len(self._lengths)] = self._lengths
+        live[:len(self._live)] = self._live
+        self._lengths, self._live = lengths, live
+
+    def _track(self, doc_id: int, length: int, deleted: bool):
+        self._ensure_capacity(doc_id)
+        self._lengths[doc_id] = length
+        self._max_doc_id = max(self._max_doc_id, doc_id)
+        if deleted:
+            self._deleted_count += 1
+        else:
+            self._live[doc_id] = True
+            self._live_count += 1
+            self._total_length += length
+
+    def _buffer_document(self, doc_id: int, terms: Dict[str, int]):
+        for term, frequency in terms.items():
+            postings = self._buffer.get(term)
+            if postings is None:
+                postings = ([], [])
+                self._buffer[term] = postings
+            postings[0].append(doc_id)
+            postings[1].append(frequency)
+        self._buffer_docs += 1
+
+    def _load_documents(self):
+        # Tombstones written before deletes purged their documents
+        self._db.execute(f"UPDATE documents SET {_PURGED_COLUMNS} WHERE deleted = 1 AND text != ''")
+        self._db.commit()
+
+        flushed_through = self._manifest['flushed_through']
+        rows = self._db.execute("SELECT doc_id, length, deleted FROM documents ORDER BY doc_id")
+        for doc_id, length, deleted in rows:
+            self._track(doc_id, length, bool(deleted))
+
+        # Recover documents that were added after the last flush
+        pending = self._db.execute(
+            "SELECT doc_id, terms FROM documents WHERE doc_id > ? AND deleted = 0 ORDER BY doc_id",
+            (flushed_through,)
+        )
+        for doc_id, terms in pending:
+            self._buffer_document(doc_id, json.loads(terms))
+
+    # Writes
+
+    def add(
+        self,
+        text: str,
+        terms: Dict[str, int],
+        content_hash: str,
+        source: str,
+        filename: Optional[str] = None
+    ) -> Tuple[int, bool]:
+        """
+        Index a document
+
+        Args:
+            text: Cleaned resume text
+            terms: Term frequencies from NLPProcessor.get_index_terms
+            content_hash: Hash identifying the document, used to skip duplicates
+            source: Where the document came from ("upload" or "analyze")
+            filename: Original file name for uploads
+
+        Returns:
+            Tuple of (doc_id, whether the document was newly added)
+        """
+        skills = sorted(term[len(SKILL_PREFIX):] for term in terms if term.startswith(SKILL_PREFIX))
+        length = sum(frequency for term, frequency in terms.items() if not term.startswith(SKILL_PREFIX))
+
+        with self._lock:
+            # Deleted documents no longer carry their hash, so re-adding one
+            # indexes it again under a new ID
+            existing = self._db.execute(
+                "SELECT doc_id FROM documents WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if existing is not None:
+                return existing[0], False
+
+            cursor = self._db.execute(
+                """
+                INSERT INTO documents (content_hash, source, filename, length, skills, terms, text, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (content_hash, source, filename, length, json.dumps(skills), json.dumps(terms), text, time.time())
+            )
+            self._db.commit()
+            doc_id = cursor.lastrowid
+
+            self._track(doc_id, length, deleted=False)
+            self._buffer_document(doc_id, terms)
+
+            if self._buffer_docs >= self.flush_docs:
+                self._flush_locked()
+
+        self._maybe_merge()
+        return doc_id, True
+
+    def contains(self, content_hash: str) -> bool:
+        """
+        Check whether a live document with this content hash is indexed
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM documents WHERE content_hash = ? AND deleted = 0", (content_hash,)
+            ).fetchone()
+        return row is not None
+
+    def delete(self, doc_id: int) -> bool:
+        """
+        Remove a document from search results and purge its stored content
+
+        Returns:
+            False if no live document has this ID
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                f"UPDATE documents SET deleted = 1, {_PURGED_COLUMNS} WHERE doc_id = ? AND deleted = 0",
+                (doc_id,)
+            )
+            self._db.commit()
+            if cursor.rowcount == 0:
+                return False
+            # Copy the write-ahead log back and truncate it, since it still
+            # holds the pages with the document as it was
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            self._live[doc_id] = False
+            self._live_count -= 1
+            self._deleted_count += 1
+            self._total_length -= float(self._lengths[doc_id])
+            return True
+
+    def flush(self):
+        """
+        Write buffered postings to a new segment
+        """
+        with self._lock:
+            self._flush_locked()
+        self._maybe_merge()
+
+    def _flush_locked(self):
+        if not self._buffer_docs:
+            return
+
+        live = self._live
+        postings = {}
+        for term, (doc_ids, frequencies) in self._buffer.items():
+            doc_ids = np.asarray(doc_ids, dtype=np.int64)
+            keep = live[doc_ids]
+            if keep.any():
+                postings[term] = (doc_ids[keep], np.asarray(frequencies, dtype=np.int64)[keep])
+
+        segment_id = self._manifest['next_segment_id']
+        segment = write_segment(self.directory, segment_id, postings)
+
+        self._segments = self._segments + [segment]
+        self._manifest['segments'] = [existing.segment_id for existing in self._segments]
+        self._manifest['next_segment_id'] = segment_id + 1
+        self._manifest['flushed_through'] = self._max_doc_id
+        self._write_manifest()
+
+        self._buffer = {}
+        self._buffer_docs = 0
+
+    def _maybe_merge(self):
+        if len(self._segments) <= self.max_segments:
+            return
+        if not self._merge_lock.acquire(blocking=False):
+            return
+
+        try:
+            with self._lock:
+                segments = list(self._segments)
+                segment_id = self._manifest['next_segment_id']
+                self._manifest['next_segment_id'] = segment_id + 1
+                live = self._live.copy()
+
+            # The merge reads immutable segments, so it runs without blocking writes
+            merged_postings: Dict[str, Tuple[List[np.ndarray], List[np.ndarray]]] = {}
+            for segment in segments:
+                for term, doc_ids, frequencies in segment.iter_postings():
+                    keep = live[doc_ids]
+                    if not keep.any():
+                        continue
+                    parts = merged_postings.setdefault(term, ([], []))
+                    parts[0].append(doc_ids[keep])
+                    parts[1].append(frequencies[keep])
+
+            merged = write_segment(self.directory, segment_id, {
+                term: (np.concatenate(doc_id_parts), np.concatenate(frequency_parts))
+                for term, (doc_id_parts, frequency_parts) in merged_postings.items()
+            })
+
+            with self._lock:
+                merged_ids = {segment.segment_id for segment in segments}
+                self._segments = [merged] + [
+                    segment for segment in self._segments if segment.segment_id not in merged_ids
+                ]
+                self._manifest['segments'] = [segment.segment_id for segment in self._segments]
+                self._write_manifest()
+
+            # Open searches keep their own references; the mappings stay valid after unlink
+            for segment in segments:
+                for path in (segment.postings_path, segment.lexicon_path):
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+        finally:
+            self._merge_lock.release()
+
+    # Reads
+
+    def search(self, query_terms: Dict[str, float], top_k: int = 10) -> List[Dict]:
+        """
+        Find the best BM25 matches for weighted query terms
+
+        Args:
+            query_terms: Term weights of the query (e.g. JD term frequencies)
+            top_k: Number of candidates to return
+
+        Returns:
+            List of candidate dictionaries ordered by descending score
+        """
+        with self._lock:
+            segments = self._segments
+            lengths = self._lengths
+            live = self._live.copy()
+            doc_count = self._live_count
+            average_length = self._total_length / doc_count if doc_count else 0.0
+            buffered = {
+                term: (np.asarray(self._buffer[term][0]), np.asarray(self._buffer[term][1]))
+                for term in query_terms if term in self._buffer
+            }
+
+        if not doc_count or top_k < 1:
+            return []
+
+        scores = np.zeros(len(lengths), dtype=np.float32)
+        length_norm = self.k1 * (1 - self.b + self.b * lengths / max(average_length, 1.0))
+
+        for term, weight in query_terms.items():
+            term_postings = [segment.postings(term) for segment in segments]
+            term_postings.append(buffered.get(term))
+            term_postings = [postings for postings in term_postings if postings is not None]
+            if not term_postings:
+                continue
+
+            doc_freq = sum(len(doc_ids) for doc_ids, _ in term_postings)
+            idf = math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+            if idf <= 0:
+                continue
+
+            for doc_ids, frequencies in term_postings:
+                # Doc IDs are unique within a posting list, so fancy-index += is safe
+                frequencies = frequencies.astype(np.float32)
+                scores[doc_ids] += (weight * idf) * frequencies * (self.k1 + 1) / (
+                    frequencies + length_norm[doc_ids]
+                )
+
+        scores[~live[:len(scores)]] = 0
+        matches = np.flatnonzero(scores > 0)
+        if not len(matches):
+            return []
+
+        if len(matches) > top_k:
+            matches = matches[np.argpartition(-scores[matches], top_k - 1)[:top_k]]
+        matches = matches[np.argsort(-scores[matches], kind='stable')]
+
+        return self._fetch([int(doc_id) for doc_id in matches], scores)
+
+    def _fetch(self, doc_ids: List[int], scores: np.ndarray) -> List[Dict]:
+        placeholders = ','.join('?' * len(doc_ids))
+        with self._lock:
+            rows = self._db.execute(
+                f"""
+                SELECT doc_id, source, filename, skills, substr(text, 1, 300), indexed_at
+                FROM documents WHERE doc_id IN ({placeholders})
+                """,
+                doc_ids
+            ).fetchall()
+
+        by_id = {row[0]: row for row in rows}
+        results = []
+        for doc_id in doc_ids:
+            row = by_id.get(doc_id)
+            if row is None:
+                continue
+            results.append({
+                'id': doc_id,
+                'score': round(float(scores[doc_id]), 4),
+                'source': row[1],
+                'filename': row[2],
+                'skills': json.loads(row[3]),
+                'preview': row[4],
+                'indexed_at': row[5]
+            })
+        return results
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def stats(self) -> Dict:
+        """
+        Get document, segment and buffer counts
+        """
+        with self._lock:
+            return {
+                'documents': self._live_count,
+                'deleted': self._deleted_count,
+                'segments': len(self._segments),
+                'buffered_documents': self._buffer_docs,
+                'average_length': round(self._total_length / self._live_count, 1) if self._live_count else 0.0
+            }
+
+    def close(self):
+        """
+        Flush buffered documents and close the document store
+        """
+        with self._lock:
+            self._flush_locked()
+            self._db.close()
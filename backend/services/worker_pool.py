@@ -0,0 +1,152 @@
+"""
+Worker Pool Service
+Runs CPU-bound parsing and NLP work off the event loop in a managed process pool
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional
+
+
+class WorkerPoolBusy(Exception):
+    """
+    Raised when the pool queue is full and a task is rejected
+    """
+
+
+class WorkerPoolTimeout(Exception):
+    """
+    Raised when a task does not finish within its timeout
+    """
+
+
+class AnalysisWorkerPool:
+    """
+    Bounded process pool for CPU-bound analysis tasks
+
+    Tasks are submitted from async endpoints and awaited without blocking the
+    event loop. The number of in-flight tasks is capped at
+    ``max_workers + max_queue``; anything beyond that is rejected immediately
+    with WorkerPoolBusy instead of piling up behind slow requests. A task
+    that timed out keeps its slot until it really finishes, since a running
+    task cannot be interrupted and still occupies its worker.
+
+    With ``max_workers=0`` tasks run in a small in-process thread pool, which
+    is convenient for development with ``--reload``.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int = 64,
+        timeout: float = 30.0,
+        initializer: Optional[Callable] = None,
+        start_method: str = 'spawn'
+    ):
+        self.max_workers = max(0, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.initializer = initializer
+        self.start_method = start_method
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        # Slots are released from executor threads when tasks finish
+        self._in_flight_lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return max(self.max_workers, 1) + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self, warmup: Optional[Callable] = None) -> List[Future]:
+        """
+        Create the executor and optionally warm up each worker
+
+        Returns:
+            Futures of the warm-up tasks (one per worker), to wait for readiness
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+
+        if warmup is None:
+            return []
+        return [self._executor.submit(warmup) for _ in range(max(self.max_workers, 1))]
+
+    def shutdown(self):
+        """
+        Stop the executor, cancelling queued tasks
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _create_executor(self) -> Executor:
+        if self.max_workers == 0:
+            return ThreadPoolExecutor(max_workers=2, initializer=self.initializer)
+
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=self.initializer
+        )
+
+    def _restart(self, broken: Executor):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = self._create_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run a picklable function in the pool and await its result
+
+        Raises:
+            WorkerPoolBusy: If the queue is full
+            WorkerPoolTimeout: If the task exceeds its timeout
+        """
+        with self._in_flight_lock:
+            if self._in_flight >= self.capacity:
+                raise WorkerPoolBusy(
+                    f"Analysis queue is full ({self._in_flight} tasks in flight)"
+                )
+            self._in_flight += 1
+
+        if self._executor is None:
+            self.start()
+
+        executor = self._executor
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=timeout if timeout is not None else self.timeout
+            )
+        except asyncio.TimeoutError:
+            # Queued tasks are dropped; a running task cannot be interrupted
+            # and keeps its slot until it finishes
+            future.cancel()
+            raise WorkerPoolTimeout("Analysis timed out")
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+
+    def _release_slot(self, future: Optional[Future] = None):
+        with self._in_flight_lock:
+            self._in_flight -= 1
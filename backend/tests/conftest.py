@@ -0,0 +1,11 @@
+"""
+Test configuration: run from the backend directory with ``python -m pytest``
+"""
+
+import os
+import sys
+
+# Analysis tasks run in-process, so tests need no worker processes
+os.environ.setdefault("ANALYSIS_WORKERS", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,27 @@
+"""
+Archive uploads are admitted in their own class, apart from single uploads
+"""
+
+import main
+
+
+def scope(path: str, content_length: int = 1024 * 1024) -> dict:
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(b"content-length", str(content_length).encode())],
+    }
+
+
+def test_archive_uploads_do_not_slow_down_parse_estimates():
+    archive, _ = main.classify_admission(scope("/upload-archive"))
+    parse, _ = main.classify_admission(scope("/upload-resume"))
+    assert archive.name == "archive"
+    assert parse.name == "parse"
+
+    service_time = parse.service_time
+    for _ in range(20):
+        archive.active += 1
+        archive.release(600.0)
+    assert parse.service_time == service_time
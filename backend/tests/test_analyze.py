@@ -0,0 +1,84 @@
+"""
+/analyze: ETag and 304 responses, and identical concurrent analyses coalesced into one
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks.corpus import CorpusGenerator
+from utils.metrics import StageTimer
+
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def analyze_body(seed: int) -> dict:
+    generator = CorpusGenerator(seed=seed)
+    return {"resume_text": generator.resume(0, words=150), "job_description": generator.job_description(0)}
+
+
+def test_matching_etag_gets_304_with_request_headers(client):
+    body = analyze_body(21)
+    first = client.post("/analyze", json=body)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    not_modified = client.post(
+        "/analyze", json=body, headers={"If-None-Match": etag, "X-Debug-Timing": "1"}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert "total;dur=" in not_modified.headers["server-timing"]
+
+    for if_none_match in (f"W/{etag}", f'"other", {etag}', "*"):
+        assert client.post("/analyze", json=body, headers={"If-None-Match": if_none_match}).status_code == 304
+
+
+def test_other_etag_gets_full_response(client):
+    body = analyze_body(22)
+    first = client.post("/analyze", json=body)
+
+    changed = client.post("/analyze", json=body, headers={"If-None-Match": '"stale"'})
+    assert changed.status_code == 200
+    assert changed.json() == first.json()
+    assert changed.headers["etag"] == first.headers["etag"]
+
+    other = client.post("/analyze", json=analyze_body(23))
+    assert other.headers["etag"] != first.headers["etag"]
+
+
+def test_identical_concurrent_analyses_run_once(monkeypatch):
+    calls = []
+
+    async def run_in_pool(func, *args, timeout=None):
+        calls.append(args)
+        # Long enough for every request to find the analysis in flight
+        await asyncio.sleep(0.2)
+        return await asyncio.to_thread(func, *args)
+
+    monkeypatch.setattr(main, "run_in_pool", run_in_pool)
+    monkeypatch.setattr(main, "analysis_result_cache", None)
+
+    body = analyze_body(24)
+    # Differences the cleaner normalizes away share the analysis too
+    requests = [
+        main.AnalyzeRequest(**body),
+        main.AnalyzeRequest(**body),
+        main.AnalyzeRequest(resume_text=body["resume_text"].replace(" ", "  "), job_description=body["job_description"])
+    ]
+
+    async def analyze_all():
+        return await asyncio.gather(*(main.process_analysis(request, StageTimer()) for request in requests))
+
+    results = asyncio.run(analyze_all())
+    assert len(calls) == 1
+    assert len({etag for _, etag in results}) == 1
+    assert all(analysis == results[0][0] for analysis, _ in results)
+    assert len(main.analysis_flights) == 0
@@ -0,0 +1,173 @@
+"""
+/upload-archive: resumes streamed from the spooled upload, with bad, oversized and oddly named members reported per file
+"""
+
+import io
+import json
+import tempfile
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks.corpus import CorpusGenerator
+from services import pipeline
+
+
+def build_zip(members: dict, compression: int = zipfile.ZIP_DEFLATED) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as archive:
+        for name, content in members.items():
+            archive.writestr(zipfile.ZipInfo(name), content, compress_type=compression)
+    return buffer.getvalue()
+
+
+def upload(client: TestClient, archive: bytes, **data) -> list:
+    response = client.post("/upload-archive", files={"file": ("batch.zip", archive, "application/zip")}, data=data)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_resumes_are_extracted_like_single_uploads(client):
+    generator = CorpusGenerator(seed=81)
+    resumes = {"batch/jane.pdf": generator.pdf(0), "batch/2024/march/john.docx": generator.docx(1)}
+    members = {
+        **resumes,
+        "batch/notes.txt": b"not a resume",
+        "batch/": b"",
+        "__MACOSX/batch/._jane.pdf": b"metadata",
+        "batch/.DS_Store": b"metadata",
+    }
+
+    lines = upload(client, build_zip(members), include_text="true")
+    summary = lines.pop()
+    assert {key: summary[key] for key in ("done", "files", "succeeded", "failed")} == \
+        {"done": True, "files": 3, "succeeded": 2, "failed": 1}
+    results = {line["filename"]: line for line in lines}
+    assert set(results) == {"batch/jane.pdf", "batch/2024/march/john.docx", "batch/notes.txt"}
+
+    assert results["batch/notes.txt"]["success"] is False
+    assert results["batch/notes.txt"]["status_code"] == 400
+
+    for name, content in resumes.items():
+        single = client.post("/upload-resume", files={"file": (name.rsplit("/", 1)[1], content)}).json()
+        assert results[name]["success"] is True
+        assert results[name]["extracted_text"] == single["extracted_text"]
+        assert results[name]["word_count"] == single["word_count"]
+
+    # Without include_text, lines carry only the text statistics
+    assert all("extracted_text" not in line for line in upload(client, build_zip(resumes)))
+
+
+def test_member_paths_are_only_names(client, tmp_path, monkeypatch):
+    # Nothing is unpacked, so paths escaping the upload directory are harmless
+    monkeypatch.chdir(tmp_path)
+    generator = CorpusGenerator(seed=82)
+    names = ["../../escape.pdf", "/etc/absolute.pdf", "a/../../b/c.docx", "deep/" * 20 + "resume.pdf"]
+    members = {name: generator.docx(index) if name.endswith(".docx") else generator.pdf(index)
+               for index, name in enumerate(names)}
+
+    lines = upload(client, build_zip(members))
+    assert lines.pop()["succeeded"] == len(names)
+    assert sorted(line["filename"] for line in lines) == sorted(names)
+    assert list(tmp_path.iterdir()) == []
+    assert not (tmp_path.parent / "escape.pdf").exists()
+
+
+def test_zip_bomb_member_is_rejected(client, monkeypatch):
+    # 50MB of zeros compresses to about 50KB
+    bomb = b"\0" * (10 * main.MAX_FILE_SIZE)
+    archive = build_zip({"bomb.pdf": bomb, "ok.pdf": CorpusGenerator(seed=83).pdf(0)})
+    assert len(archive) < main.MAX_FILE_SIZE // 10
+
+    reads = []
+    read_archive_member = main.read_archive_member
+    monkeypatch.setattr(main, "read_archive_member", lambda archive, info: reads.append(info.filename) or
+                        read_archive_member(archive, info))
+
+    lines = upload(client, archive)
+    results = {line["filename"]: line for line in lines[:-1]}
+    assert results["bomb.pdf"]["success"] is False
+    assert results["bomb.pdf"]["status_code"] == 400
+    assert "exceeds" in results["bomb.pdf"]["error"]
+    assert results["ok.pdf"]["success"] is True
+    # Rejected on the size in its header, before anything was inflated
+    assert reads == ["ok.pdf"]
+
+
+def test_decompression_stops_at_the_size_limit(monkeypatch):
+    # The header is only a claim; the data read is capped on its own
+    content = b"%PDF" + b"\0" * 4096
+    archive = zipfile.ZipFile(io.BytesIO(build_zip({"resume.pdf": content})))
+    monkeypatch.setattr(main, "MAX_FILE_SIZE", 1024)
+    with pytest.raises(main.HTTPException) as error:
+        main.read_archive_member(archive, archive.getinfo("resume.pdf"))
+    assert error.value.status_code == 400
+
+
+def test_over_limit_archives_are_rejected(client, monkeypatch):
+    monkeypatch.setattr(main, "MAX_ARCHIVE_FILES", 2)
+    members = {f"r{index}.pdf": b"%PDF" for index in range(3)}
+    response = client.post("/upload-archive", files={"file": ("batch.zip", build_zip(members))})
+    assert response.status_code == 400
+    assert "Too many files" in response.json()["detail"]
+
+    # Oversized archives are turned away on Content-Length, before parsing
+    response = client.post(
+        "/upload-archive",
+        content=b"not multipart",
+        headers={"content-type": "multipart/form-data; boundary=b", "content-length": str(main.MAX_ARCHIVE_SIZE * 2)}
+    )
+    assert response.status_code == 413
+
+    assert client.post("/upload-archive", files={"file": ("batch.zip", b"not a zip")}).status_code == 400
+    assert client.post("/upload-archive", files={"file": ("batch.tar", build_zip(members))}).status_code == 400
+
+
+def test_archive_is_read_from_the_spooled_upload(client, monkeypatch):
+    opened = []
+    zip_file = zipfile.ZipFile
+
+    def recording_zip_file(spool, *args, **kwargs):
+        opened.append(spool)
+        return zip_file(spool, *args, **kwargs)
+
+    monkeypatch.setattr(main.zipfile, "ZipFile", recording_zip_file)
+    generator = CorpusGenerator(seed=84)
+    # Stored uncompressed, so the upload is past Starlette's 1MB spooling threshold
+    members = {f"r{index}.pdf": generator.pdf(index, pages=40) for index in range(8)}
+    archive = build_zip(members, zipfile.ZIP_STORED)
+    assert len(archive) > 1024 * 1024
+
+    assert upload(client, archive)[-1]["succeeded"] == 8
+    # Other archives opened are in-memory documents, such as DOCX files
+    (spool,) = [opened_file for opened_file in opened if isinstance(opened_file, tempfile.SpooledTemporaryFile)]
+    assert spool._rolled and spool.closed
+
+
+def test_resumes_are_indexed_through_the_worker_pool(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "TALENT_INDEX_DIR", str(tmp_path))
+    tasks = []
+    run = main.worker_pool.run
+
+    async def recording_run(func, *args, **kwargs):
+        tasks.append(func)
+        return await run(func, *args, **kwargs)
+
+    monkeypatch.setattr(main.worker_pool, "run", recording_run)
+    generator = CorpusGenerator(seed=85)
+    members = {f"r{index}.pdf": generator.pdf(index) for index in range(3)}
+    with TestClient(main.app) as client:
+        assert upload(client, build_zip(members))[-1]["succeeded"] == 3
+        # Indexing finishes before the summary line
+        assert len(main.talent_index) == 3
+        assert tasks.count(pipeline.prepare_index_document) == 3
+    monkeypatch.setattr(main, "talent_index", None)
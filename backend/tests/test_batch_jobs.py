@@ -0,0 +1,84 @@
+"""
+Batch jobs rank chunk by chunk; the merged result must equal a single /rank call
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks.corpus import CorpusGenerator
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Tiny chunks, so even a small batch is split and merged
+    monkeypatch.setattr(main, "BATCH_JOB_CHUNK_SIZE", 2)
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def wait_for_job(client: TestClient, job_id: str, timeout: float = 120) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/batch-jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed", "cancelled"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"Batch job {job_id} did not finish within {timeout}s")
+
+
+def test_chunked_job_equals_rank(client):
+    generator = CorpusGenerator(seed=7)
+    resumes = [
+        {"id": f"c{index}", "resume_text": generator.resume(index, words=150)}
+        for index in range(7)
+    ]
+    resumes[3]["resume_text"] = "too short"
+    body = {"job_description": generator.job_description(0), "resumes": resumes, "top_k": 7}
+
+    expected = client.post("/rank", json=body).json()
+
+    submitted = client.post("/batch-jobs", json=body)
+    assert submitted.status_code == 202
+    assert submitted.json()["total_candidates"] == len(resumes)
+
+    job = wait_for_job(client, submitted.json()["job_id"])
+    assert job["status"] == "completed"
+
+    result = job["result"]
+    assert result["results"] == expected["results"]
+    assert result["skipped"] == expected["skipped"]
+    assert result["ranked_candidates"] == expected["ranked_candidates"]
+
+
+def test_batch_id_is_tied_to_its_job_description(client):
+    generator = CorpusGenerator(seed=8)
+    resumes = [{"id": "c0", "resume_text": generator.resume(0, words=150)}]
+    first = client.post("/rank", json={"job_description": generator.job_description(0), "resumes": resumes}).json()
+    batch_id = first["batch_id"]
+
+    same = {"job_description": generator.job_description(0), "resumes": resumes, "batch_id": batch_id}
+    assert client.post("/rank", json=same).status_code == 200
+
+    other = {"job_description": generator.job_description(1), "resumes": resumes, "batch_id": batch_id}
+    assert client.post("/rank", json=other).status_code == 409
+    assert client.post("/batch-jobs", json=other).status_code == 409
+
+
+def test_duplicate_candidate_ids_merge_like_rank(client):
+    generator = CorpusGenerator(seed=9)
+    # The same ID on different resumes, within a chunk and across chunks
+    resumes = [
+        {"id": "dup" if index in (0, 1, 4) else f"c{index}", "resume_text": generator.resume(index, words=150)}
+        for index in range(6)
+    ]
+    body = {"job_description": generator.job_description(1), "resumes": resumes, "top_k": 6}
+
+    expected = client.post("/rank", json=body).json()
+
+    job = wait_for_job(client, client.post("/batch-jobs", json=body).json()["job_id"])
+    assert job["status"] == "completed"
+    assert job["result"]["results"] == expected["results"]
+    assert [result["id"] for result in job["result"]["results"]].count("dup") == 3
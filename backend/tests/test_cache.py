@@ -0,0 +1,60 @@
+"""
+Content hashes and the disk cache backend
+"""
+
+import os
+
+import pytest
+
+from utils.cache import DiskCacheBackend, content_hash
+from utils.text_cleaner import TextCleaner
+
+
+def directory_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def test_disk_cache_stays_under_limit_without_scanning_every_write(tmp_path, monkeypatch):
+    backend = DiskCacheBackend(str(tmp_path), max_bytes=100_000)
+    scans = []
+    evict = backend._evict
+    monkeypatch.setattr(backend, "_evict", lambda: scans.append(1) or evict())
+
+    for index in range(1000):
+        backend.set(f"key{index}", "x" * 500)
+
+    assert directory_size(str(tmp_path)) <= 100_000
+    assert len(scans) < 100
+    assert backend.get("key999") == "x" * 500
+    assert backend.get("key0") is None
+
+
+def test_disk_cache_tracks_replaced_and_expired_entries(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path), max_bytes=100_000)
+    backend.set("key", "x" * 500)
+    backend.set("key", "x" * 50)
+    backend.set("expired", "x" * 500, ttl=-1)
+    assert backend.get("expired") is None
+
+    assert backend._total_bytes == directory_size(str(tmp_path))
+    assert DiskCacheBackend(str(tmp_path))._total_bytes == directory_size(str(tmp_path))
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Python \u2014 developer\r\n\r\n\r\nAWS", "Python - developer\n\nAWS"),
+    ("Senior\tengineer\xa0 with  Go", "Senior engineer with Go"),
+    ("Led\x0cteams\u2028of 5", "Led teams of 5"),
+])
+def test_content_hash_matches_when_cleaned_text_matches(first, second):
+    cleaner = TextCleaner()
+    assert cleaner.clean_text(first) == cleaner.clean_text(second)
+    assert content_hash(first) == content_hash(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Python developer", "python developer"),
+    ("Skills\nPython", "Skills Python"),
+    ("C++ and C#", "C and C"),
+])
+def test_content_hash_differs_when_cleaned_text_differs(first, second):
+    assert content_hash(first) != content_hash(second)
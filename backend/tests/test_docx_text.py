@@ -0,0 +1,135 @@
+"""
+Streaming DOCX extraction gives python-docx's text, with tables in document order
+"""
+
+import io
+import zipfile
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_BREAK
+
+from benchmarks.corpus import CorpusGenerator
+from services.resume_parser import ResumeParser
+from utils import docx_text
+
+
+def python_docx_text(content: bytes) -> str:
+    return ResumeParser(docx_mode="python-docx").extract_document(content, ".docx")["text"]
+
+
+def save(document) -> bytes:
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def with_body(content: bytes, body_xml: str) -> bytes:
+    # Replace the body of a DOCX written by python-docx with hand-written XML
+    source = zipfile.ZipFile(io.BytesIO(content))
+    document_xml = source.read("word/document.xml").decode()
+    start = document_xml.index("<w:body>") + len("<w:body>")
+    end = document_xml.index("</w:body>")
+    document_xml = document_xml[:start] + body_xml + document_xml[end:]
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            data = document_xml.encode() if info.filename == "word/document.xml" else source.read(info)
+            target.writestr(info, data)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("seed, pages", [(91, 1), (92, 3), (93, 10)])
+def test_generated_resumes_match_python_docx(seed, pages):
+    # Their skills table is the last block, where python-docx puts every table
+    content = CorpusGenerator(seed=seed).docx(0, pages=pages)
+    assert docx_text.extract_docx_text(content) == python_docx_text(content)
+
+
+def test_runs_tabs_and_breaks_match_python_docx():
+    document = Document()
+    paragraph = document.add_paragraph("Senior ")
+    paragraph.add_run("Backend").bold = True
+    paragraph.add_run(" Engineer")
+    # Tab stops are paragraph properties, not characters
+    paragraph.paragraph_format.tab_stops.add_tab_stop(914400)
+    paragraph.add_run("\t2019 - 2024")
+    run = document.add_paragraph("Line one").add_run()
+    run.add_break(WD_BREAK.LINE)
+    run.add_text("Line two")
+    document.add_paragraph("")
+    document.add_paragraph("   ")
+    document.add_heading("Skills", level=2)
+    document.add_paragraph("Python, SQL, Docker", style="List Bullet")
+    table = document.add_table(rows=2, cols=3)
+    for row in range(2):
+        for column in range(3):
+            table.cell(row, column).text = f" cell {row}.{column} " if column != 1 else ""
+
+    content = save(document)
+    text = docx_text.extract_docx_text(content)
+    assert text == python_docx_text(content)
+    assert text.split("\n")[:3] == ["Senior Backend Engineer\t2019 - 2024", "Line one", "Line two"]
+
+
+def test_tables_stay_in_document_order():
+    document = Document()
+    document.add_paragraph("Experience")
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Acme"
+    table.cell(0, 1).text = "2020"
+    document.add_paragraph("Education")
+    content = save(document)
+
+    assert docx_text.extract_docx_text(content) == "Experience\nAcme | 2020\nEducation"
+    # python-docx puts tables after all paragraphs; the lines are the same
+    assert python_docx_text(content) == "Experience\nEducation\nAcme | 2020"
+
+
+def test_merged_cells_are_emitted_once():
+    document = Document()
+    table = document.add_table(rows=2, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 1)).text = "Merged"
+    table.cell(0, 2).text = "Right"
+    table.cell(1, 0).text = "A"
+    table.cell(1, 1).text = "B"
+    content = save(document)
+
+    assert docx_text.extract_docx_text(content) == "Merged | Right\nA | B"
+    # python-docx repeats a merged cell for every grid column it spans
+    assert python_docx_text(content) == "Merged | Merged | Right\nA | B"
+
+
+def test_deleted_text_text_box_fallbacks_and_nested_tables():
+    body = """
+        <w:p><w:r><w:t>Kept</w:t></w:r><w:del><w:r><w:delText>Deleted</w:delText></w:r></w:del></w:p>
+        <w:p><w:r><mc:AlternateContent>
+            <mc:Choice Requires="wps"><w:drawing><w:txbxContent>
+                <w:p><w:r><w:t>In a text box</w:t></w:r></w:p>
+            </w:txbxContent></w:drawing></mc:Choice>
+            <mc:Fallback><w:pict><w:txbxContent>
+                <w:p><w:r><w:t>In a text box</w:t></w:r></w:p>
+            </w:txbxContent></w:pict></mc:Fallback>
+        </mc:AlternateContent></w:r></w:p>
+        <w:tbl><w:tr>
+            <w:tc><w:p><w:r><w:t>Outer</w:t></w:r></w:p>
+                <w:tbl><w:tr><w:tc><w:p><w:r><w:t>Inner</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+            </w:tc>
+            <w:tc><w:p><w:r><w:t>Next</w:t></w:r></w:p></w:tc>
+        </w:tr></w:tbl>
+    """
+    content = with_body(save(Document()), body)
+    assert docx_text.extract_docx_text(content) == "Kept\nIn a text box\nOuter\nInner | Next"
+
+
+def test_parser_falls_back_to_python_docx(monkeypatch):
+    content = CorpusGenerator(seed=94).docx(0)
+
+    def broken(source):
+        source.read(100)
+        raise ValueError("malformed XML")
+
+    monkeypatch.setattr(docx_text, "extract_docx_text", broken)
+    document = ResumeParser(docx_mode="stream").extract_document(content, ".docx")
+    assert document["text"] == python_docx_text(content)
@@ -0,0 +1,33 @@
+"""
+The Vercel functions ship copies of backend modules; they must not drift apart
+"""
+
+import os
+
+import pytest
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND_API_DIR = os.path.join(os.path.dirname(BACKEND_DIR), 'frontend', 'api')
+
+# Backend module and its copy among the Vercel functions
+COPIES = [
+    ('utils/skill_matcher.py', '_skill_matcher.py'),
+    ('utils/docx_text.py', '_docx_text.py'),
+]
+
+
+def code_after_docstring(path: str) -> str:
+    # The module docstrings differ: the copies say where they come from
+    with open(path, 'r', encoding='utf-8') as source_file:
+        source = source_file.read()
+    assert source.startswith('"""'), path
+    return source.split('"""', 2)[2]
+
+
+@pytest.mark.skipif(not os.path.isdir(FRONTEND_API_DIR), reason="frontend is not checked out")
+@pytest.mark.parametrize("backend_path, copy_name", COPIES)
+def test_frontend_copy_matches_backend(backend_path, copy_name):
+    assert code_after_docstring(os.path.join(FRONTEND_API_DIR, copy_name)) == \
+        code_after_docstring(os.path.join(BACKEND_DIR, backend_path)), \
+        f"frontend/api/{copy_name} differs from backend/{backend_path}; copy the change over"
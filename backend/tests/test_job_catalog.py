@@ -0,0 +1,93 @@
+"""
+Job catalog: vectorized matches equal scalar scoring, and /catalog/match runs in the worker pool
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks.corpus import CorpusGenerator
+from services import pipeline
+from services.job_catalog import JobCatalog
+from services.matching import analyze_keywords, compare_skills
+from services.scoring_engine import ScoringEngine
+
+
+def test_match_equals_scalar_scores():
+    generator = CorpusGenerator(seed=31)
+    profiles = pipeline.profile_jobs([generator.job_description(index) for index in range(30)])
+    catalog = JobCatalog()
+    catalog.upsert([{"id": f"j{index}", "title": None, **profile} for index, profile in enumerate(profiles)])
+    matrices = catalog.refresh()
+
+    resume = pipeline.profile_resume(generator.resume(0, words=200))
+    resume.pop("stage_timings")
+    results = {result["job_id"]: result for result in catalog.match(resume, top_k=30)}
+    assert len(results) == 30
+
+    scoring_engine = ScoringEngine()
+    resume_vector = matrices.engine.transform([resume["cleaned_text"]]).T
+    for index, profile in enumerate(profiles):
+        similarity = float((matrices.tfidf[index] @ resume_vector).toarray()[0, 0] * 100)
+        keyword_analysis = analyze_keywords(resume["keywords"], profile["keywords"])
+        skill_gap = compare_skills(set(resume["skills"]), set(profile["skills"]))
+        expected = scoring_engine.calculate_scores(
+            keyword_analysis["match_ratio"], similarity, skill_gap["match_ratio"], resume["sections_found"]
+        )
+        result = results[f"j{index}"]
+        assert result["overall_score"] == round(expected["overall_score"], 1)
+        assert result["grade"] == expected["grade"]
+        assert result["matched_keywords"] == keyword_analysis["matched"]
+        assert result["matched_skills"] == skill_gap["matched_skills"]
+
+    ranked = sorted(results.values(), key=lambda result: result["rank"])
+    assert all(first["overall_score"] >= second["overall_score"] for first, second in zip(ranked, ranked[1:]))
+    catalog.close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    tasks = []
+    run = main.worker_pool.run
+
+    async def recording_run(func, *args, **kwargs):
+        tasks.append(func)
+        return await run(func, *args, **kwargs)
+
+    monkeypatch.setattr(main.worker_pool, "run", recording_run)
+    with TestClient(main.app) as test_client:
+        test_client.pool_tasks = tasks
+        yield test_client
+
+
+def match(client: TestClient, resume: str, top_k: int = 3) -> list:
+    response = client.post("/catalog/match", json={"resume_text": resume, "top_k": top_k})
+    assert response.status_code == 200
+    return [result["job_id"] for result in response.json()["results"]]
+
+
+def test_catalog_match_in_worker_pool(client):
+    generator = CorpusGenerator(seed=32)
+    resume = generator.resume(0, words=200)
+    jobs = [{"id": f"j{index}", "title": f"Job {index}", "description": generator.job_description(index)}
+            for index in range(10)]
+    assert client.post("/catalog/jobs", json={"jobs": jobs}).json()["total_jobs"] == 10
+
+    client.pool_tasks.clear()
+    best = match(client, resume)
+    assert client.pool_tasks == [pipeline.match_catalog]
+
+    # Removed jobs are left out at once, before the rebuild
+    assert client.delete(f"/catalog/jobs/{best[0]}").json()["success"]
+    assert best[0] not in match(client, resume, top_k=10)
+
+    # New jobs are matched once the worker has rebuilt its matrices
+    client.post("/catalog/jobs", json={"jobs": [{"id": "same", "title": None, "description": resume}]})
+    deadline = time.monotonic() + 30
+    while match(client, resume)[0] != "same":
+        assert time.monotonic() < deadline, "New job was never matched"
+        time.sleep(0.1)
+
+    assert client.post("/catalog/match", json={"resume_text": resume, "top_k": 0}).status_code == 400
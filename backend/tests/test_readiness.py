@@ -0,0 +1,41 @@
+"""
+/ready reports the background warm-up, and a failed warm-up is logged as an error
+"""
+
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def wait_for_warm_up(timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while not main.warm_up_task.done():
+        assert time.monotonic() < deadline, "Warm-up did not finish"
+        time.sleep(0.05)
+
+
+def test_ready_after_warm_up():
+    with TestClient(main.app) as client:
+        wait_for_warm_up()
+        assert client.get("/ready").json() == {"status": "ready"}
+
+
+def test_failed_warm_up_is_logged_and_reported(monkeypatch, caplog):
+    def warm_up(job_catalog_directory=None):
+        raise RuntimeError("model not installed")
+
+    monkeypatch.setattr(main.pipeline, "warm_up", warm_up)
+    monkeypatch.setattr(main, "warm_up_error", None)
+    with caplog.at_level(logging.ERROR, logger="uvicorn.error"):
+        with TestClient(main.app) as client:
+            wait_for_warm_up()
+            response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"status": "failed", "detail": "model not installed"}
+    record = next(record for record in caplog.records if record.name == "uvicorn.error")
+    assert record.levelno == logging.ERROR
+    assert "model not installed" in record.exc_text
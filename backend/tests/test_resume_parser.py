@@ -0,0 +1,115 @@
+"""
+PDF extraction: pdfium fast path with pdfplumber fallback for garbled pages, within page and time budgets
+"""
+
+import pytest
+
+from benchmarks.corpus import CorpusGenerator
+from services.resume_parser import ResumeParser
+from utils import pdf_text
+
+
+@pytest.fixture(scope="module")
+def pdf() -> bytes:
+    return CorpusGenerator(seed=3).pdf(0, pages=5)
+
+
+@pytest.mark.parametrize("pdf_mode", ["fast", "accurate"])
+def test_whole_pdf_within_budget(pdf, pdf_mode):
+    document = ResumeParser(pdf_mode=pdf_mode, time_budget=60).extract_document(pdf, ".pdf")
+    assert document["page_count"] == 5
+    assert not document["truncated"]
+    assert document["text"]
+
+
+@pytest.mark.parametrize("pdf_mode", ["fast", "accurate"])
+def test_no_page_started_after_budget(pdf, pdf_mode):
+    document = ResumeParser(pdf_mode=pdf_mode, time_budget=0).extract_document(pdf, ".pdf")
+    assert document["page_count"] == 5
+    assert document["truncated"]
+    assert document["text"] == ""
+
+
+@pytest.mark.skipif(not pdf_text.has_fast_path(), reason="pdfium is not installed")
+def test_extract_pages_fast_stops_at_budget(pdf):
+    assert pdf_text.extract_pages_fast(pdf, range(5), budget_seconds=0) == [None] * 5
+    assert None not in pdf_text.extract_pages_fast(pdf, range(5), budget_seconds=60)
+
+
+@pytest.mark.parametrize("text, garbled", [
+    ("Senior engineer with python", False),
+    ("", True),
+    ("  \n ", True),
+    ("Skills (cid:12)(cid:7) python", True),
+    ("Skills � python", True),
+    ("•• ·· ‐‐ ** || a1", True),
+])
+def test_looks_garbled(text, garbled):
+    assert pdf_text.looks_garbled(text) == garbled
+
+
+def layout_text(pdf: bytes, pages: range) -> list:
+    return pdf_text.extract_pages_layout(pdf, pages)
+
+
+@pytest.mark.skipif(not pdf_text.has_fast_path(), reason="pdfium is not installed")
+def test_fast_path_reads_the_same_words(pdf):
+    fast = ResumeParser(pdf_mode="fast", parallel_processes=1).extract_document(pdf, ".pdf")
+    accurate = ResumeParser(pdf_mode="accurate", parallel_processes=1).extract_document(pdf, ".pdf")
+    assert fast["text"].split() == accurate["text"].split()
+
+
+@pytest.mark.skipif(not pdf_text.has_fast_path(), reason="pdfium is not installed")
+def test_garbled_pages_fall_back_to_pdfplumber(pdf, monkeypatch):
+    extract_pages_fast = pdf_text.extract_pages_fast
+    extract_pages_layout = pdf_text.extract_pages_layout
+    layout_calls = []
+
+    def garbled_fast(content, page_numbers, budget_seconds=None):
+        texts = extract_pages_fast(content, page_numbers, budget_seconds)
+        # A font without a Unicode mapping on page 2, and an empty page 4
+        texts[1] = "(cid:41)(cid:42)(cid:43)"
+        texts[3] = ""
+        return texts
+
+    def recording_layout(content, page_numbers, budget_seconds=None):
+        layout_calls.append(list(page_numbers))
+        return extract_pages_layout(content, page_numbers, budget_seconds)
+
+    monkeypatch.setattr(pdf_text, "extract_pages_fast", garbled_fast)
+    monkeypatch.setattr(pdf_text, "extract_pages_layout", recording_layout)
+
+    document = ResumeParser(pdf_mode="fast", parallel_processes=1, time_budget=60).extract_document(pdf, ".pdf")
+    assert layout_calls == [[1, 3]]
+    assert not document["truncated"]
+
+    fast_texts = extract_pages_fast(pdf, range(5))
+    layout_texts = extract_pages_layout(pdf, [1, 3])
+    expected = [fast_texts[0], layout_texts[0], fast_texts[2], layout_texts[1], fast_texts[4]]
+    assert document["text"] == "\n".join(expected)
+
+
+@pytest.mark.parametrize("pdf_mode", ["fast", "accurate"])
+def test_pages_past_max_pages_are_not_read(pdf, pdf_mode):
+    document = ResumeParser(pdf_mode=pdf_mode, max_pages=2, parallel_processes=1).extract_document(pdf, ".pdf")
+    whole = ResumeParser(pdf_mode=pdf_mode, parallel_processes=1).extract_document(pdf, ".pdf")
+    assert document["page_count"] == 5
+    assert document["truncated"]
+    assert whole["text"].startswith(document["text"])
+    assert document["text"].split() == "\n".join(layout_text(pdf, range(2))).split()
+
+
+def test_budget_runs_out_between_pages(pdf, monkeypatch):
+    # Every clock reading is one second after the previous one
+    clock = iter(range(1000))
+    monkeypatch.setattr(pdf_text.time, "monotonic", lambda: next(clock))
+    texts = pdf_text.extract_pages_layout(pdf, range(5), budget_seconds=2.5)
+    assert [text is not None for text in texts] == [True, True, False, False, False]
+
+
+def test_layout_pages_in_helper_processes_match(pdf):
+    sequential = ResumeParser(pdf_mode="accurate", parallel_processes=1).extract_document(pdf, ".pdf")
+    parallel = ResumeParser(
+        pdf_mode="accurate", parallel_processes=2, parallel_min_pages=2, time_budget=60
+    ).extract_document(pdf, ".pdf")
+    assert parallel == sequential
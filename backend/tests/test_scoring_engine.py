@@ -0,0 +1,66 @@
+"""
+Batch scoring: calculate_scores_batch equals calculate_scores for every candidate
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from services.scoring_engine import ScoringEngine
+
+
+SECTIONS = ['Skills', 'Experience', 'Education', 'Projects', 'Summary', 'Certifications', 'Achievements']
+
+PROFILES = [
+    {},
+    {'weights': {'keyword': 0.1, 'similarity': 0.6, 'skills': 0.2, 'structure': 0.1},
+     'thresholds': {'excellent': 90, 'good': 60, 'fair': 50, 'poor': 10}},
+]
+
+
+def candidates(count: int) -> list:
+    generator = random.Random(61)
+    # Edge values first: empty and perfect matches, and similarities above 100
+    rows = [(0.0, 0.0, 0.0, []), (1.0, 100.0, 1.0, SECTIONS), (1.0, 100.000001, 1.0, ['Other'])]
+    rows += [
+        (
+            generator.random(),
+            generator.uniform(0, 100),
+            generator.choice([0.0, 1.0, generator.random()]),
+            generator.sample(SECTIONS, generator.randint(0, len(SECTIONS)))
+        )
+        for _ in range(count)
+    ]
+    return rows
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_batch_equals_scalar(profile):
+    scoring_engine = ScoringEngine(**profile)
+    rows = candidates(300)
+    keyword_ratios, similarities, skills_ratios, sections_found = zip(*rows)
+
+    batch = scoring_engine.calculate_scores_batch(
+        np.array(keyword_ratios), np.array(similarities), np.array(skills_ratios),
+        scoring_engine.encode_sections(sections_found)
+    )
+    for index, row in enumerate(rows):
+        expected = scoring_engine.calculate_scores(*row)
+        for name, value in expected.items():
+            assert batch[name][index] == value, (name, row)
+
+
+def test_one_resume_broadcast_against_many():
+    scoring_engine = ScoringEngine()
+    sections_found = ['Skills', 'Experience', 'Summary']
+    similarities = np.linspace(0, 100, 11)
+
+    batch = scoring_engine.calculate_scores_batch(
+        0.5, similarities, 0.75, scoring_engine.encode_sections([sections_found])
+    )
+    for index, similarity in enumerate(similarities):
+        expected = scoring_engine.calculate_scores(0.5, similarity, 0.75, sections_found)
+        assert batch['overall_score'][index] == expected['overall_score']
+        assert batch['grade'][index] == expected['grade']
+
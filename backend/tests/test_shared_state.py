@@ -0,0 +1,77 @@
+"""
+Stores shared by several processes (pre-fork server workers) must see each other's writes
+
+Two instances opened on the same directory stand in for two processes: each
+has its own SQLite connection and its own in-memory cache.
+"""
+
+import numpy as np
+import pytest
+
+from benchmarks.corpus import CorpusGenerator
+from services import pipeline
+from services.analysis_store import COMPONENT_SCORES, AnalysisStore, BatchConflict
+from services.job_catalog import JobCatalog
+
+
+def scores(count: int, value: float) -> dict:
+    return {name: np.full(count, value) for name in COMPONENT_SCORES}
+
+
+def test_analysis_store_sees_other_writer(tmp_path):
+    writer = AnalysisStore(str(tmp_path))
+    reader = AnalysisStore(str(tmp_path))
+
+    writer.save("batch", "jd", ["c1"], scores(1, 50.0))
+    assert reader.load("batch")["candidate_ids"] == ["c1"]
+
+    writer.save("batch", "jd", ["c1", "c2"], scores(2, 70.0))
+    batch = reader.load("batch")
+    assert batch["candidate_ids"] == ["c1", "c2"]
+    assert batch["keyword_score"].tolist() == [70.0, 70.0]
+
+    writer.delete("batch")
+    assert reader.load("batch") is None
+
+
+def test_analysis_store_rejects_other_job_description(tmp_path):
+    first = AnalysisStore(str(tmp_path))
+    second = AnalysisStore(str(tmp_path))
+
+    first.save("batch", "jd-a", ["c1"], scores(1, 50.0))
+    assert second.accepts("batch", "jd-a")
+    assert not second.accepts("batch", "jd-b")
+    with pytest.raises(BatchConflict):
+        second.save("batch", "jd-b", ["c2"], scores(1, 90.0))
+    assert first.load("batch")["candidate_ids"] == ["c1"]
+
+    second.save("batch", "jd-a", ["c2"], scores(1, 90.0))
+    assert first.load("batch")["candidate_ids"] == ["c1", "c2"]
+
+
+def test_job_catalog_sees_other_writer(tmp_path):
+    generator = CorpusGenerator(seed=11)
+    descriptions = [generator.job_description(index) for index in range(3)]
+    jobs = [
+        {"id": f"j{index}", "title": None, **profile}
+        for index, profile in enumerate(pipeline.profile_jobs(descriptions))
+    ]
+    resume = pipeline.profile_resume(generator.resume(0, words=150))
+
+    writer = JobCatalog(str(tmp_path))
+    reader = JobCatalog(str(tmp_path))
+
+    writer.upsert(jobs[:2])
+    reader.refresh()
+    assert {match["job_id"] for match in reader.match(resume)} == {"j0", "j1"}
+
+    writer.upsert(jobs[2:])
+    writer.remove("j0")
+    assert len(reader) == 2
+    # Changed jobs are left out until the reader rebuilds its match features
+    assert reader.outdated
+    assert {match["job_id"] for match in reader.match(resume)} == {"j1"}
+
+    reader.refresh()
+    assert not reader.outdated
+    assert {match["job_id"] for match in reader.match(resume)} == {"j1", "j2"}
@@ -0,0 +1,63 @@
+"""
+Corpus-level TF-IDF model: saved models score like the original, and term weights are only built when used
+"""
+
+import numpy as np
+import pytest
+
+from benchmarks.corpus import CorpusGenerator
+from services.nlp_processor import NLPProcessor
+from services.similarity_engine import SimilarityEngine
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    generator = CorpusGenerator(seed=71)
+    resumes = [generator.resume(index, words=150) for index in range(20)]
+    job_descriptions = [generator.job_description(index) for index in range(5)]
+    return resumes, job_descriptions
+
+
+def test_saved_model_scores_the_same(tmp_path, corpus):
+    resumes, job_descriptions = corpus
+    engine = SimilarityEngine(max_features=2000).fit(resumes + job_descriptions)
+    engine.partial_fit(job_descriptions[:2])
+
+    path = str(tmp_path / "model.json")
+    engine.save(path)
+    loaded = SimilarityEngine.load(path)
+
+    assert loaded.version == engine.version
+    assert loaded.vocabulary_size == engine.vocabulary_size
+    assert loaded.max_features == engine.max_features and loaded.params == engine.params
+    assert (loaded.transform(resumes) != engine.transform(resumes)).nnz == 0
+    for job_description in job_descriptions:
+        assert np.array_equal(
+            loaded.similarities(resumes, job_description), engine.similarities(resumes, job_description)
+        )
+        assert loaded.term_weights(job_description) == engine.term_weights(job_description)
+
+
+def test_unsupported_format_is_rejected(tmp_path, corpus):
+    path = tmp_path / "model.json"
+    SimilarityEngine().fit(corpus[0]).save(str(path))
+    path.write_text(path.read_text().replace('"format_version": 1', '"format_version": 0'))
+    with pytest.raises(ValueError):
+        SimilarityEngine.load(str(path))
+
+
+def test_term_weights_only_with_a_model(corpus):
+    resumes, job_descriptions = corpus
+    job_description = job_descriptions[0]
+
+    # Pairwise similarity fits on each pair and never reads precomputed weights
+    pairwise = NLPProcessor()
+    assert pairwise.get_term_weights(job_description) is None
+    assert pairwise.calculate_similarity_batch(resumes, job_description, None) == \
+        [pairwise.calculate_similarity(resume, job_description) for resume in resumes]
+
+    with_model = NLPProcessor(similarity_engine=SimilarityEngine().fit(resumes + job_descriptions))
+    weights = with_model.get_term_weights(job_description)
+    assert weights
+    assert with_model.calculate_similarity_batch(resumes, job_description, weights) == \
+        with_model.calculate_similarity_batch(resumes, job_description)
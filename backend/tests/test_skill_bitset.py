@@ -0,0 +1,71 @@
+"""
+Skill bitsets: ratios and skill gaps equal the set intersections of matching.compare_skills
+"""
+
+import random
+
+import pytest
+
+from services.matching import TECH_SKILLS, compare_skills
+from services.skill_bitset import WORD_BITS, SkillVocabulary, match_ratios, popcount
+
+
+@pytest.fixture(scope="module")
+def vocabulary():
+    return SkillVocabulary(TECH_SKILLS)
+
+
+def skill_sets(vocabulary: SkillVocabulary) -> list:
+    generator = random.Random(51)
+    # Past the first word, so both words of every bitset are exercised
+    high_skill = vocabulary.skills[WORD_BITS + 5]
+    sets = [set(), {high_skill}, {vocabulary.skills[0], vocabulary.skills[-1]}, set(vocabulary.skills)]
+    sets += [set(generator.sample(vocabulary.skills, generator.randint(1, 20))) for _ in range(40)]
+    return sets
+
+
+def test_vocabulary_spans_several_words(vocabulary):
+    assert len(vocabulary) > WORD_BITS
+    assert vocabulary.words == 2
+    assert vocabulary.encode(set()).tolist() == [0, 0]
+    assert vocabulary.decode(vocabulary.encode({vocabulary.skills[WORD_BITS]})) == [vocabulary.skills[WORD_BITS]]
+
+
+def test_skill_gap_equals_compare_skills(vocabulary):
+    sets = skill_sets(vocabulary)
+    bits = vocabulary.encode_many(sets)
+    for resume_skills, resume_bits in zip(sets, bits):
+        for jd_skills, jd_bits in zip(sets, bits):
+            assert vocabulary.skill_gap(resume_bits, jd_bits) == compare_skills(resume_skills, jd_skills)
+
+
+def test_match_ratios_equal_compare_skills(vocabulary):
+    sets = skill_sets(vocabulary)
+    bits = vocabulary.encode_many(sets)
+    assert popcount(bits).tolist() == [len(skills) for skills in sets]
+
+    for index, jd_skills in enumerate(sets):
+        expected = [compare_skills(resume_skills, jd_skills)['match_ratio'] for resume_skills in sets]
+        # Many resumes against one JD, and one resume against many JDs
+        assert match_ratios(bits, bits[index]).tolist() == expected
+        assert match_ratios(bits[index], bits).tolist() == [
+            compare_skills(jd_skills, other)['match_ratio'] for other in sets
+        ]
+
+
+def test_added_skills_get_new_ids():
+    taxonomy = sorted(TECH_SKILLS)[:WORD_BITS]
+    vocabulary = SkillVocabulary(taxonomy)
+    assert vocabulary.words == 1
+    ids = dict(vocabulary._ids)
+
+    vocabulary.extend(["zig", taxonomy[0]])
+    assert {skill: vocabulary._ids[skill] for skill in ids} == ids
+    assert vocabulary._ids["zig"] == WORD_BITS
+    assert vocabulary.words == 2
+
+    # Bitsets as wide as ones built before the skill was added leave it out
+    narrow = vocabulary.encode({"zig", taxonomy[0]}, words=1)
+    assert narrow.shape == (1,)
+    assert vocabulary.decode(narrow) == [taxonomy[0]]
+    assert vocabulary.decode(vocabulary.encode({"zig", taxonomy[0]})) == sorted({"zig", taxonomy[0]})
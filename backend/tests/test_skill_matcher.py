@@ -0,0 +1,117 @@
+"""
+The Aho-Corasick skill matcher finds what the original substring scan found, minus matches inside other words
+"""
+
+import re
+
+import pytest
+
+from benchmarks.corpus import CorpusGenerator
+from services.matching import TECH_SKILLS
+from services.nlp_processor import NLPProcessor
+
+
+@pytest.fixture(scope="module")
+def nlp_processor():
+    return NLPProcessor()
+
+
+def baseline_skills(text: str) -> set:
+    # The scan NLPProcessor used before the matcher
+    text_lower = text.lower()
+    return {skill for skill in TECH_SKILLS if skill in text_lower}
+
+
+def baseline_skill_gap(resume_text: str, job_description: str) -> dict:
+    # NLPProcessor.analyze_skill_gap before the matcher
+    jd_skills = baseline_skills(job_description)
+    resume_skills = baseline_skills(resume_text)
+    matched_skills = jd_skills.intersection(resume_skills)
+    match_ratio = len(matched_skills) / len(jd_skills) if jd_skills else 1.0
+    return {
+        'required_skills': sorted(jd_skills),
+        'matched_skills': sorted(matched_skills),
+        'missing_skills': sorted(jd_skills - resume_skills),
+        'additional_skills': sorted(resume_skills - jd_skills),
+        'match_ratio': match_ratio,
+        'coverage_percentage': round(match_ratio * 100, 1)
+    }
+
+
+def word_bounded_skills(text: str) -> set:
+    # The substring scan, keeping only occurrences not glued to another word
+    # character on a side where the skill itself starts or ends with one
+    text_lower = text.lower()
+    found = set()
+    for skill in TECH_SKILLS:
+        start = r'(?<!\w)' if re.match(r'\w', skill[0]) else ''
+        end = r'(?!\w)' if re.match(r'\w', skill[-1]) else ''
+        if re.search(start + re.escape(skill) + end, text_lower):
+            found.add(skill)
+    return found
+
+
+# No skill occurs inside another word here, so both scans must agree exactly.
+# The single-letter skill "r" is inside most English words, hence the terse texts.
+SAME_AS_BASELINE = [
+    "c++",
+    "c#",
+    "C# and C++",
+    "c++, c#, node.js and .net",
+    ".NET 6 and C#",
+    "Node.js, Next.js and Vue; nodejs",
+    "python",
+    "Python, C++, Kotlin and Swift",
+    "Skills:\nPython\nSQL\nC++\nAWS",
+    "python with aws",
+    "NumPy, pandas and Flask",
+    "CI/CD on GCP and AWS",
+    "",
+]
+
+# Skills that only occur inside other words were found by the substring scan
+GLUED = [
+    ("React and MongoDB", {"r", "go"}),
+    ("JavaScript engineer", {"java", "r"}),
+    ("Oracle DBA with strong communication", {"r"}),
+    ("Express.js APIs", {"r", "api"}),
+    ("PostgreSQL and SQLite", {"r", "sql"}),
+    ("Golang and Django on Azure, Rails", {"ai", "go", "r"}),
+]
+
+
+@pytest.mark.parametrize("text", SAME_AS_BASELINE)
+def test_detect_skills_equals_baseline(nlp_processor, text):
+    assert nlp_processor.detect_skills(text) == baseline_skills(text)
+    assert nlp_processor.detect_skills(text) == word_bounded_skills(text)
+
+
+@pytest.mark.parametrize("text", SAME_AS_BASELINE)
+def test_extract_keywords_equals_baseline(nlp_processor, text):
+    if not text:
+        return
+    # Keywords other than skills come from spaCy, unchanged by the matcher
+    spacy_keywords = set(nlp_processor.extract_keywords(text, skills=set()))
+    assert set(nlp_processor.extract_keywords(text)) == spacy_keywords | baseline_skills(text)
+
+
+def test_analyze_skill_gap_equals_baseline(nlp_processor):
+    for resume_text in SAME_AS_BASELINE:
+        for job_description in SAME_AS_BASELINE[:6]:
+            assert nlp_processor.analyze_skill_gap(resume_text, job_description) == \
+                baseline_skill_gap(resume_text, job_description)
+
+
+@pytest.mark.parametrize("text, glued", GLUED)
+def test_matches_inside_words_are_dropped(nlp_processor, text, glued):
+    detected = nlp_processor.detect_skills(text)
+    assert detected == word_bounded_skills(text)
+    assert baseline_skills(text) - detected == glued
+
+
+def test_generated_corpus_matches_word_bounded_scan(nlp_processor):
+    generator = CorpusGenerator(seed=41)
+    texts = [generator.resume(index, words=300) for index in range(20)]
+    texts += [generator.job_description(index) for index in range(20)]
+    for text in texts:
+        assert nlp_processor.detect_skills(text) == word_bounded_skills(text)
@@ -0,0 +1,110 @@
+"""
+Talent index: add, search and delete, with deleted resumes purged from disk
+"""
+
+import os
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks.corpus import CorpusGenerator
+from services.talent_index import TalentIndex
+
+
+MARKER = "zanzibarquokka"
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer with python, fastapi, docker and postgresql "
+    f"experience, ideally someone who has worked on {MARKER} systems."
+)
+
+
+def index_terms(text: str) -> dict:
+    return main.pipeline.prepare_index_document(text)['terms']
+
+
+def test_add_search_delete(tmp_path):
+    index = TalentIndex(str(tmp_path), flush_docs=2)
+    generator = CorpusGenerator(seed=11)
+    texts = [generator.resume(number, words=120) for number in range(4)]
+    texts[2] += f" Built {MARKER} pipelines in python."
+
+    ids = [index.add(text, index_terms(text), f"hash{number}", "upload", f"r{number}.pdf")[0]
+           for number, text in enumerate(texts)]
+    assert index.add(texts[0], index_terms(texts[0]), "hash0", "upload")[0] == ids[0]
+    assert len(index) == 4
+
+    assert [result['id'] for result in index.search({MARKER: 1}, top_k=4)] == [ids[2]]
+    assert ids[2] in [result['id'] for result in index.search(index_terms(JOB_DESCRIPTION), top_k=4)]
+
+    assert index.delete(ids[2])
+    assert not index.delete(ids[2])
+    assert index.search({MARKER: 1}, top_k=4) == []
+    assert ids[2] not in [result['id'] for result in index.search(index_terms(JOB_DESCRIPTION), top_k=4)]
+    assert not index.contains("hash2")
+
+    row = index._db.execute(
+        "SELECT content_hash, filename, skills, terms, text FROM documents WHERE doc_id = ?", (ids[2],)
+    ).fetchone()
+    assert row == (f"deleted:{ids[2]}", None, "[]", "{}", "")
+
+    # Re-adding a deleted resume indexes it again under a new ID
+    doc_id, added = index.add(texts[2], index_terms(texts[2]), "hash2", "upload")
+    assert added and doc_id != ids[2]
+    index.close()
+
+
+def test_deleted_text_is_not_left_on_disk(tmp_path):
+    index = TalentIndex(str(tmp_path))
+    text = CorpusGenerator(seed=12).resume(0, words=120) + f" Led the {MARKER} migration."
+    doc_id, _ = index.add(text, index_terms(text), "hash", "upload", f"{MARKER}.pdf")
+    index.delete(doc_id)
+    index.close()
+
+    for name in os.listdir(tmp_path):
+        with open(os.path.join(tmp_path, name), 'rb') as stored_file:
+            assert MARKER.encode() not in stored_file.read(), name
+
+
+def test_tombstones_from_older_versions_are_purged_on_open(tmp_path):
+    index = TalentIndex(str(tmp_path))
+    text = CorpusGenerator(seed=13).resume(0, words=120) + f" {MARKER}"
+    doc_id, _ = index.add(text, index_terms(text), "hash", "upload")
+    index.flush()
+    # A tombstone written before deletes purged the row
+    index._db.execute("UPDATE documents SET deleted = 1 WHERE doc_id = ?", (doc_id,))
+    index._db.commit()
+    index.close()
+
+    reopened = TalentIndex(str(tmp_path))
+    reopened.close()
+    with sqlite3.connect(os.path.join(tmp_path, 'documents.db')) as db:
+        assert db.execute("SELECT text FROM documents WHERE doc_id = ?", (doc_id,)).fetchone() == ("",)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "TALENT_INDEX_DIR", str(tmp_path))
+    with TestClient(main.app) as test_client:
+        yield test_client
+    monkeypatch.setattr(main, "talent_index", None)
+
+
+def test_deleted_candidate_is_not_searchable(client, tmp_path):
+    resume = CorpusGenerator(seed=14).resume(0, words=150) + f" Designed {MARKER} services with python."
+    assert client.post("/analyze", json={"resume_text": resume, "job_description": JOB_DESCRIPTION}).status_code == 200
+
+    results = client.post("/search", json={"job_description": JOB_DESCRIPTION}).json()["results"]
+    assert len(results) == 1
+    candidate_id = results[0]["id"]
+
+    assert client.delete(f"/candidates/{candidate_id}").json() == {"success": True, "id": candidate_id}
+    assert client.delete(f"/candidates/{candidate_id}").status_code == 404
+    assert client.post("/search", json={"job_description": JOB_DESCRIPTION}).json()["results"] == []
+
+    text = main.talent_index._db.execute(
+        "SELECT text FROM documents WHERE doc_id = ?", (candidate_id,)
+    ).fetchone()[0]
+    assert text == ""
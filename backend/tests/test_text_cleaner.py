@@ -0,0 +1,38 @@
+"""
+Golden tests for TextCleaner: fixed inputs and their expected cleaned text
+
+The expected outputs in fixtures/text_cleaner.json were produced by the
+original regex-based cleaner; the faster single-pass cleaner must keep them.
+"""
+
+import json
+import os
+
+import pytest
+
+from utils.text_cleaner import TextCleaner
+
+
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "text_cleaner.json"), encoding="utf-8") as fixture_file:
+    FIXTURES = json.load(fixture_file)
+
+
+@pytest.fixture(scope="module")
+def cleaner() -> TextCleaner:
+    return TextCleaner()
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=[fixture["name"] for fixture in FIXTURES])
+def test_clean_text_preserving_structure(cleaner, fixture):
+    assert cleaner.clean_text(fixture["input"]) == fixture["preserve_structure"]
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=[fixture["name"] for fixture in FIXTURES])
+def test_clean_text_flat(cleaner, fixture):
+    assert cleaner.clean_text(fixture["input"], preserve_structure=False) == fixture["flat"]
+
+
+def test_clean_many_matches_clean_text(cleaner):
+    texts = [fixture["input"] for fixture in FIXTURES]
+    assert cleaner.clean_many(texts) == [fixture["preserve_structure"] for fixture in FIXTURES]
+    assert cleaner.clean_many(texts, preserve_structure=False) == [fixture["flat"] for fixture in FIXTURES]
@@ -0,0 +1,67 @@
+"""
+Single-file uploads stay in memory and are rejected early when too large
+"""
+
+import pytest
+from fastapi import APIRouter, FastAPI, File, Form, UploadFile
+from fastapi.testclient import TestClient
+
+import main
+from utils.uploads import upload_route
+
+
+@pytest.fixture
+def client() -> TestClient:
+    # Larger than Starlette's 1MB spooling threshold, to show nothing is spooled
+    router = APIRouter(route_class=upload_route(2 * 1024 * 1024, 3 * 1024 * 1024, "Too large"))
+
+    @router.post("/upload")
+    async def upload(file: UploadFile = File(...), note: str = Form("")):
+        content = await file.read()
+        return {"size": len(content), "on_disk": file.file._rolled, "note": note}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_file_within_limit_is_kept_in_memory(client):
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * (2 * 1024 * 1024))}, data={"note": "hi"})
+    assert response.status_code == 200
+    assert response.json() == {"size": 2 * 1024 * 1024, "on_disk": False, "note": "hi"}
+
+
+def test_oversized_file_is_rejected(client):
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * (2 * 1024 * 1024 + 1))})
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Too large"}
+
+
+def test_oversized_content_length_is_rejected_before_parsing(client):
+    # The body itself is not even valid multipart; the header alone decides
+    response = client.post(
+        "/upload",
+        content=b"not multipart",
+        headers={"content-type": "multipart/form-data; boundary=b", "content-length": str(10 ** 9)}
+    )
+    assert response.status_code == 413
+
+
+def test_oversized_chunked_body_is_rejected_while_streaming(client):
+    def body():
+        yield b'--b\r\nContent-Disposition: form-data; name="note"\r\n\r\n'
+        for _ in range(64):
+            yield b"x" * 65536
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+
+
+def test_upload_resume_rejects_oversized_file():
+    with TestClient(main.app) as test_client:
+        response = test_client.post(
+            "/upload-resume",
+            files={"file": ("resume.pdf", b"x" * (main.MAX_FILE_SIZE + 1), "application/pdf")}
+        )
+    assert response.status_code == 413
@@ -0,0 +1,37 @@
+"""
+Worker pool slots are held until a task really finishes, even after a timeout
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from services.worker_pool import AnalysisWorkerPool, WorkerPoolBusy, WorkerPoolTimeout
+
+
+def test_timed_out_task_keeps_its_slot_until_it_finishes():
+    pool = AnalysisWorkerPool(max_workers=0, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        with pytest.raises(WorkerPoolTimeout):
+            await pool.run(release.wait, timeout=0.05)
+        # The task is still running in its thread, so the pool is still full
+        assert pool.in_flight == 1
+        with pytest.raises(WorkerPoolBusy):
+            await pool.run(sum, [1, 2])
+
+        release.set()
+        for _ in range(100):
+            if pool.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.in_flight == 0
+        assert await pool.run(sum, [1, 2]) == 3
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
@@ -3,5 +3,6 @@ SmartATS Utilities Package
 """
 
 from .text_cleaner import TextCleaner
+from .skill_matcher import SkillMatcher
 
-__all__ = ['TextCleaner']
+__all__ = ['TextCleaner', 'SkillMatcher']
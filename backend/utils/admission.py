@@ -0,0 +1,194 @@
+"""
+Admission Control Utility
+Per-class concurrency limits with a bounded, deadline-aware wait queue for expensive endpoints
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+
+# Weight of the latest request in the moving average of service times
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is shed instead of admitted
+
+    reason is one of "queue_full" (429: too many requests of this class are
+    waiting), "deadline" (503: the estimated wait exceeds the maximum),
+    "timeout" (503: the request waited the maximum without getting a slot)
+    and "displaced" (503: a waiting request gave its place to a priority one).
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.status_code = 429 if reason == 'queue_full' else 503
+
+
+class AdmissionController:
+    """
+    Limits how many requests of one class run at once
+
+    Requests beyond max_concurrent wait in a queue of at most max_queue
+    entries, served first come first served except that priority requests
+    go ahead of all normal ones. A request is rejected at once when the
+    queue is full, or when its estimated wait (its place in the queue times
+    the moving average of service times, divided by max_concurrent) exceeds
+    max_wait; one that is admitted to the queue gives up after max_wait.
+
+    When the queue is full, a priority request takes the place of the most
+    recently queued normal request, which is rejected instead.
+
+    Not thread-safe: meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        max_wait: float,
+        initial_service_time: float = 1.0
+    ):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self.service_time = initial_service_time
+        self.active = 0
+        self._priority: Deque[asyncio.Future] = deque()
+        self._normal: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._priority) + len(self._normal)
+
+    def estimated_wait(self, position: int) -> float:
+        """
+        Estimated seconds until the request at a (1-based) queue position gets a slot
+        """
+        return position * self.service_time / self.max_concurrent
+
+    async def acquire(self, priority: bool = False) -> float:
+        """
+        Wait for a slot, which must be given back with release()
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            AdmissionRejected: If the request is shed
+        """
+        if self.active < self.max_concurrent and not self.queued:
+            self.active += 1
+            return 0.0
+
+        if self.queued >= self.max_queue:
+            if not (priority and self._normal):
+                raise AdmissionRejected('queue_full', self.estimated_wait(self.queued))
+            displaced = self._normal.pop()
+            displaced.set_exception(AdmissionRejected('displaced', self.estimated_wait(self.queued)))
+
+        position = len(self._priority) + 1 if priority else self.queued + 1
+        estimate = self.estimated_wait(position)
+        if estimate > self.max_wait:
+            raise AdmissionRejected('deadline', estimate)
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._priority if priority else self._normal
+        queue.append(waiter)
+        start_time = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                queue.remove(waiter)
+                waiter.cancel()
+                raise AdmissionRejected('timeout', self.estimated_wait(self.queued))
+            # The slot was handed over just as the wait ran out
+            waiter.result()
+        except asyncio.CancelledError:
+            # The client went away; give up the place in the queue, or the slot
+            if not waiter.done():
+                queue.remove(waiter)
+                waiter.cancel()
+            elif not waiter.cancelled() and waiter.exception() is None:
+                self.release()
+            raise
+        return time.perf_counter() - start_time
+
+    def release(self, service_seconds: Optional[float] = None):
+        """
+        Give back a slot, handing it to the next waiting request
+
+        Args:
+            service_seconds: How long the request held the slot, for wait estimates
+        """
+        if service_seconds is not None:
+            self.service_time += SERVICE_TIME_SMOOTHING * (service_seconds - self.service_time)
+
+        for queue in (self._priority, self._normal):
+            if queue:
+                # The slot passes directly to the waiter, so active is unchanged
+                queue.popleft().set_result(True)
+                return
+        self.active -= 1
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that admits requests through an AdmissionController
+
+    classify maps a request scope to the controller of its class and whether
+    it has priority, or None for requests that are never held back. Admission
+    happens before the request body is read, so shed requests cost almost
+    nothing; the slot is held until the response has been sent.
+    """
+
+    def __init__(
+        self,
+        app,
+        classify: Callable[[Dict], Optional[Tuple[AdmissionController, bool]]],
+        on_admit: Optional[Callable[[AdmissionController, float], None]] = None,
+        on_reject: Optional[Callable[[AdmissionController, AdmissionRejected], None]] = None
+    ):
+        self.app = app
+        self.classify = classify
+        self.on_admit = on_admit
+        self.on_reject = on_reject
+
+    async def __call__(self, scope, receive, send):
+        admission = self.classify(scope) if scope['type'] == 'http' else None
+        if admission is None:
+            await self.app(scope, receive, send)
+            return
+
+        controller, priority = admission
+        try:
+            waited = await controller.acquire(priority)
+        except AdmissionRejected as rejection:
+            if self.on_reject is not None:
+                self.on_reject(controller, rejection)
+            response = JSONResponse(
+                {"detail": "Server is busy. Please retry shortly."},
+                status_code=rejection.status_code,
+                headers={"Retry-After": str(rejection.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        if self.on_admit is not None:
+            self.on_admit(controller, waited)
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - start_time)
@@ -0,0 +1,400 @@
+"""
+Cache Utility
+Thread-safe LRU cache with TTL, hit/miss counters and an optional shared backend
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .text_cleaner import TextCleaner
+
+
+_text_cleaner = TextCleaner()
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash text as TextCleaner.clean_text leaves it
+
+    Texts that differ only in what the cleaner normalizes away (Unicode
+    punctuation, tabs and runs of spaces, extra blank lines) get the same
+    hash, so anything derived from the cleaned text can be cached under it.
+    Case and single line breaks are kept, as the cleaner keeps them.
+    """
+    return hashlib.sha256(_text_cleaner.clean_text(text).encode('utf-8')).hexdigest()
+
+
+class CacheBackend:
+    """
+    Interface for a shared key/value store behind the in-process cache
+    """
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Local stand-in for a shared store, useful for development and tests
+    """
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend for any client speaking the redis-py API (get/set with ex)
+
+    Errors from the store are logged and treated as misses so a cache outage
+    never fails a request.
+    """
+
+    def __init__(self, client, prefix: str = 'smartats:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception as e:
+            print(f"Cache backend read error: {e}")
+            return None
+
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        try:
+            self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+        except Exception as e:
+            print(f"Cache backend write error: {e}")
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    File-per-entry store in a local directory, bounded by total size
+
+    When the directory grows past ``max_bytes`` the least recently written
+    entries are deleted. Entries survive restarts and can be shared by all
+    worker processes on the same host.
+
+    The total size is tracked as entries are written, so the directory is
+    only scanned when it is over the limit, or once every
+    ``rescan_seconds`` to account for writes by other processes.
+    """
+
+    # Eviction frees space down to this fraction of max_bytes, so the writes
+    # right after it do not each trigger another scan
+    EVICT_TO = 0.9
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, rescan_seconds: float = 60.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_seconds = rescan_seconds
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._total_bytes = 0
+        self._scanned_at = 0.0
+        os.makedirs(directory, exist_ok=True)
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                expires_at, value = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        if expires_at is not None and expires_at <= time.time():
+            freed = self._remove(path)
+            with self._lock:
+                self._total_bytes -= freed
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump([expires_at, value], cache_file)
+            size = os.path.getsize(temp_path)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Disk cache write error: {e}")
+            self._remove(temp_path)
+            return
+
+        with self._lock:
+            self._total_bytes += size - replaced
+            due = (
+                self._total_bytes > self.max_bytes
+                or time.monotonic() - self._scanned_at >= self.rescan_seconds
+            )
+        if due:
+            self._evict()
+
+    def _remove(self, path: str) -> int:
+        """
+        Delete a file, returning the bytes freed (0 if it could not be deleted)
+        """
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+        except OSError:
+            return 0
+        return size
+
+    def _evict(self):
+        # One scan at a time; writes meanwhile are counted and checked after it
+        if not self._scan_lock.acquire(blocking=False):
+            return
+        try:
+            entries = []
+            total_bytes = 0
+            with os.scandir(self.directory) as scanner:
+                for entry in scanner:
+                    if not entry.name.endswith('.json'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_bytes += stat.st_size
+
+            if total_bytes > self.max_bytes:
+                target_bytes = self.max_bytes * self.EVICT_TO
+                for _, size, path in sorted(entries):
+                    self._remove(path)
+                    total_bytes -= size
+                    if total_bytes <= target_bytes:
+                        break
+
+            with self._lock:
+                self._total_bytes = total_bytes
+                self._scanned_at = time.monotonic()
+        finally:
+            self._scan_lock.release()
+
+
+class LRUCache:
+    """
+    Size and TTL bounded LRU cache
+
+    Lookups that miss locally fall through to the optional backend, so
+    several API replicas can share entries. Values written to the backend
+    are serialized with ``dumps``/``loads`` (JSON by default).
+
+    Besides the entry count, the cache can be bounded by total weight: pass
+    ``max_weight`` and a ``weigher`` returning the size of a value (for
+    example the length of cached text).
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl: Optional[float] = None,
+        backend: Optional[CacheBackend] = None,
+        dumps: Callable[[Any], str] = json.dumps,
+        loads: Callable[[str], Any] = json.loads,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[Any], int]] = None
+    ):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.backend = backend
+        self.dumps = dumps
+        self.loads = loads
+        self.max_weight = max_weight
+        self.weigher = weigher
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._weight = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value for key, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._discard(key)
+
+        if self.backend is not None:
+            serialized = self.backend.get(key)
+            if serialized is not None:
+                value = self.loads(serialized)
+                self._store(key, value)
+                with self._lock:
+                    self.backend_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value locally and in the backend
+        """
+        self._store(key, value)
+
+        if self.backend is not None:
+            self.backend.set(key, self.dumps(value), self.ttl)
+
+    def _weigh(self, value: Any) -> int:
+        return self.weigher(value) if self.weigher is not None else 0
+
+    def _discard(self, key: str):
+        _, value = self._entries.pop(key)
+        self._weight -= self._weigh(value)
+
+    def _over_capacity(self) -> bool:
+        if len(self._entries) > self.max_size:
+            return True
+        return self.max_weight is not None and self._weight > self.max_weight
+
+    def _store(self, key: str, value: Any):
+        expires_at = time.time() + self.ttl if self.ttl else None
+
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+
+            self._entries[key] = (expires_at, value)
+            self._weight += self._weigh(value)
+
+            while self._entries and self._over_capacity():
+                oldest_key = next(iter(self._entries))
+                self._discard(oldest_key)
+                self.evictions += 1
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """
+        Get cache size and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.backend_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'weight': self._weight,
+                'max_weight': self.max_weight,
+                'hits': self.hits,
+                'backend_hits': self.backend_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (self.hits + self.backend_hits) / lookups if lookups else 0.0
+            }
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls with the same key
+
+    While a call for a key is in flight, later callers with that key await
+    its result instead of starting their own; errors are shared the same
+    way. Nothing is remembered once the call finishes, so this is meant to
+    sit in front of a cache, not replace one.
+
+    The call runs as its own task: if the caller that started it goes away,
+    the others still get the result.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await func() once per key among concurrent callers
+
+        Returns:
+            Tuple of (result, whether it was shared with an earlier caller)
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the error retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,68 @@
+"""
+Memory Utility
+Per-process memory usage (resident, proportional, shared and private) read from /proc on Linux
+"""
+
+import os
+from typing import Dict, List, Optional
+
+
+# smaps_rollup fields (in kB) summed into each reported kind
+_SMAPS_FIELDS = {
+    'Rss': 'rss',
+    'Pss': 'pss',
+    'Shared_Clean': 'shared',
+    'Shared_Dirty': 'shared',
+    'Private_Clean': 'private',
+    'Private_Dirty': 'private',
+}
+
+
+def process_memory(pid: int) -> Optional[Dict[str, int]]:
+    """
+    Memory of a process in bytes, by kind: rss, pss, shared and private
+
+    Shared counts resident pages also mapped by another process, such as
+    models inherited from a pre-fork master and not written to since. PSS
+    splits each shared page evenly among the processes mapping it, so the
+    PSS of all workers adds up to the memory they really use together.
+
+    Returns:
+        None if /proc/<pid>/smaps_rollup cannot be read (not Linux, a kernel
+        older than 4.14, or the process has exited)
+    """
+    memory = dict.fromkeys(('rss', 'pss', 'shared', 'private'), 0)
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', 'r') as smaps:
+            for line in smaps:
+                name, _, value = line.partition(':')
+                kind = _SMAPS_FIELDS.get(name)
+                if kind is not None:
+                    memory[kind] += int(value.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return memory
+
+
+def child_pids(pid: int) -> List[int]:
+    """
+    PIDs of the direct children of a process (empty where /proc is unavailable)
+    """
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return []
+
+    children = []
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as stat:
+                # The command name can contain spaces and parentheses; fields resume after the last ')'
+                parent = int(stat.read().rpartition(')')[2].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if parent == pid:
+            children.append(int(entry))
+    return sorted(children)
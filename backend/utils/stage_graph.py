@@ -0,0 +1,112 @@
+"""
+Stage Graph Utility
+Runs the stages of an analysis as a dependency graph, with independent stages in parallel
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from utils.metrics import StageTimer
+
+
+class StageGraph:
+    """
+    A small directed acyclic graph of named stages
+
+    Each stage is a function called with the results of the stages (or run
+    inputs) it requires, passed as keyword arguments named after them. An
+    intermediate such as a parsed document is computed by one stage and
+    shared by every stage that needs it.
+
+    With an executor, all stages whose inputs are ready are submitted at
+    once, so independent stages run concurrently and a run takes roughly as
+    long as its slowest path. Without one, stages run one after another in
+    the order they were added.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {}
+        self._inputs: set = set()
+
+    def input(self, *names: str) -> 'StageGraph':
+        """
+        Declare values passed to run() that stages can require
+        """
+        self._inputs.update(names)
+        return self
+
+    def stage(self, name: str, func: Callable, requires: Iterable[str] = ()) -> 'StageGraph':
+        """
+        Add a stage
+
+        Stages can only require inputs and stages added before them, which
+        keeps the graph acyclic.
+        """
+        requires = tuple(requires)
+        unknown = [
+            requirement for requirement in requires
+            if requirement not in self._stages and requirement not in self._inputs
+        ]
+        if unknown:
+            raise ValueError(f"Stage {name} requires unknown stages: {', '.join(unknown)}")
+        if name in self._stages or name in self._inputs:
+            raise ValueError(f"Duplicate stage: {name}")
+
+        self._stages[name] = (func, requires)
+        return self
+
+    def run(
+        self,
+        executor: Optional[Executor] = None,
+        timer: Optional[StageTimer] = None,
+        **inputs
+    ) -> Dict[str, Any]:
+        """
+        Run every stage and return all results by stage name
+
+        Each stage's duration is recorded in timer under its name. If a
+        stage raises, stages not started yet are cancelled and the error is
+        re-raised.
+        """
+        missing = self._inputs - inputs.keys()
+        if missing:
+            raise ValueError(f"Missing inputs: {', '.join(sorted(missing))}")
+
+        results = dict(inputs)
+
+        if executor is None:
+            for name, (func, requires) in self._stages.items():
+                results[name], seconds = _call(func, {requirement: results[requirement] for requirement in requires})
+                if timer is not None:
+                    timer.add(name, seconds)
+            return results
+
+        waiting = dict(self._stages)
+        running: Dict[Future, str] = {}
+        try:
+            while waiting or running:
+                for name, (func, requires) in list(waiting.items()):
+                    if all(requirement in results for requirement in requires):
+                        arguments = {requirement: results[requirement] for requirement in requires}
+                        running[executor.submit(_call, func, arguments)] = name
+                        del waiting[name]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name], seconds = future.result()
+                    if timer is not None:
+                        timer.add(name, seconds)
+        finally:
+            for future in running:
+                future.cancel()
+
+        return results
+
+
+def _call(func: Callable, arguments: Dict[str, Any]) -> Tuple[Any, float]:
+    # Timed where it runs, so the timer is only touched by the calling thread
+    start_time = time.perf_counter()
+    result = func(**arguments)
+    return result, time.perf_counter() - start_time
@@ -5,7 +5,11 @@ Handles text preprocessing and cleaning for NLP analysis
 
 import re
 import string
-from typing import List
+from typing import Iterable, List
+
+
+# Characters kept by the cleaner besides letters, digits and whitespace
+KEPT_PUNCTUATION = r'\-\.\,\;\:\!\?\(\)\[\]\{\}\/\&\+\#\@\'\"\|'
 
 
 class TextCleaner:
@@ -25,6 +29,39 @@ class TextCleaner:
         self.special_chars_pattern = re.compile(r'[^\w\s\-\.\,\;\:\!\?\(\)\[\]\{\}\/\&\+\#\@]')
         self.multiple_spaces_pattern = re.compile(r'\s+')
         self.multiple_newlines_pattern = re.compile(r'\n{3,}')
+        
+        # Unicode punctuation normalized to ASCII equivalents
+        self.unicode_replacements = [
+            ('\u2019', "'"),   # Right single quote
+            ('\u2018', "'"),   # Left single quote
+            ('\u201c', '"'),   # Left double quote
+            ('\u201d', '"'),   # Right double quote
+            ('\u2013', '-'),   # En dash
+            ('\u2014', '-'),   # Em dash
+            ('\u2022', '*'),   # Bullet point
+            ('\u2026', '...'), # Ellipsis
+            ('\xa0', ' '),     # Non-breaking space
+            ('\t', ' '),       # Tab
+        ]
+        
+        # Unwanted characters and whitespace both become spaces; whitespace is never a
+        # word character or kept punctuation, so one negated class covers both.
+        # The inline variant leaves newlines alone so line structure is preserved.
+        self.inline_noise_pattern = re.compile(rf'[^\w\n{KEPT_PUNCTUATION}]+')
+        self.noise_pattern = re.compile(rf'[^\w{KEPT_PUNCTUATION}]+')
+        
+        # Byte translate tables equivalent to the patterns above for ASCII text,
+        # which lets the common case skip the regex engine entirely
+        self.inline_noise_table = self._build_ascii_table(self.inline_noise_pattern)
+        self.noise_table = self._build_ascii_table(self.noise_pattern)
+    
+    @staticmethod
+    def _build_ascii_table(pattern: re.Pattern) -> bytes:
+        table = bytearray(range(256))
+        for code in range(128):
+            if pattern.fullmatch(chr(code)):
+                table[code] = ord(' ')
+        return bytes(table)
     
     def clean_text(self, text: str, preserve_structure: bool = True) -> str:
         """
@@ -43,62 +80,60 @@ class TextCleaner:
         # Normalize unicode characters
         text = self._normalize_unicode(text)
         
-        # Remove or replace special characters but preserve some structure
-        text = self._clean_special_chars(text)
+        # Replace special characters and whitespace with spaces
+        text = self._replace_noise(text, preserve_structure)
+        
+        if not preserve_structure:
+            return ' '.join(text.split())
         
-        # Normalize whitespace
-        text = self._normalize_whitespace(text, preserve_structure)
+        # Collapse spaces and strip them around line breaks
+        text = self._normalize_whitespace(text)
         
         # Remove extra newlines but preserve paragraph breaks
-        if preserve_structure:
+        if '\n\n\n' in text:
             text = self.multiple_newlines_pattern.sub('\n\n', text)
-        else:
-            text = text.replace('\n', ' ')
-            text = self.multiple_spaces_pattern.sub(' ', text)
         
         return text.strip()
     
+    def clean_many(self, texts: Iterable[str], preserve_structure: bool = True) -> List[str]:
+        """
+        Clean a batch of texts
+        """
+        return [self.clean_text(text, preserve_structure) for text in texts]
+    
     def _normalize_unicode(self, text: str) -> str:
         """
         Normalize unicode characters to ASCII equivalents where possible
         """
-        replacements = {
-            '\u2019': "'",   # Right single quote
-            '\u2018': "'",   # Left single quote
-            '\u201c': '"',   # Left double quote
-            '\u201d': '"',   # Right double quote
-            '\u2013': '-',   # En dash
-            '\u2014': '-',   # Em dash
-            '\u2022': '*',   # Bullet point
-            '\u2026': '...', # Ellipsis
-            '\xa0': ' ',     # Non-breaking space
-            '\t': ' ',       # Tab
-        }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
+        # Membership checks skip absent characters; str.translate would be
+        # slower here because it walks non-ASCII text character by character
+        for old, new in self.unicode_replacements:
+            if old in text:
+                text = text.replace(old, new)
         
         return text
     
-    def _clean_special_chars(self, text: str) -> str:
+    def _replace_noise(self, text: str, preserve_structure: bool) -> str:
         """
-        Remove problematic special characters while preserving important ones
+        Replace problematic special characters and whitespace with spaces
         """
-        # Keep alphanumeric, spaces, and common punctuation
-        cleaned = re.sub(r'[^\w\s\-\.\,\;\:\!\?\(\)\[\]\{\}\/\&\+\#\@\'\"\|]', ' ', text)
-        return cleaned
+        if text.isascii():
+            table = self.inline_noise_table if preserve_structure else self.noise_table
+            return text.encode('ascii').translate(table).decode('ascii')
+        
+        pattern = self.inline_noise_pattern if preserve_structure else self.noise_pattern
+        return pattern.sub(' ', text)
     
-    def _normalize_whitespace(self, text: str, preserve_structure: bool = True) -> str:
+    def _normalize_whitespace(self, text: str) -> str:
         """
-        Normalize whitespace in text
+        Collapse runs of spaces and strip spaces at line edges
+        
+        Expects text whose only whitespace is spaces and newlines.
         """
-        if preserve_structure:
-            # Replace multiple spaces with single space, preserve newlines
-            lines = text.split('\n')
-            normalized_lines = [self.multiple_spaces_pattern.sub(' ', line).strip() for line in lines]
-            return '\n'.join(normalized_lines)
-        else:
-            return self.multiple_spaces_pattern.sub(' ', text)
+        while '  ' in text:
+            text = text.replace('  ', ' ')
+        
+        return text.replace(' \n', '\n').replace('\n ', '\n')
     
     def extract_sections(self, text: str) -> dict:
         """
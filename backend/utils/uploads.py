@@ -0,0 +1,127 @@
+"""
+Upload Utility
+Multipart parsing for single-file uploads, rejected early when too large
+"""
+
+from typing import AsyncGenerator, Callable, Type
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import FormData, Headers
+from starlette.exceptions import HTTPException
+from starlette.formparsers import MultiPartException, MultiPartParser
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class LimitedMultiPartParser(MultiPartParser):
+    """
+    Starlette's multipart parser, with the file part capped and optionally kept in memory
+
+    Starlette spools file parts larger than 1MB to a temporary file. In
+    memory mode the spooling threshold is the size limit itself, so an
+    accepted file never touches the disk. Either way, a file part that grows
+    past the limit is rejected while it streams in.
+    """
+
+    def __init__(
+        self,
+        headers: Headers,
+        stream: AsyncGenerator[bytes, None],
+        max_file_size: int,
+        too_large: Callable[[], HTTPException],
+        in_memory: bool = True
+    ):
+        super().__init__(headers, stream, max_files=1)
+        if in_memory:
+            # Starlette's name for the spooling threshold
+            self.max_file_size = max_file_size
+        self.file_size_limit = max_file_size
+        self.too_large = too_large
+        self._file_bytes = 0
+
+    def on_part_begin(self) -> None:
+        super().on_part_begin()
+        self._file_bytes = 0
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._current_part.file is not None:
+            self._file_bytes += end - start
+            if self._file_bytes > self.file_size_limit:
+                raise self.too_large()
+        super().on_part_data(data, start, end)
+
+
+class UploadRequest(Request):
+    """
+    Request whose multipart form is parsed by LimitedMultiPartParser
+
+    The body is rejected with 413 before parsing when its Content-Length is
+    over max_body_size, and while streaming when a body sent without one
+    (chunked) grows past it.
+    """
+
+    max_file_size: int
+    max_body_size: int
+    in_memory: bool
+    too_large: Callable[[], HTTPException]
+
+    async def _get_form(self, **kwargs) -> FormData:
+        if self._form is not None:
+            return self._form
+
+        content_type = self.headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            return await super()._get_form(**kwargs)
+
+        content_length = self.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            raise self.too_large()
+
+        parser = LimitedMultiPartParser(
+            self.headers, self._limited_stream(), self.max_file_size, self.too_large, self.in_memory
+        )
+        try:
+            self._form = await parser.parse()
+        except MultiPartException as exc:
+            raise HTTPException(status_code=400, detail=exc.message)
+        return self._form
+
+    async def _limited_stream(self) -> AsyncGenerator[bytes, None]:
+        received = 0
+        async for chunk in self.stream():
+            received += len(chunk)
+            if received > self.max_body_size:
+                raise self.too_large()
+            yield chunk
+
+
+def upload_route(max_file_size: int, max_body_size: int, detail: str, in_memory: bool = True) -> Type[APIRoute]:
+    """
+    Route class for endpoints taking one file upload, parsed with UploadRequest
+
+    Args:
+        max_file_size: Largest accepted file, in bytes
+        max_body_size: Largest accepted request body (the file plus form fields), in bytes
+        detail: Error message of the 413 response for oversized uploads
+        in_memory: Keep the file in memory; otherwise files over 1MB are
+            spooled to a temporary file, as Starlette does
+    """
+
+    class LimitedUploadRequest(UploadRequest):
+        pass
+
+    LimitedUploadRequest.max_file_size = max_file_size
+    LimitedUploadRequest.max_body_size = max_body_size
+    LimitedUploadRequest.in_memory = in_memory
+    LimitedUploadRequest.too_large = staticmethod(lambda: HTTPException(status_code=413, detail=detail))
+
+    class UploadRoute(APIRoute):
+        def get_route_handler(self) -> Callable:
+            handler = super().get_route_handler()
+
+            async def route_handler(request: Request) -> Response:
+                return await handler(LimitedUploadRequest(request.scope, request.receive))
+
+            return route_handler
+
+    return UploadRoute
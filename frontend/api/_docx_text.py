@@ -0,0 +1,123 @@
+"""
+DOCX Text Utility
+Streaming text extraction from word/document.xml, without building a document model
+
+Copy of backend/utils/docx_text.py shipped with the Vercel functions, which are
+deployed without the backend package; keep the code of the two files identical
+(backend/tests/test_frontend_copies.py fails otherwise).
+"""
+
+import io
+import zipfile
+from typing import BinaryIO, List, Union
+from xml.etree.ElementTree import iterparse
+
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+PARAGRAPH = W + 'p'
+TABLE = W + 'tbl'
+ROW = W + 'tr'
+CELL = W + 'tc'
+TEXT = W + 't'
+BODY = W + 'body'
+# Paragraph properties; their w:tab elements are tab stops, not characters
+PARAGRAPH_PROPERTIES = W + 'pPr'
+# Inline elements that stand for whitespace in a run
+RUN_WHITESPACE = {W + 'tab': '\t', W + 'br': '\n', W + 'cr': '\n'}
+# mc:Fallback repeats the content of mc:Choice (e.g. text boxes) for older readers
+FALLBACK = MC + 'Fallback'
+
+
+def extract_docx_text(source: Union[str, bytes, BinaryIO]) -> str:
+    """
+    Extract the text of a DOCX file in document order
+
+    Paragraphs and tables are emitted in the order they appear. Each table
+    row becomes one line with its cells joined by " | ". A merged cell is
+    stored once in the XML, so it is emitted once. Deleted tracked changes
+    and the legacy copies of text boxes are skipped.
+
+    The XML is parsed incrementally and processed elements are discarded, so
+    memory use does not grow with the document (apart from the output).
+
+    Args:
+        source: File path, raw file bytes or a binary file-like object
+
+    Returns:
+        Extracted text, one paragraph or table row per line
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    lines: List[str] = []
+    # Open paragraphs (text boxes nest paragraphs inside paragraphs)
+    paragraphs: List[List[str]] = []
+    table_depth = 0
+    fallback_depth = 0
+    properties_depth = 0
+    row: List[str] = []
+    cell: List[str] = []
+    body = None
+
+    with zipfile.ZipFile(source) as archive, archive.open('word/document.xml') as document:
+        for event, element in iterparse(document, events=('start', 'end')):
+            tag = element.tag
+
+            if event == 'start':
+                if tag == PARAGRAPH:
+                    paragraphs.append([])
+                elif tag == TABLE:
+                    table_depth += 1
+                elif tag == ROW and table_depth == 1:
+                    row = []
+                elif tag == CELL and table_depth == 1:
+                    cell = []
+                elif tag == FALLBACK:
+                    fallback_depth += 1
+                elif tag == PARAGRAPH_PROPERTIES:
+                    properties_depth += 1
+                elif tag == BODY:
+                    body = element
+                continue
+
+            if fallback_depth:
+                if tag == FALLBACK:
+                    fallback_depth -= 1
+                    element.clear()
+                continue
+
+            if tag == TEXT:
+                if paragraphs and element.text:
+                    paragraphs[-1].append(element.text)
+            elif tag == PARAGRAPH_PROPERTIES:
+                properties_depth -= 1
+            elif tag in RUN_WHITESPACE:
+                if paragraphs and not properties_depth:
+                    paragraphs[-1].append(RUN_WHITESPACE[tag])
+            elif tag == PARAGRAPH:
+                text = ''.join(paragraphs.pop())
+                if table_depth == 1 or (table_depth and text.strip()):
+                    # Paragraphs of nested tables belong to the outer cell
+                    cell.append(text)
+                elif text.strip():
+                    lines.append(text)
+                element.clear()
+            elif tag == CELL and table_depth == 1:
+                cell_text = '\n'.join(cell).strip()
+                if cell_text:
+                    row.append(cell_text)
+            elif tag == ROW and table_depth == 1:
+                if row:
+                    lines.append(' | '.join(row))
+                element.clear()
+            elif tag == TABLE:
+                table_depth -= 1
+
+            # Drop finished top-level blocks so the tree never grows
+            if body is not None and not table_depth and not paragraphs and tag in (PARAGRAPH, TABLE):
+                body.clear()
+
+    return '\n'.join(lines)
+
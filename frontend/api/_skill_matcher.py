@@ -0,0 +1,125 @@
+"""
+Skill Matcher Utility
+Aho-Corasick multi-pattern matcher for finding skills in a single pass over text
+
+Copy of backend/utils/skill_matcher.py shipped with the Vercel functions, which
+are deployed without the backend package; keep the code of the two files identical
+(backend/tests/test_frontend_copies.py fails otherwise).
+"""
+
+from collections import deque
+from typing import Iterable, List, Set, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class SkillMatcher:
+    """
+    Compiled Aho-Corasick automaton over a skill taxonomy
+
+    The automaton is built once and then scans any text in O(text length +
+    matches), independent of the number of skills. Matches are word-boundary
+    aware: a skill that starts or ends with a word character only matches when
+    it is not glued to another word character, so ``r`` and ``go`` no longer
+    match inside ``react`` or ``mongodb``. Edges made of symbols (the ``+`` in
+    ``c++``) need no boundary.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills = sorted({skill.lower() for skill in skills if skill})
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for index, skill in enumerate(self.skills):
+            node = 0
+            for char in skill:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = next_node
+                node = next_node
+            self._output[node].append(index)
+
+        self._build_failure_links()
+
+        # Per-skill length and boundary requirements, indexed like self.skills
+        self._lengths = [len(skill) for skill in self.skills]
+        self._check_start = [_is_word_char(skill[0]) for skill in self.skills]
+        self._check_end = [_is_word_char(skill[-1]) for skill in self.skills]
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+
+                self._fail[next_node] = self._goto[fallback].get(char, 0)
+                self._output[next_node] = (
+                    self._output[next_node] + self._output[self._fail[next_node]]
+                )
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find every skill occurrence in text
+
+        Args:
+            text: Text to scan (matched case-insensitively)
+
+        Returns:
+            List of (start, end, skill) tuples with offsets into text.lower()
+        """
+        text = text.lower()
+        text_length = len(text)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        root = goto[0]
+
+        matches = []
+        node = 0
+
+        for position, char in enumerate(text):
+            if node == 0 and char not in root:
+                continue
+
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            if not output[node]:
+                continue
+
+            end = position + 1
+            for index in output[node]:
+                start = end - self._lengths[index]
+
+                if self._check_start[index] and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if self._check_end[index] and end < text_length and _is_word_char(text[end]):
+                    continue
+
+                matches.append((start, end, self.skills[index]))
+
+        return matches
+
+    def find_skills(self, text: str) -> Set[str]:
+        """
+        Find the set of distinct skills mentioned in text
+        """
+        return {skill for _, _, skill in self.find_all(text)}
@@ -4,9 +4,16 @@ Vercel Serverless Function: Analyze Resume
 
 from http.server import BaseHTTPRequestHandler
 import json
+import os
 import re
+import sys
 from collections import Counter
 
+# Add this directory for the shared skill matcher
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _skill_matcher import SkillMatcher
+
 # Tech skills for detection
 TECH_SKILLS = {
     'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'go', 'rust',
@@ -25,6 +32,9 @@ TECH_SKILLS = {
     'api', 'testing', 'unit testing', 'selenium', 'cypress', 'figma',
 }
 
+# Compiled once per cold start
+SKILL_MATCHER = SkillMatcher(TECH_SKILLS)
+
 RESUME_SECTIONS = {
     'skills': ['skills', 'technical skills', 'core competencies', 'technologies'],
     'experience': ['experience', 'work experience', 'professional experience', 'employment'],
@@ -46,9 +56,7 @@ def extract_keywords(text: str) -> set:
     keywords = {w for w in words if len(w) > 2 and w not in stopwords}
     
     # Add detected tech skills
-    for skill in TECH_SKILLS:
-        if skill in text_lower:
-            keywords.add(skill)
+    keywords.update(SKILL_MATCHER.find_skills(text_lower))
     
     return keywords
 
@@ -86,11 +94,8 @@ def detect_sections(text: str) -> dict:
 
 def analyze_skills(resume: str, jd: str) -> dict:
     """Analyze skill gap"""
-    resume_lower = resume.lower()
-    jd_lower = jd.lower()
-    
-    jd_skills = {s for s in TECH_SKILLS if s in jd_lower}
-    resume_skills = {s for s in TECH_SKILLS if s in resume_lower}
+    jd_skills = SKILL_MATCHER.find_skills(jd)
+    resume_skills = SKILL_MATCHER.find_skills(resume)
     
     matched = jd_skills.intersection(resume_skills)
     missing = jd_skills - resume_skills
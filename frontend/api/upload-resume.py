@@ -3,13 +3,17 @@ Vercel Serverless Function: Upload Resume
 """
 
 from http.server import BaseHTTPRequestHandler
+import io
 import json
-import tempfile
 import os
 import sys
 
 # Add parent directory for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add this directory for the shared DOCX extractor
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _docx_text import extract_docx_text
 
 try:
     import pdfplumber
@@ -22,10 +26,10 @@ MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 ALLOWED_EXTENSIONS = {'.pdf', '.docx'}
 
 
-def extract_from_pdf(file_path: str) -> str:
-    """Extract text from PDF"""
+def extract_from_pdf(file_content: bytes) -> str:
+    """Extract text from PDF bytes"""
     text_content = []
-    with pdfplumber.open(file_path) as pdf:
+    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
         for page in pdf.pages:
             page_text = page.extract_text()
             if page_text:
@@ -33,10 +37,17 @@ def extract_from_pdf(file_path: str) -> str:
     return '\n'.join(text_content)
 
 
-def extract_from_docx(file_path: str) -> str:
-    """Extract text from DOCX"""
+def extract_from_docx(file_content: bytes) -> str:
+    """Extract text from DOCX bytes, streaming the XML with python-docx as a fallback"""
+    try:
+        return extract_docx_text(file_content)
+    except Exception as e:
+        if Document is None:
+            raise
+        print(f"Streaming DOCX extraction error, falling back to python-docx: {e}")
+    
     text_content = []
-    doc = Document(file_path)
+    doc = Document(io.BytesIO(file_content))
     for paragraph in doc.paragraphs:
         if paragraph.text.strip():
             text_content.append(paragraph.text)
@@ -116,32 +127,25 @@ class handler(BaseHTTPRequestHandler):
                 self.send_error_response(400, f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}")
                 return
             
-            # Save to temp file and extract text
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-                temp_file.write(file_content)
-                temp_path = temp_file.name
+            # Extract text straight from the uploaded bytes
+            if file_ext == '.pdf':
+                extracted_text = extract_from_pdf(file_content)
+            else:
+                extracted_text = extract_from_docx(file_content)
             
-            try:
-                if file_ext == '.pdf':
-                    extracted_text = extract_from_pdf(temp_path)
-                else:
-                    extracted_text = extract_from_docx(temp_path)
-                
-                cleaned_text = clean_text(extracted_text)
-                
-                if len(cleaned_text) < 50:
-                    self.send_error_response(400, "Could not extract sufficient text from resume")
-                    return
-                
-                self.send_json_response({
-                    "success": True,
-                    "filename": filename,
-                    "extracted_text": cleaned_text,
-                    "character_count": len(cleaned_text),
-                    "word_count": len(cleaned_text.split())
-                })
-            finally:
-                os.unlink(temp_path)
+            cleaned_text = clean_text(extracted_text)
+            
+            if len(cleaned_text) < 50:
+                self.send_error_response(400, "Could not extract sufficient text from resume")
+                return
+            
+            self.send_json_response({
+                "success": True,
+                "filename": filename,
+                "extracted_text": cleaned_text,
+                "character_count": len(cleaned_text),
+                "word_count": len(cleaned_text.split())
+            })
                 
         except Exception as e:
             self.send_error_response(500, str(e))
@@ -6,6 +6,9 @@ export interface UploadResponse {
   extracted_text: string;
   character_count: number;
   word_count: number;
+  page_count?: number | null;
+  extraction_time_ms?: number;
+  cached?: boolean;
 }
 
 export interface SkillGapAnalysis {